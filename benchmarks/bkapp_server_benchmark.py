@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+import socket
+import uuid
+import warnings
+from datetime import datetime
+from multiprocessing import Process, Pool
+
+from bokeh.client import pull_session
+
+from flask_app.bkapp.bkapp_server import BokehServer
+from flask_app.gnucash.gnucash_db_parser import GnuCashDBParser
+
+
+def wait_for_ports(ports, timeout=60):
+    """Waits until every port in ports accepts connections."""
+
+    start = time.time()
+    for port in ports:
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if time.time() - start > timeout:
+                    raise
+                time.sleep(0.1)
+
+
+def pull_sessions(args):
+    """Pulls (creates and closes) n sessions of view from one of ports (chosen by state id of the User, as in
+        flask_app.bokeh_document) and returns number of pulled sessions."""
+
+    ports, view, state_ids, n = args
+    for i in range(n):
+        state_id = state_ids[i % len(state_ids)]
+        port = ports[int(state_id, 16) % len(ports)]
+        url = "http://127.0.0.1:{port}/{view}".format(port=port, view=view)
+        session = pull_session(url=url, arguments={BokehServer.state_argument: state_id})
+        session.close()
+
+    return n
+
+
+def benchmark(file_path, num_procs, clients=8, sessions_per_client=10, view="overview", port=5100):
+    """Returns number of sessions per second that BokehServer with num_procs worker Processes served to
+        concurrent clients."""
+
+    parser = GnuCashDBParser(file_path, categorical=True)
+    col_mapping = {key: parser.columns_mapping[key] for key in
+                   ["date", "price", "currency", "product", "shop", "all", "type", "category", "monthyear"]}
+    server = BokehServer(port, col_mapping, parser.get_expenses_df(), parser.get_income_df(), datetime.now(),
+                         parser.monthyear_format, parser.category_sep, num_procs=num_procs)
+
+    server_process = Process(target=server.bkworker)
+    server_process.start()
+    try:
+        wait_for_ports(server.ports())
+
+        state_ids = [uuid.uuid4().hex for _ in range(16)]
+        tasks = [(server.ports(), view, state_ids, sessions_per_client) for _ in range(clients)]
+
+        with Pool(clients) as pool:
+            pool.map(pull_sessions, [(server.ports(), view, state_ids, 1)] * clients)  # warm-up
+
+            start = time.time()
+            total = sum(pool.map(pull_sessions, tasks))
+            elapsed = time.time() - start
+    finally:
+        server_process.terminate()
+        server_process.join()
+
+    return total / elapsed
+
+
+# Script for benchmarking session throughput of BokehServer with different numbers of worker Processes.
+# Numbers of Processes can be provided as arguments (default: 1 2 4); GnuCash file is taken from
+# GNUCASH_BENCHMARK_FILE environment variable (default: example file of flask_app).
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+
+    root_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    default_file = os.path.join(root_path, "flask_app", "gnucash", "gnucash_examples", "example_gnucash.gnucash")
+    gnucash_file = os.environ.get("GNUCASH_BENCHMARK_FILE", default_file)
+
+    procs = [int(arg) for arg in sys.argv[1:]] or [1, 2, 4]
+
+    print("CPU count: {cpus}".format(cpus=os.cpu_count()))
+    for n in procs:
+        throughput = benchmark(gnucash_file, n)
+        print("{n} process(es): {throughput:.2f} sessions/s".format(n=n, throughput=throughput))
@@ -0,0 +1,117 @@
+import os
+import sys
+import warnings
+import pandas as pd
+
+from bokeh.document import Document
+from bokeh.protocol import Protocol
+
+from flask_app.bkapp import source_updates
+from flask_app.bkapp.bk_category import Category
+from flask_app.bkapp.color_map import ColorMap
+from flask_app.gnucash.gnucash_db_parser import GnuCashDBParser
+
+
+# Month selections (indices of months on the Line Plot) made one after another in the benchmark
+month_selections = [
+    ("first month", [0]),
+    ("first 2 months", [0, 1]),
+    ("first 3 months", [0, 1, 2]),
+    ("months 2-3", [1, 2]),
+    ("months 2-3 (again)", [1, 2]),
+    ("all months", [])
+]
+
+
+def message_size(events):
+    """Returns number of bytes of PATCH-DOC message (with buffers) sent to the browser for Document events."""
+
+    if len(events) == 0:
+        return 0
+
+    message = Protocol().create("PATCH-DOC", events)
+    size = len(message.header_json) + len(message.metadata_json) + len(message.content_json)
+    for header, payload in message.buffers:
+        size += len(header) + len(payload)
+
+    return size
+
+
+def large_expense_df(parser, rows):
+    """Returns Expense DataFrame of parser repeated (every copy moved by a year) until it has at least rows rows."""
+
+    df = parser.get_expenses_df()
+    date, monthyear = parser.columns_mapping["date"], parser.columns_mapping["monthyear"]
+
+    copies = []
+    for year in range(-(-rows // df.shape[0])):
+        copy = df.copy()
+        copy[date] = copy[date] + pd.DateOffset(years=year)
+        copy[monthyear] = copy[date].dt.strftime(parser.monthyear_format)
+        copies.append(copy)
+
+    return pd.concat(copies, ignore_index=True)
+
+
+def measure(parser, df):
+    """Returns list of (name, bytes) pairs with sizes of messages sent to the browser after every month selection
+        from month_selections in Category View of df."""
+
+    mapping = parser.columns_mapping
+    category = mapping["category"]
+    chosen_category = df[category].value_counts().index[0]  # the biggest Category
+    categories = [chosen_category] + sorted(set(df[category].unique()) - {chosen_category})
+
+    view = Category(category, mapping["monthyear"], mapping["price"], mapping["product"], mapping["date"],
+                    mapping["currency"], mapping["shop"], parser.monthyear_format, ColorMap())
+    document = Document()
+    document.add_root(view.gridplot(df, categories))
+
+    events = []
+    document.on_change(events.append)
+
+    sizes = []
+    for name, indices in month_selections:
+        del events[:]
+        view.update_grid_on_month_selection_change(indices)
+        sizes.append((name, message_size(events)))
+
+    return sizes
+
+
+def benchmark(file_path, rows=100000):
+    """Returns list of (month selection, bytes with full replacement, bytes with update_source) tuples for
+        Category View of a book with at least rows transactions."""
+
+    parser = GnuCashDBParser(file_path)
+    df = large_expense_df(parser, rows)
+
+    max_changed_fraction = source_updates.max_changed_fraction
+    try:
+        source_updates.max_changed_fraction = -1  # every change replaces the whole data
+        before = measure(parser, df)
+    finally:
+        source_updates.max_changed_fraction = max_changed_fraction
+
+    after = measure(parser, df)
+
+    return [(name, size_before, size_after) for (name, size_before), (_, size_after) in zip(before, after)]
+
+
+# Script measuring bytes sent to the browser after month selections in Category View, with and without
+# update_source diffing. GnuCash file is taken from GNUCASH_BENCHMARK_FILE environment variable (default: example
+# file of flask_app) and repeated until it has the number of transactions provided as an argument (default: 100000).
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+
+    root_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    default_file = os.path.join(root_path, "flask_app", "gnucash", "gnucash_examples", "example_gnucash.gnucash")
+    gnucash_file = os.environ.get("GNUCASH_BENCHMARK_FILE", default_file)
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print("{selection:<20}{before:>15}{after:>15}".format(selection="Selection", before="Replace [B]",
+                                                          after="Diff [B]"))
+    for selection, size_before, size_after in benchmark(gnucash_file, n_rows):
+        print("{selection:<20}{before:>15}{after:>15}".format(selection=selection, before=size_before,
+                                                              after=size_after))
@@ -0,0 +1,88 @@
+import os
+import sys
+import timeit
+import warnings
+import numpy as np
+
+from flask_app.bkapp.aggregate_cube import AggregateCube
+from flask_app.gnucash.gnucash_db_parser import GnuCashDBParser
+from benchmarks.source_updates_benchmark import large_expense_df
+
+
+# Number of random selections of months described in the benchmark
+selections_count = 50
+
+
+def describe_totals(cube):
+    """Returns describe() of month_totals and date_totals of cube (statistics calculated before GroupedStatistics)."""
+    return cube.month_totals().describe(), cube.date_totals().describe()
+
+
+def describe_statistics(cube):
+    """Returns month_statistics and date_statistics of cube."""
+    return cube.month_statistics(), cube.date_statistics()
+
+
+def month_selections(months, n, seed=0):
+    """Returns list of n random (non-empty) selections of months."""
+
+    random = np.random.RandomState(seed)
+    selections = []
+    for _ in range(n):
+        size = random.randint(1, len(months) + 1)
+        selections.append(sorted(random.choice(months, size=size, replace=False).tolist()))
+
+    return selections
+
+
+def benchmark(file_path, rows=100000):
+    """Returns list of (case, milliseconds with describe(), milliseconds with GroupedStatistics) tuples with mean times
+        of statistics of months and dates calculated for random selections of months in Expense DataFrame of a book
+        with at least rows transactions - for all Categories (as in Trends View) and for the biggest Category (as
+        in Category View)."""
+
+    parser = GnuCashDBParser(file_path)
+    df = large_expense_df(parser, rows)
+    mapping = parser.columns_mapping
+    category = mapping["category"]
+
+    cube = AggregateCube(df, mapping["monthyear"], mapping["date"], mapping["price"], {category: None})
+    chosen_category = df[category].value_counts().index[0]  # the biggest Category
+    cases = [
+        ("all categories", cube),
+        ("biggest category", cube.filtered(categories=[chosen_category], category_column=category))
+    ]
+
+    selections = month_selections(np.asarray(cube.months), selections_count)
+
+    results = []
+    for name, case_cube in cases:
+        filtered_cubes = [case_cube.filtered(months=months) for months in selections]
+        describe_statistics(filtered_cubes[0])  # GroupedStatistics are created once for every set of leaves
+
+        times = []
+        for function in (describe_totals, describe_statistics):
+            seconds = timeit.timeit(lambda: [function(filtered) for filtered in filtered_cubes], number=3)
+            times.append(seconds / (3 * len(filtered_cubes)) * 1000)
+
+        results.append((name, times[0], times[1]))
+
+    return results
+
+
+# Script measuring time of descriptive statistics of months and dates (as shown in Trends and Category Views)
+# calculated with describe() of totals of filtered AggregateCube and with GroupedStatistics. GnuCash file is taken
+# from GNUCASH_BENCHMARK_FILE environment variable (default: example file of flask_app) and repeated until it has
+# the number of transactions provided as an argument (default: 100000).
+if __name__ == "__main__":
+    warnings.filterwarnings("ignore")
+
+    root_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+    default_file = os.path.join(root_path, "flask_app", "gnucash", "gnucash_examples", "example_gnucash.gnucash")
+    gnucash_file = os.environ.get("GNUCASH_BENCHMARK_FILE", default_file)
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    print("{case:<20}{before:>18}{after:>18}".format(case="Case", before="describe() [ms]", after="Statistics [ms]"))
+    for case, time_before, time_after in benchmark(gnucash_file, n_rows):
+        print("{case:<20}{before:>18.3f}{after:>18.3f}".format(case=case, before=time_before, after=time_after))
@@ -7,6 +7,7 @@ import webbrowser
 from . import trends, overview, category, settings
 from .bkapp.bkapp_server import BokehServer
 from .gnucash.gnucash_db_parser import GnuCashDBParser
+from .gnucash.gnucash_db_cache import GnuCashDBCache
 
 def create_app(test_config=None):
 
@@ -31,6 +32,7 @@ def create_app(test_config=None):
     # bkapp section
     category_sep = ":"
     monthyear_format = "%Y-%m"
+    price_scale = 100  # prices are kept as int64 cents and converted back to the currency only when shown
 
     bk_file_path_db = None
 
@@ -49,7 +51,10 @@ def create_app(test_config=None):
               "Using Test file instead.\n")
         bk_file_path_db = os.path.join(app.root_path, 'gnucash', 'gnucash_examples', 'example_gnucash.gnucash')
 
-    gnucash_parser = GnuCashDBParser(bk_file_path_db, category_sep=category_sep, monthyear_format=monthyear_format)
+    # parsed DataFrames are cached in the instance folder and reused as long as the file doesn't change
+    gnucash_cache = GnuCashDBCache(os.path.join(app.instance_path, "gnucash_cache"))
+    gnucash_parser = GnuCashDBParser(bk_file_path_db, category_sep=category_sep, monthyear_format=monthyear_format,
+                                     cache=gnucash_cache, categorical=True, price_scale=price_scale)
 
     # col_mapping can be later provided from the file
     col_mapping = {
@@ -67,8 +72,9 @@ def create_app(test_config=None):
     server_date = datetime.now()
 
     # bkapp server
+    # BOKEH_NUM_PROCS > 1 serves Bokeh Visualizations from several Processes (ports 9090, 9091, ...)
     bk_port = 9090
-    bkapp_server_address = 'http://127.0.0.1:9090/'
+    bk_num_procs = app.config.get("BOKEH_NUM_PROCS", 1)
 
     bkapp_server = BokehServer(
         bk_port,
@@ -77,17 +83,22 @@ def create_app(test_config=None):
         gnucash_parser.get_income_df(),
         server_date,
         monthyear_format,
-        category_sep
+        category_sep,
+        gnucash_parser=gnucash_parser,
+        num_procs=bk_num_procs,
+        shared_dir=os.path.join(app.instance_path, "bokeh_shared"),
+        price_scale=price_scale
     )
+    bkapp_server_addresses = ['http://127.0.0.1:{port}/'.format(port=port) for port in bkapp_server.ports()]
 
     bkserver_process = Process(target=bkapp_server.bkworker)
     bkserver_process.start()
 
     # Blueprints
-    bp_trends = trends.create_bp(bkapp_server_address)
-    bp_overview = overview.create_bp(bkapp_server_address)
-    bp_category = category.create_bp(bkapp_server_address)
-    bp_settings = settings.create_bp(bk_file_path_db, bkapp_server_address)
+    bp_trends = trends.create_bp(bkapp_server_addresses)
+    bp_overview = overview.create_bp(bkapp_server_addresses)
+    bp_category = category.create_bp(bkapp_server_addresses)
+    bp_settings = settings.create_bp(bk_file_path_db, bkapp_server_addresses)
 
     app.register_blueprint(bp_trends)
     app.register_blueprint(bp_overview)
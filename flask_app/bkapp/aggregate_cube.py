@@ -0,0 +1,378 @@
+import threading
+import numpy as np
+import pandas as pd
+
+from .category_index import CategoryIndex
+from .grouped_statistics import GroupedStatistics
+
+
+class AggregateCube(object):
+    """Aggregates (sums and counts of price) of Expense DataFrame, built once when the data is loaded.
+
+        Rows of the DataFrame are grouped into "leaves" - unique combinations of values of all provided Category
+        Columns (e.g. "Bread" and "Expenses:Family:Grocery:Bread"). Prices are then aggregated into dense arrays:
+            - by (MonthYear, leaf) - .month_sums and .month_counts,
+            - by (Date, leaf) - .date_sums and .date_counts.
+        Every Category (node) of every Category Column covers some of the leaves - those are looked up in
+        a CategoryIndex built on leaf values of the column (see CategoryIndex for "Simple", "Extended" and
+        "Combinations" Categories). Therefore, aggregates of any Category (or group of Categories) are calculated
+        by summing cells of the arrays and their cost depends on the number of months, dates and leaves, not on
+        the number of transactions.
+
+        Cube can be filtered by months and Categories with .filtered - new AggregateCube is returned, sharing
+        aggregated arrays with the original one and only narrowing boolean masks of months and leaves that are
+        included in results. DataFrame of filtered rows (.dataframe) is created only when it is accessed.
+
+        Object expects:
+            - dataframe - Expense DataFrame,
+            - column names of monthyear, date and price columns,
+            - category_columns - dictionary of Category Column name: category_sep pairs. If category_sep is None,
+                Categories are matched by exact values, otherwise values are treated as paths in the Category tree,
+            - price_scale - number of units of price column in the unit of currency (e.g. 100 if prices are int64
+                cents, see GnuCashDBParser price_scale).
+
+        Main methods are:
+            - filtered - returns AggregateCube narrowed to provided months and Categories;
+            - month_totals - returns sums of price aggregated by months;
+            - date_totals - returns sums of price aggregated by dates;
+            - category_totals - returns sums of price aggregated by values of Category Column;
+            - category_rollup - returns sums and counts of every node of the Category tree in every month;
+            - month_statistics and date_statistics - return descriptive statistics of sums of price aggregated by
+                months and by dates;
+            - sorted_rows - returns positions of rows included in the Cube, sorted by any column;
+            - memoized - returns result of calculation memoized in the Cube.
+
+        Orders of rows of .source_dataframe sorted by a column are calculated once (when they are first needed) and
+        shared by the Cube and all Cubes filtered from it - sorting rows of a filtered Cube only takes rows included
+        in the Cube from the already sorted order. Similarly, sums of months and dates are sorted for descriptive
+        statistics once for every set of leaves (see GroupedStatistics) - Cubes filtered only by months (e.g. after
+        the selection of months on the Line Plot) reuse them.
+
+        Results of calculations that depend only on the data of the Cube (e.g. data of Plots that don't change
+        after the selection of the User) can be memoized in the Cube with .memoized. As Cubes aren't modified and
+        filtered Cubes are cached by BokehAppData for every version of the data and every filter, such results are
+        reused by every session (and page reload) with the same data and choices.
+
+        Cubes are used by many sessions at once and their calculations run in Threads (see ViewExecutor), so
+        everything that is created lazily is guarded by locks - sorted orders and GroupedStatistics (shared with
+        filtered Cubes) by .shared_lock, memoized results and .dataframe of the Cube by it's own .lock. Locks are
+        held while the value is calculated, so the same value is never calculated twice.
+
+        Integer prices (e.g. cents) are aggregated as they are - their sums are exact as long as they are smaller
+        than 2**53 (float64 mantissa), which is far above any personal expenses. Sums are divided by price_scale
+        only in results returned by the Cube, so every total is converted back to the currency once, at the end.
+    """
+
+    def __init__(self, dataframe, monthyear_colname, date_colname, price_colname, category_columns, price_scale=1):
+
+        # Column Names
+        self.monthyear = monthyear_colname
+        self.date = date_colname
+        self.price = price_colname
+        self.category_columns = category_columns
+
+        # Variables
+        self.price_scale = price_scale  # units of price in the unit of currency
+
+        # DataFrames
+        self.source_dataframe = dataframe  # DataFrame from which the Cube was built
+        self.__dataframe = dataframe  # rows of .source_dataframe included in the Cube (created lazily)
+
+        # Codes of the Rows
+        month_codes, months = pd.factorize(dataframe[self.monthyear])
+        date_codes, dates = pd.factorize(dataframe[self.date])
+        leaf_codes, leaf_indexes, leaves_count = self.__create_leaves(dataframe, category_columns)
+
+        self.month_codes = month_codes
+        self.date_codes = date_codes
+        self.leaf_codes = leaf_codes
+        self.leaves_count = leaves_count  # number of unique combinations of values of Category Columns
+
+        # Labels and Indexes
+        self.months = np.asarray(months, dtype=object)
+        self.dates = pd.DatetimeIndex(dates)
+        self.leaf_indexes = leaf_indexes  # Category Column: CategoryIndex of leaf values
+
+        # MonthYear of every Date (index of .months)
+        self.date_months = np.zeros(len(self.dates), dtype=np.int64)
+        self.date_months[date_codes] = month_codes
+
+        # Aggregates
+        prices = dataframe[self.price].to_numpy(dtype=np.float64)
+        self.month_sums, self.month_counts = self.__aggregate(month_codes, len(self.months), prices)
+        self.date_sums, self.date_counts = self.__aggregate(date_codes, len(self.dates), prices)
+
+        # Masks of months and leaves included in the Cube
+        self.month_mask = np.ones(len(self.months), dtype=bool)
+        self.leaf_mask = np.ones(leaves_count, dtype=bool)
+
+        # Orders of all rows sorted by columns (shared with filtered Cubes, created lazily)
+        self.sort_orders = {}
+
+        # GroupedStatistics of sums of months and dates for sets of leaves (shared with filtered Cubes)
+        self.grouped_statistics = {}
+
+        # Memoized results of calculations on the data of the Cube (not shared with filtered Cubes)
+        self.memoized_results = {}
+
+        # Locks of lazily created values - .shared_lock is shared with filtered Cubes, .lock is not
+        self.shared_lock = threading.RLock()
+        self.lock = threading.RLock()
+
+    @property
+    def dataframe(self):
+        """DataFrame with rows of .source_dataframe from months and leaves included in the Cube."""
+
+        with self.lock:
+            if self.__dataframe is None:
+                self.__dataframe = self.source_dataframe[self.rows_mask()]
+
+            return self.__dataframe
+
+    def rows_mask(self):
+        """Returns boolean np.array (one element per row of .source_dataframe) with True for rows included in
+            the Cube."""
+        return self.month_mask[self.month_codes] & self.leaf_mask[self.leaf_codes]
+
+    def sorted_rows(self, column, ascending=True):
+        """Returns np.array of positions (in .source_dataframe) of rows included in the Cube, sorted by column.
+
+            Sorting is stable - rows with equal values keep their order from .source_dataframe (reversed when
+            ascending is False). Missing values are placed first when sorting in ascending order (and last otherwise).
+        """
+
+        with self.shared_lock:
+            order = self.sort_orders.get(column)
+            if order is None:
+                codes, uniques = pd.factorize(self.source_dataframe[column], sort=True)
+                order = np.argsort(codes, kind="stable")
+                self.sort_orders[column] = order
+
+        rows = order[self.rows_mask()[order]]
+        if not ascending:
+            rows = rows[::-1]
+
+        return rows
+
+    def memoized(self, key, calculate):
+        """Returns result of calculate (callable without arguments) memoized in the Cube under key.
+
+            calculate is called only when there is no result for key yet (once, even if many Threads ask for
+            the result at the same time). Results must not be modified, as they are shared by everyone using
+            the Cube.
+        """
+
+        with self.lock:
+            if key not in self.memoized_results:
+                self.memoized_results[key] = calculate()
+
+            return self.memoized_results[key]
+
+    def filtered(self, months=None, categories=None, excluded_categories=None, category_column=None):
+        """Returns new AggregateCube, including only data from the Cube that:
+                - is from any of months (if months are provided),
+                - belongs to any of categories (if categories are provided),
+                - doesn't belong to any of excluded_categories (if excluded_categories are provided).
+
+            Categories are looked up in category_column, which must be one of Category Columns of the Cube.
+            Aggregated arrays are shared with the Cube, only masks of months and leaves are calculated.
+        """
+
+        cube = object.__new__(AggregateCube)
+        cube.__dict__.update(self.__dict__)
+        cube.__dataframe = None
+        cube.memoized_results = {}
+        cube.lock = threading.RLock()
+
+        if months is not None:
+            cube.month_mask = self.month_mask & np.isin(self.months, np.asarray(months, dtype=object))
+        if categories is not None:
+            cube.leaf_mask = cube.leaf_mask & self.categories_mask(categories, category_column)
+        if excluded_categories is not None:
+            cube.leaf_mask = cube.leaf_mask & ~self.categories_mask(excluded_categories, category_column)
+
+        return cube
+
+    def categories_mask(self, categories, category_column):
+        """Returns boolean np.array (one element per leaf) with True for leaves that belong to any of categories
+            from category_column."""
+        return self.leaf_indexes[category_column].rows_mask(categories)
+
+    def month_totals(self):
+        """Returns Series of sums of price in months included in the Cube, indexed (and sorted) by months.
+
+            Only months in which any transaction was made are present (as if DataFrame was grouped by
+            .monthyear column).
+        """
+
+        sums = self.__leaf_totals(self.month_sums)
+        counts = self.__leaf_totals(self.month_counts)
+        present = self.month_mask & (counts > 0)
+
+        return self.__sorted_series(sums[present], self.months[present])
+
+    def date_totals(self):
+        """Returns Series of sums of price in dates included in the Cube, indexed (and sorted) by dates.
+
+            Only dates in which any transaction was made are present (as if DataFrame was grouped by .date column).
+        """
+
+        sums = self.__leaf_totals(self.date_sums)
+        counts = self.__leaf_totals(self.date_counts)
+        present = self.month_mask[self.date_months] & (counts > 0)
+
+        return self.__sorted_series(sums[present], self.dates[present])
+
+    def month_statistics(self):
+        """Returns dictionary of descriptive statistics (count, mean, std, min, median and max) of sums of price
+            in months included in the Cube - the same as describe() of .month_totals (see GroupedStatistics)."""
+        return self.__unscaled_statistics(self.__grouped_statistics("month").describe(self.month_mask))
+
+    def date_statistics(self):
+        """Returns dictionary of descriptive statistics (count, mean, std, min, median and max) of sums of price
+            in dates included in the Cube - the same as describe() of .date_totals (see GroupedStatistics)."""
+        return self.__unscaled_statistics(self.__grouped_statistics("date").describe(self.month_mask))
+
+    def category_totals(self, category_column):
+        """Returns Series of sums of price of every value of category_column included in the Cube, indexed (and
+            sorted) by the values.
+
+            Only values with any transaction are present (as if DataFrame was grouped by category_column).
+        """
+
+        index = self.leaf_indexes[category_column]
+        leaf_sums = self.month_sums[self.month_mask].sum(axis=0)
+        leaf_counts = self.month_counts[self.month_mask].sum(axis=0)
+
+        # leaves with NaN values (code -1) are skipped
+        leaves = self.leaf_mask & (index.codes >= 0)
+        sums = np.bincount(index.codes[leaves], weights=leaf_sums[leaves], minlength=index.categories_count)
+        counts = np.bincount(index.codes[leaves], weights=leaf_counts[leaves], minlength=index.categories_count)
+        present = counts > 0
+
+        return self.__sorted_series(sums[present], np.asarray(index.categories, dtype=object)[present])
+
+    def category_rollup(self, category_column):
+        """Returns tuple of DataFrames with sums of price and counts of rows included in the Cube for every node of
+            CategoryTree of category_column (index - names of nodes) in every month included in the Cube (columns,
+            sorted).
+
+            Sums and counts are already aggregated for every leaf in every month - they are added to nodes of
+            leaves and propagated up the tree in one bottom-up pass (see CategoryTree.rollup), so that every node
+            (e.g. "Expenses:Family" in "Combinations") holds totals of it's whole subtree and total of any subtree
+            is a lookup, without filtering any rows. Nodes without any rows have sums and counts equal to 0. Sums
+            are divided by .price_scale only after they are rolled up.
+
+            Result is memoized in the Cube.
+        """
+
+        def calculate():
+            tree = self.leaf_indexes[category_column].tree
+            months = np.flatnonzero(self.month_mask)
+            months = months[np.argsort(self.months[months])]
+
+            # leaves x months
+            leaf_sums = np.where(self.leaf_mask, self.month_sums[months], 0).T
+            leaf_counts = np.where(self.leaf_mask, self.month_counts[months], 0).T
+
+            columns = pd.Index(self.months[months], name=self.monthyear)
+            sums = pd.DataFrame(self.__unscaled(tree.rollup(leaf_sums)), index=tree.names, columns=columns)
+            counts = pd.DataFrame(tree.rollup(leaf_counts).astype(np.int64), index=tree.names, columns=columns)
+
+            return sums, counts
+
+        return self.memoized("Category Rollup " + category_column, calculate)
+
+    def __grouped_statistics(self, level):
+        """Returns GroupedStatistics of sums of price in months or dates (depending on level) for leaves included
+            in the Cube, grouped by months.
+
+            Months and dates without any transaction are skipped. GroupedStatistics are created once for every set
+            of leaves and kept in .grouped_statistics, so that they can be described for any months.
+        """
+
+        key = (level, self.leaf_mask.tobytes())
+
+        with self.shared_lock:
+            statistics = self.grouped_statistics.get(key)
+
+            if statistics is None:
+                if level == "month":
+                    sums, counts, groups = self.month_sums, self.month_counts, np.arange(len(self.months))
+                elif level == "date":
+                    sums, counts, groups = self.date_sums, self.date_counts, self.date_months
+                else:
+                    raise Exception("How did I get here?")
+
+                sums = self.__leaf_totals(sums)
+                present = self.__leaf_totals(counts) > 0
+
+                statistics = GroupedStatistics(sums[present], groups[present], len(self.months))
+                self.grouped_statistics[key] = statistics
+
+            return statistics
+
+    def __sorted_series(self, values, index):
+        """Returns Series of values (sums of price, divided by .price_scale) with index, named after .price column
+            and sorted by the index."""
+        return pd.Series(self.__unscaled(values), index=index, name=self.price).sort_index()
+
+    def __unscaled(self, sums):
+        """Returns np.array of sums of price converted to the units of currency (divided by .price_scale)."""
+
+        if self.price_scale == 1:
+            return sums
+
+        return sums / self.price_scale
+
+    def __unscaled_statistics(self, statistics):
+        """Returns dictionary of descriptive statistics with every statistic but count converted to the units of
+            currency (divided by .price_scale)."""
+
+        if self.price_scale == 1:
+            return statistics
+
+        return {name: value if name == "count" else value / self.price_scale for name, value in statistics.items()}
+
+    @staticmethod
+    def __create_leaves(dataframe, category_columns):
+        """Returns leaf codes of the rows and dictionary of Category Column: CategoryIndex of leaf values.
+
+            Values of every Category Column are factorized and the codes are combined into one integer per row -
+            unique combinations of those integers are leaves.
+        """
+
+        combined = np.zeros(dataframe.shape[0], dtype=np.int64)
+        for column in category_columns:
+            codes, uniques = pd.factorize(dataframe[column])
+            # NaN values (code -1) are treated as a separate value
+            combined = combined * (len(uniques) + 1) + (codes + 1)
+
+        leaves, first_rows, leaf_codes = np.unique(combined, return_index=True, return_inverse=True)
+
+        leaf_indexes = {}
+        for column, category_sep in category_columns.items():
+            leaf_values = dataframe[column].iloc[first_rows].reset_index(drop=True)
+            leaf_indexes[column] = CategoryIndex(leaf_values, category_sep)
+
+        return leaf_codes, leaf_indexes, len(leaves)
+
+    def __leaf_totals(self, values):
+        """Returns np.array of totals of 2-dimensional values (groups x leaves) of leaves included in the Cube,
+            one total per group.
+
+            Totals are calculated as a product of values and .leaf_mask (converted to the dtype of values), so that
+            values aren't copied (as they would be by selecting columns with the boolean mask).
+        """
+        return values @ self.leaf_mask.astype(values.dtype)
+
+    def __aggregate(self, group_codes, groups_count, prices):
+        """Returns 2-dimensional arrays (groups x leaves) of sums of prices and counts of rows in each cell."""
+
+        cells = group_codes * self.leaves_count + self.leaf_codes
+        size = groups_count * self.leaves_count
+
+        sums = np.bincount(cells, weights=prices, minlength=size).reshape(groups_count, self.leaves_count)
+        counts = np.bincount(cells, minlength=size).reshape(groups_count, self.leaves_count)
+
+        return sums, counts
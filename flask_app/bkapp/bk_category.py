@@ -1,14 +1,19 @@
+import json
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from functools import partial
 
-from .pandas_functions import unique_values_from_column
+from .pandas_functions import unique_values_from_column, value_counts_from_column, convert_categorical_columns
+from .aggregate_cube import AggregateCube
+from .view_executor import ViewExecutor
+from .source_updates import update_source
 
 from bokeh.models import ColumnDataSource, Select, DataTable, TableColumn, DateFormatter, NumberFormatter, Circle, Label
-from bokeh.models import NumeralTickFormatter
+from bokeh.models import NumeralTickFormatter, FuncTickFormatter, CustomJSHover, FixedTicker, Range1d
 from bokeh.layouts import column, row
 from bokeh.plotting import figure
-from bokeh.models.widgets import Div
+from bokeh.models.widgets import Div, Button
 
 
 class Category(object):
@@ -17,7 +22,9 @@ class Category(object):
         Object expects:
             - appropriate column names for the dataframe that will be provided to other methods;
             - month_format string, which represents in what string format date in monthyear column was saved;
-            - color_map ColorMap object, which exposes attributes for specific colors.
+            - color_map ColorMap object, which exposes attributes for specific colors;
+            - optional price_scale - number of units of price column in the unit of currency (e.g. 100 if prices are
+                int64 cents) - sums are divided by it only when they are shown.
 
         Main methods are:
             - gridplot() : workhorse of the Object, creates elements gridplot, creates callbacks and updates
@@ -27,6 +34,8 @@ class Category(object):
             - update_grid_on_chosen_category_change() and update_grid_on_month_selection_change() : functions that are
                 called when user changes selected category or selected months on a gridplot; they are responsible for
                 appropriate updating gridplot elements.
+            - submit_grid_update() : function called by callbacks of the gridplot - it updates gridplot elements
+                with the DataFrame work done outside of the Bokeh Document lock (see ViewExecutor).
 
         Attributes of the instance Object are described as single-line comments in __init__() method;
         Attributes of the class are HTML templates used in Div Elements creation; they are described in corresponding
@@ -86,7 +95,7 @@ class Category(object):
         <div class="hover_tooltip">
             <div>
                 <span>Month: </span>
-                <span>@x</span>
+                <span>@x{custom}</span>
             </div>
             <div>
                 <span>Value: </span>
@@ -97,8 +106,12 @@ class Category(object):
 
     interaction_message = "Select MonthPoints on the Plot to interact with the Dashboard"
 
+    transactions_pages = "<span>{first}-{last}</span> of <span>{count}</span> Transactions"
+    transactions_page_size = 50
+
     def __init__(self, category_colname, monthyear_colname, price_colname, product_colname,
-                 date_colname, currency_colname, shop_colname, month_format, color_mapping):
+                 date_colname, currency_colname, shop_colname, month_format, color_mapping,
+                 price_scale=1):
 
         # Column Names
         self.category = category_colname
@@ -115,17 +128,42 @@ class Category(object):
         # ColorMap
         self.color_map = color_mapping  # ColorMap object exposing attributes with specific colors
 
+        # Price Scale
+        self.price_scale = price_scale  # units of price column in the unit of currency (e.g. 100 for cents)
+
+        # ViewExecutor
+        self.executor = ViewExecutor()  # executes updates from callbacks outside of the Document lock
+
         # DataFrames
         self.original_df = None  # original dataframe passed to the gridplot function
         self.chosen_category_df = None  # original dataframe filtered only to the chosen category
         self.chosen_months_and_category_df = None  # original dataframe filtered only to the chosen category and months
 
+        # Aggregates
+        self.aggregate_cube = None  # AggregateCube of original dataframe
+        self.chosen_category_cube = None  # AggregateCube filtered only to the chosen category
+        self.chosen_months_and_category_cube = None  # AggregateCube filtered only to the chosen category and months
+
         # State Variables
         self.categories = None
         self.months = None
         self.chosen_category = None
         self.chosen_months = None
 
+        # Transactions Table Variables
+        self.transactions_sort_options = {  # labels of sort options: (column, ascending) pairs
+            "Date (oldest first)": (self.date, True),
+            "Date (newest first)": (self.date, False),
+            "Price (lowest first)": (self.price, True),
+            "Price (highest first)": (self.price, False),
+            "Product (A-Z)": (self.product, True),
+            "Shop (A-Z)": (self.shop, True)
+        }
+        self.transactions_sort = list(self.transactions_sort_options)[0]  # label of the chosen sort option
+        self.transactions_rows = None  # positions of sorted rows of .chosen_months_and_category_df in .transactions_df
+        self.transactions_df = None  # DataFrame to which .transactions_rows refer (source DataFrame of the Cube)
+        self.transactions_page = 0  # index of the page of .transactions_rows shown in the Transactions Table
+
         # Identifiers for Grid Elements and DataSources
         self.g_category_title = "Category Title"
         self.g_dropdown = "Dropdown"
@@ -137,18 +175,24 @@ class Category(object):
         self.g_line_plot = "Line Plot"
         self.g_product_histogram = "Product Histogram"
         self.g_transactions = "Transactions"
+        self.g_transactions_sort = "Transactions Sort"
+        self.g_transactions_previous = "Transactions Previous Page"
+        self.g_transactions_pages = "Transactions Pages"
+        self.g_transactions_next = "Transactions Next Page"
 
         # Dicts of Elements and DataSources
         self.grid_elem_dict = None
         self.grid_source_dict = None
 
-    def gridplot(self, dataframe, current_categories):
+    def gridplot(self, dataframe, current_categories, aggregate_cube=None):
         """Main function of Category Object. Creates Gridplot with appropriate Visualizations and Elements and
             returns it.
 
             Accepts
                 - dataframe that should be a Dataframe representing Expenses;
-                - current_categories list with categories which user will interact with.
+                - current_categories list with categories which user will interact with;
+                - aggregate_cube (optional) AggregateCube of dataframe - if it isn't provided, it is created from
+                    the dataframe.
 
             The function does several things:
                 - initializes the gridplot,
@@ -167,6 +211,7 @@ class Category(object):
         self.original_df = dataframe
         self.chosen_category_df = dataframe
         self.chosen_months_and_category_df = dataframe
+        self.aggregate_cube = aggregate_cube
 
         # TODO: categories will be extracted depending on settings
         self.categories = current_categories
@@ -178,10 +223,11 @@ class Category(object):
         self.update_grid_on_chosen_category_change()
 
         # Setting up the Callbacks
+        # DataFrames are calculated outside of the Document lock (see submit_grid_update)
         def dropdown_callback(attr, old, new):
             if new != old:
                 self.__update_chosen_category(new)
-                self.update_grid_on_chosen_category_change()
+                self.submit_grid_update()
 
         self.grid_elem_dict[self.g_dropdown].on_change("value", dropdown_callback)
 
@@ -190,10 +236,29 @@ class Category(object):
             old_indices = set(old)
 
             if new_indices != old_indices:
-                self.update_grid_on_month_selection_change(new_indices)
+                self.__update_chosen_months(new_indices)
+                self.submit_grid_update()
 
         self.grid_source_dict[self.g_line_plot].selected.on_change("indices", selection_callback)
 
+        def transactions_sort_callback(attr, old, new):
+            if new != old:
+                self.__update_transactions_sort(new)
+                self.submit_grid_update()
+
+        self.grid_elem_dict[self.g_transactions_sort].on_change("value", transactions_sort_callback)
+
+        # changing page only takes rows from the already sorted .transactions_rows, so it's done immediately
+        def transactions_previous_callback():
+            self.__update_transactions_page(self.transactions_page - 1)
+
+        self.grid_elem_dict[self.g_transactions_previous].on_click(transactions_previous_callback)
+
+        def transactions_next_callback():
+            self.__update_transactions_page(self.transactions_page + 1)
+
+        self.grid_elem_dict[self.g_transactions_next].on_click(transactions_next_callback)
+
         # Gridplot
         output = column(
             row(self.grid_elem_dict[self.g_category_title], css_classes=["first_row"]),
@@ -211,7 +276,14 @@ class Category(object):
                 css_classes=["second_row"]),
             row(
                 self.grid_elem_dict[self.g_product_histogram],
-                self.grid_elem_dict[self.g_transactions],
+                column(
+                    row(
+                        self.grid_elem_dict[self.g_transactions_sort],
+                        self.grid_elem_dict[self.g_transactions_previous],
+                        self.grid_elem_dict[self.g_transactions_pages],
+                        self.grid_elem_dict[self.g_transactions_next],
+                        css_classes=["transactions_controls"]),
+                    self.grid_elem_dict[self.g_transactions]),
                 css_classes=["third_row"]),
             sizing_mode="stretch_width"
         )
@@ -228,6 +300,7 @@ class Category(object):
                 - Category Dropdown Select Widget
                 - Line Plot
                 - 2 DataTables
+                - Transactions Sort Select, Previous and Next Page Buttons and Pages Div of Transactions DataTable
 
             Additionally, Separate DataSources (ColumnDataSources) are created for:
                 - Line Plot
@@ -270,6 +343,14 @@ class Category(object):
         source_dict[self.g_transactions] = self.__create_transactions_source()
         elem_dict[self.g_transactions] = self.__create_transactions_table(source_dict[self.g_transactions])
 
+        # Transactions DataTable Controls
+        elem_dict[self.g_transactions_sort] = Select(value=self.transactions_sort,
+                                                     options=list(self.transactions_sort_options),
+                                                     css_classes=["transactions_sort"])
+        elem_dict[self.g_transactions_previous] = Button(label="Previous", css_classes=["transactions_button"])
+        elem_dict[self.g_transactions_pages] = Div(text="", css_classes=["transactions_pages"])
+        elem_dict[self.g_transactions_next] = Button(label="Next", css_classes=["transactions_button"])
+
         # Select Dropdown
         elem_dict[self.g_dropdown] = Select(value=self.chosen_category, options=self.categories,
                                             css_classes=["category_dropdown"])
@@ -283,16 +364,8 @@ class Category(object):
         self.__update_chosen_category_dataframe()
         self.__update_chosen_months_and_category_dataframe()
 
-        self.__update_category_title()
-        self.__update_statistics_table()
-        self.__update_total_from_category()
-        self.__update_category_fraction()
-        self.__update_total_products_from_category()
-        self.__update_category_products_fraction()
-
-        self.__update_line_plot()
-        self.__update_product_histogram_table()
-        self.__update_transactions_table()
+        self.__update_category_elements()
+        self.__update_chosen_months_elements()
 
     def update_grid_on_month_selection_change(self, new_indices):
         """Helper function that calls specific updates for specified elements of the grid."""
@@ -300,8 +373,26 @@ class Category(object):
         self.__update_chosen_months(new_indices)
         self.__update_chosen_months_and_category_dataframe()
 
-        self.__update_transactions_table()
-        self.__update_product_histogram_table()
+        self.__update_chosen_months_elements()
+
+    def submit_grid_update(self):
+        """Submits update of the grid to .executor ViewExecutor, reflecting current .chosen_category,
+            .chosen_months and .transactions_sort.
+
+            AggregateCubes and DataFrames filtered to .chosen_category and .chosen_months (and sorted rows of
+            Transactions) are calculated outside of the Bokeh Document lock (in a Thread Pool of ViewExecutor) by
+            __calculate_dataframes, which gets all choices as arguments. Results are then loaded into attributes and
+            all elements of the grid are updated with them by __apply_dataframes - only this part is done while
+            the Document is locked.
+            If the User makes another choice before the update is applied, the update is dropped and only the newest
+            one is applied.
+
+            When the grid isn't a part of any Document, update is made immediately.
+        """
+
+        calculate = partial(self.__calculate_dataframes, self.__get_aggregate_cube(), self.chosen_category,
+                            self.chosen_months, self.transactions_sort)
+        self.executor.submit(calculate, self.__apply_dataframes, self.grid_elem_dict[self.g_dropdown].document)
 
     def change_category_column(self, new_col):
         """Changes .category attribute to col argument."""
@@ -313,20 +404,21 @@ class Category(object):
         """Creation of Line Plot DataSource for Gridplot.
 
             ColumnDataSource consist of two keys:
-                - x : contains months for the X-axis, formatted in "%b-%y" format (e.g. Jan-19)
+                - x : contains indexes of months (in .months) for the X-axis - they are formatted into month names
+                    in the browser (see __create_line_plot)
                 - y : temp values of the same length as x; they will be replaced when the update function for the
                     line plot is called
 
+            Both keys are numeric np.arrays, so that they are sent to the browser as binary arrays.
+
             Returns created ColumnDataSource.
         """
 
-        temp_values = [1] * len(self.months)  # done to ensure that the shape of y values is the same as x
-        formatted_months = [datetime.strftime(datetime.strptime(month, self.monthyear_format), "%b-%y")
-                            for month in self.months]
+        temp_values = np.ones(len(self.months))  # done to ensure that the shape of y values is the same as x
 
         source = ColumnDataSource(
             data={
-                "x": formatted_months,
+                "x": np.arange(len(self.months)),
                 "y": temp_values
             }
         )
@@ -346,7 +438,9 @@ class Category(object):
             Figure will plot two models: Line and Scatter (Circles). This is done so that user can freely select
             points on the graph and have visual cues (decreased alpha) that the selection works.
 
-            Figure itself will plot "x" values from CDS on X-axis and "y" values from CDS on Y-axis.
+            Figure itself will plot "x" values from CDS on X-axis and "y" values from CDS on Y-axis. As "x" values
+            are indexes of months, they are formatted into month names (in "%b-%y" format, e.g. Jan-19) in the browser
+            - both in ticks of X-axis and in the hover tooltip.
 
             Additionally, message is added at the bottom of the plot, informing user about possibility of
             selecting points on the graph.
@@ -360,8 +454,14 @@ class Category(object):
 
         base_color = self.color_map.base_color
 
-        p = figure(width=550, height=400, x_range=cds.data["x"], y_range=[0, 10], tooltips=self.line_plot_tooltip,
-                   toolbar_location=None, tools=["box_select"])
+        month_names = [datetime.strptime(month, self.monthyear_format).strftime("%b-%y") for month in self.months]
+        # names are embedded in the code, as CustomJSHover accepts only Models as args
+        month_formatter_code = "return " + json.dumps(month_names) + "[{index}] || '';"
+
+        p = figure(width=550, height=400, x_range=Range1d(-0.5, len(month_names) - 0.5), y_range=[0, 10],
+                   tooltips=self.line_plot_tooltip, toolbar_location=None, tools=["box_select"])
+
+        p.hover.formatters = {"@x": CustomJSHover(code=month_formatter_code.format(index="value"))}
         p.line(x="x", y="y", source=cds, color=base_color, line_width=5, )
 
         scatter = p.circle(x="x", y="y", source=cds, color=base_color, size=4)
@@ -387,6 +487,8 @@ class Category(object):
         p.axis.major_label_text_font_size = "13px"
         p.xaxis.major_label_orientation = 0.785  # 45 degrees in radians
 
+        p.xaxis.ticker = FixedTicker(ticks=list(range(len(month_names))))
+        p.xaxis.formatter = FuncTickFormatter(code=month_formatter_code.format(index="tick"))
         p.yaxis.formatter = NumeralTickFormatter(format="0,0.00")
 
         return p
@@ -468,7 +570,9 @@ class Category(object):
             formatted to %d-%m-%Y format (31-01-2019) and .price field will be formatted into 0,0.00 format
             (1,897.34).
 
-            DataTable has it's index (counter) column removed for clarity.
+            DataTable has it's index (counter) column removed for clarity. Source holds only one page of transactions
+            (see __update_transactions_page), so sorting by clicking on the header is disabled - rows are sorted on
+            the server instead (with Transactions Sort Select).
 
             Returns created DataTable.
         """
@@ -479,7 +583,7 @@ class Category(object):
             TableColumn(field=self.shop, title="Shop")
         ]
 
-        dt = DataTable(source=source, columns=columns, header_row=True, index_position=None)
+        dt = DataTable(source=source, columns=columns, header_row=True, index_position=None, sortable=False)
         return dt
 
     # ========== Updating Grid Elements ========== #
@@ -514,18 +618,17 @@ class Category(object):
     def __update_chosen_category_dataframe(self):
         """Function updates .chosen_category_df attribute with DataFrame filtered to .chosen_category.
 
-            DataFrame in .original_df attribute is filtered to produce a view that includes rows where
-            .category column contains .chosen_category String.
-
-            Filtering is done via .str.contains method - filtering DataFrame this way allows greater flexibility:
-                - full String can be passed which will reduce "rows" of the DataFrame greatly, or
-                - only a part of String can be passed - this way partial filtering and less granularity can be
-                    achieved.
+            AggregateCube of .original_df is filtered to .chosen_category (in .category column) - depending on the
+            Category Column of the AggregateCube, either rows with exactly .chosen_category value are included, or
+            rows of .chosen_category and all Categories under it in the Category tree (see AggregateCube).
+            Filtered AggregateCube is kept in .chosen_category_cube, so that aggregates of the Category can be
+            calculated without grouping the DataFrame again.
 
-            Attribute .chosen_category_dataframe is updated.
+            Attributes .chosen_category_cube and .chosen_category_dataframe are updated.
         """
 
-        self.chosen_category_df = self.original_df[self.original_df[self.category].str.contains(self.chosen_category)]
+        self.chosen_category_cube = self.__filter_aggregate_cube(self.__get_aggregate_cube(), self.chosen_category)
+        self.chosen_category_df = self.chosen_category_cube.dataframe
 
     def __update_chosen_months_and_category_dataframe(self):
         """Function updates .chosen_month_and_category_df attribute with data filtered by category and months.
@@ -535,12 +638,69 @@ class Category(object):
             column value is present in collection of .chosen_months attribute.
             This way, DataFrame (View) filtered to specific category and months is created.
 
-            Attribute .chosen_months_and_category_df is updated.
+            Attributes .chosen_months_and_category_cube and .chosen_months_and_category_df are updated.
+        """
+
+        self.chosen_months_and_category_cube = self.__filter_aggregate_cube(self.__get_aggregate_cube(),
+                                                                            self.chosen_category, self.chosen_months)
+        self.chosen_months_and_category_df = self.chosen_months_and_category_cube.dataframe
+
+    def __update_category_elements(self):
+        """Helper function that calls updates of all elements of the grid depending on .chosen_category."""
+
+        self.__update_category_title()
+        self.__update_statistics_table()
+        self.__update_total_from_category()
+        self.__update_category_fraction()
+        self.__update_total_products_from_category()
+        self.__update_category_products_fraction()
+
+        self.__update_line_plot()
+
+    def __update_chosen_months_elements(self):
+        """Helper function that calls updates of all elements of the grid depending on .chosen_months."""
+
+        self.__update_product_histogram_table()
+        self.__update_transactions_table()
+
+    def __calculate_dataframes(self, aggregate_cube, category, months, transactions_sort):
+        """Function calculates AggregateCubes and DataFrames for category and months arguments.
+
+            aggregate_cube (AggregateCube of .original_df, see __get_aggregate_cube) is filtered to category and then
+            to category and months, the same way as in __update_chosen_category_dataframe and
+            __update_chosen_months_and_category_dataframe functions.
+            DataFrames of both AggregateCubes are created here as well, as it's the most expensive part of
+            the filtering. Rows of category and months are also sorted according to transactions_sort label (see
+            __sort_transactions).
+
+            Function doesn't change any attribute, so it can be called outside of the Bokeh Document lock (see
+            submit_grid_update).
+
+            Returns tuple of AggregateCube filtered to category, it's DataFrame, AggregateCube filtered to category
+            and months, it's DataFrame and sorted positions of it's rows.
         """
 
-        all_months_df = self.original_df[
-            self.original_df[self.category].str.contains(self.chosen_category)]
-        self.chosen_months_and_category_df = all_months_df[all_months_df[self.monthyear].isin(self.chosen_months)]
+        chosen_category_cube = self.__filter_aggregate_cube(aggregate_cube, category)
+        chosen_months_and_category_cube = self.__filter_aggregate_cube(aggregate_cube, category, months)
+
+        return (chosen_category_cube, chosen_category_cube.dataframe, chosen_months_and_category_cube,
+                chosen_months_and_category_cube.dataframe,
+                self.__sort_transactions(chosen_months_and_category_cube, transactions_sort))
+
+    def __apply_dataframes(self, dataframes):
+        """Function loads dataframes (tuple returned by __calculate_dataframes) into attributes and updates all
+            elements of the grid.
+
+            Attributes .chosen_category_cube, .chosen_category_df, .chosen_months_and_category_cube and
+            .chosen_months_and_category_df are updated.
+        """
+
+        (self.chosen_category_cube, self.chosen_category_df, self.chosen_months_and_category_cube,
+         self.chosen_months_and_category_df, transactions_rows) = dataframes
+
+        self.__update_category_elements()
+        self.__update_product_histogram_table()
+        self.__update_transactions_table(transactions_rows)
 
     def __update_category_title(self):
         """Function updates text in Category Title Div.
@@ -562,9 +722,9 @@ class Category(object):
 
 
             Several values for formatting are extracted:
-                - count : how many transactions from a .chosen_category were made
-            .chosen_category_df is grouped by .monthyear column and the sum is calculated, from which next values
-            are calculated:
+                - count : how many transactions from a .chosen_category were made (see __chosen_category_totals)
+            monthly sums of .chosen_category are taken from .chosen_category_cube (as if .chosen_category_df was
+            grouped by .monthyear column), from which next values are calculated (see GroupedStatistics):
                 - last : sum of expenses from the last month (based on .months attribute). If a given category didn't
                     have any expenses last month, np.nan is used
                 - mean
@@ -584,16 +744,14 @@ class Category(object):
 
         format_dict = {}
 
-        category_df = self.chosen_category_df.groupby(self.monthyear).sum()
-        if self.months[-1] in category_df.index:
-            last = category_df[self.price].iloc[-1]
+        category_sums = self.chosen_category_cube.month_totals()
+        if self.months[-1] in category_sums.index:
+            last = category_sums.iloc[-1]
         else:
             last = np.nan
-        count = self.chosen_category_df.shape[0]
+        count = self.__chosen_category_totals()[1]
 
-        describe_dict = category_df.describe()[self.price].to_dict()
-        format_dict.update(describe_dict)
-        format_dict["median"] = format_dict["50%"]  # percentage signs are unsupported as keyword arguments
+        format_dict.update(self.chosen_category_cube.month_statistics())
         format_dict["last"] = last
         format_dict["count"] = count
         format_dict["curr"] = self.original_df[self.currency].unique()[0]  # TODO: implement currency properly
@@ -603,13 +761,14 @@ class Category(object):
     def __update_total_from_category(self):
         """Function updates text in total_from_category Div (one of the "Headlines" Div).
 
-            Div shows total sum of expenses calculated from .chosen_category_df DataFrame. Sum of .price column is
-            inserted into the HTML template located in .total_from_category by {total_from_category} format argument.
+            Div shows total sum of expenses of .chosen_category, taken from the Category roll-up (see
+            __chosen_category_totals). Sum is inserted into the HTML template located in .total_from_category by
+            {total_from_category} format argument.
 
             Grid Element .g_total_from_category[.text] is updated.
         """
 
-        total_from_category = self.chosen_category_df[self.price].sum()
+        total_from_category = self.__chosen_category_totals()[0]
         self.grid_elem_dict[self.g_total_from_category].text = self.total_from_category.format(
             total_from_category=total_from_category)
 
@@ -617,16 +776,16 @@ class Category(object):
         """Function updates text in category_fraction Div (one of the "Headlines" Div).
 
             Div shows fraction of percentage of .chosen_category in comparison to total Expenses provided in the
-            .original_df. Fraction is calculated as sum of .chosen_category_df[.price] value divided by the sum of
-            .original_df[.price].
+            .original_df. Fraction is calculated as sum of expenses of .chosen_category (see
+            __chosen_category_totals) divided by the sum of monthly sums of .original_df (taken from AggregateCube).
             The value is then inserted into .category_fraction HTML template, with {category_fraction} format
             argument being replaced with the percentage value.
 
             Grid Element .g_category_fraction[.text] is updated.
         """
 
-        category_sum = self.chosen_category_df[self.price].sum()
-        total_sum = self.original_df[self.price].sum()
+        category_sum = self.__chosen_category_totals()[0]
+        total_sum = self.__get_aggregate_cube().month_totals().sum()
         category_fraction = category_sum / total_sum
 
         self.grid_elem_dict[self.g_category_fraction].text = self.category_fraction.format(
@@ -635,14 +794,14 @@ class Category(object):
     def __update_total_products_from_category(self):
         """Function updates total_products_from_category Div text (one of the 4 "Headlines" Divs).
 
-            Div shows how many Products were bought from a category (in .chosen_category_df DataFrame). Simple shape
-            of .chosen_category_df is retrieved, which is then inserted into .total_products_from_category HTML
-            template as a {total_products_from_category} format argument.
+            Div shows how many Products were bought from a category - number of transactions of .chosen_category is
+            taken from the Category roll-up (see __chosen_category_totals) and then inserted into
+            .total_products_from_category HTML template as a {total_products_from_category} format argument.
 
             Grid Element .g_total_products_from_category[.text] is updated.
         """
 
-        total_products_from_category = self.chosen_category_df.shape[0]
+        total_products_from_category = self.__chosen_category_totals()[1]
 
         self.grid_elem_dict[self.g_total_products_from_category].text = self.total_products_from_category.format(
             total_products_from_category=total_products_from_category
@@ -652,15 +811,15 @@ class Category(object):
         """Function updates category_products_fraction Div text (one of the 4 "Headlines" Divs).
 
             Div shows what is a fraction of Products bought from a .chosen_category as a percentage of all
-            Products bought. Numbers are obtained as DataFrame shapes from .chosen_category_df and .original_df,
-            respectively and then first value is divided by the second value.
+            Products bought. Numbers are obtained from the Category roll-up (see __chosen_category_totals) and as
+            a shape of .original_df, respectively and then first value is divided by the second value.
             .category_products_fraction HTML template is then updated as {category_products_fraction} format
             argument is replaced by the result of the division.
 
             Grid Element .g_category_products_fraction[.text] is updated.
         """
 
-        category_products = self.chosen_category_df.shape[0]
+        category_products = self.__chosen_category_totals()[1]
         all_products = self.original_df.shape[0]
         category_products_fraction = category_products / all_products
 
@@ -671,8 +830,8 @@ class Category(object):
     def __update_line_plot(self):
         """Function updates Line Plot and it's corresponding ColumnDataSource.
 
-            Values are calculated from .chosen_category_df DataFrame - DataFrame is grouped by .monthyear and then
-            Pandas Series is extracted to dictionary, with .monthyear column as index and .price as values. Series
+            Values are calculated from .chosen_category_cube AggregateCube - monthly sums are extracted to dictionary,
+            with months as keys and sums of .price as values. Series
             is compared to .months - to maintain the length of values of all months used in .original_df, any month not
             present in Series is given np.nan value.
 
@@ -686,8 +845,8 @@ class Category(object):
             Grid Element .g_line_plot and Grid Source Element .g_line_plot are updated.
         """
 
-        category_dict = self.chosen_category_df.groupby([self.monthyear]).sum()[self.price].to_dict()
-        values = [category_dict[month] if month in category_dict else np.nan for month in self.months]
+        category_dict = self.chosen_category_cube.month_totals().to_dict()
+        values = np.array([category_dict[month] if month in category_dict else np.nan for month in self.months])
 
         self.grid_source_dict[self.g_line_plot].data["y"] = values
         self.grid_elem_dict[self.g_line_plot].y_range.start = 0
@@ -701,28 +860,131 @@ class Category(object):
             .chosen_months_and_category is used as a basis for calculation.
             Generally speaking, a Histogram is created by using .value_counts() method - .product counts are then
             used as a replacement for Grid Source Element .g_product_histogram[.data] - there is no need to modify
-            the DataTable itself.
+            the DataTable itself. Only rows that changed are sent to the browser (see update_source).
 
             Grid Source Element .g_product_histogram[.data] is updated.
         """
 
-        product_counts = pd.DataFrame(self.chosen_months_and_category_df[self.product].value_counts(dropna=True))
-        self.grid_source_dict[self.g_product_histogram].data = product_counts
+        product_counts = value_counts_from_column(self.chosen_months_and_category_df, self.product)
+        update_source(self.grid_source_dict[self.g_product_histogram], product_counts)
 
-    def __update_transactions_table(self):
+    def __update_transactions_table(self, transactions_rows=None):
         """Function updates All Transactions DataTable.
 
             The purpose of this DataTable is to show all Transactions that involved .chosen_category and were done
-            somewhere along .chosen_months months. Therefore, .chosen_months_and_category_df is used as a basis for
-            this function.
-            DataTable only shows transactions in a format specified while creating the DataTable, so no calculations
-            are necessary. For visual clarity, np.nan values are replaced with single hyphen "-" and values are
-            sorted by .date column.
-            Only Grid Source Element is modified - no need to modify the DataTable itself.
-
-            Grid Source Element .g_transactions[.data] is updated.
+            somewhere along .chosen_months months - rows of .chosen_months_and_category_cube, sorted according to
+            .transactions_sort (see __sort_transactions). Positions of sorted rows can be also provided as
+            transactions_rows argument, if they were already calculated.
+
+            There might be hundreds of thousands of such Transactions, so they are never sent to the browser at once.
+            Sorted positions of rows are kept in .transactions_rows on the server and only one page of them is shown
+            in the DataTable - the first page is loaded by __update_transactions_page.
+
+            Positions of rows refer to .source_dataframe of the Cube - which is not .original_df when the Cube was
+            filtered from the AggregateCube of all data (e.g. with some Categories deselected in Settings), so it's
+            kept in .transactions_df.
+
+            Attributes .transactions_rows, .transactions_df and .transactions_page are updated.
+        """
+
+        cube = self.chosen_months_and_category_cube
+        if transactions_rows is None:
+            transactions_rows = self.__sort_transactions(cube, self.transactions_sort)
+
+        self.transactions_rows = transactions_rows
+        self.transactions_df = cube.source_dataframe
+        self.__update_transactions_page(0)
+
+    def __update_transactions_page(self, page):
+        """Function loads page of .transactions_rows into Transactions DataTable.
+
+            page is clipped to pages that exist in .transactions_rows (each has .transactions_page_size rows).
+            Rows of the page are taken from .transactions_df and only they are loaded into Grid Source Element - there
+            is no need to modify the DataTable itself. For visual clarity, np.nan values are replaced with single
+            hyphen "-" and prices are divided by .price_scale. Only rows that changed are sent to the browser (see
+            update_source).
+
+            Text of Pages Div is updated with .transactions_pages template - {first} and {last} are replaced with
+            numbers of the first and the last row shown and {count} with the number of all rows. Previous and Next
+            Buttons are disabled if there is no previous or next page, respectively.
+
+            Attribute .transactions_page, Grid Source Element .g_transactions[.data] and Grid Elements
+            .g_transactions_pages[.text], .g_transactions_previous[.disabled] and .g_transactions_next[.disabled] are
+            updated.
         """
 
-        df = self.chosen_months_and_category_df.fillna("-")
-        df = df.sort_values(by=[self.date], ascending=True)
-        self.grid_source_dict[self.g_transactions].data = df
+        count = len(self.transactions_rows)
+        last_page = max(count - 1, 0) // self.transactions_page_size
+        page = min(max(page, 0), last_page)
+
+        start = page * self.transactions_page_size
+        rows = self.transactions_rows[start:start + self.transactions_page_size]
+
+        df = convert_categorical_columns(self.transactions_df.iloc[rows])
+        df = df.assign(**{self.price: df[self.price] / self.price_scale}).fillna("-")
+        update_source(self.grid_source_dict[self.g_transactions], df)
+
+        self.transactions_page = page
+        self.grid_elem_dict[self.g_transactions_pages].text = self.transactions_pages.format(
+            first=start + 1 if count > 0 else 0, last=start + len(rows), count=count)
+        self.grid_elem_dict[self.g_transactions_previous].disabled = page == 0
+        self.grid_elem_dict[self.g_transactions_next].disabled = page == last_page
+
+    def __update_transactions_sort(self, label):
+        """Function updates .transactions_sort attribute with label of the chosen sort option.
+
+            Attribute .transactions_sort is updated.
+        """
+
+        self.transactions_sort = label
+
+    # ========== Miscellaneous ========== #
+
+    def __sort_transactions(self, cube, transactions_sort):
+        """Returns positions (in .source_dataframe of cube) of rows of AggregateCube cube, sorted according to
+            transactions_sort label (one of .transactions_sort_options).
+
+            Sorted order of all rows of .source_dataframe is kept by AggregateCube for every column - only rows of cube
+            are taken from it, so changing months or Category doesn't sort rows again.
+        """
+
+        column, ascending = self.transactions_sort_options[transactions_sort]
+        return cube.sorted_rows(column, ascending)
+
+    def __chosen_category_totals(self):
+        """Returns tuple of sum of .price and number of transactions of .chosen_category (and all of it's
+            descendants in the Category tree) from all months.
+
+            Totals are taken from the roll-up of AggregateCube of .original_df (see AggregateCube.category_rollup),
+            which is calculated once for the Cube - any Category is then a lookup of it's node, without filtering
+            any rows. Categories without any transactions have both totals equal to 0.
+        """
+
+        sums, counts = self.__get_aggregate_cube().category_rollup(self.category)
+        if self.chosen_category not in sums.index:
+            return 0, 0
+
+        return sums.loc[self.chosen_category].sum(), int(counts.loc[self.chosen_category].sum())
+
+    def __filter_aggregate_cube(self, aggregate_cube, category, months=None):
+        """Returns aggregate_cube (AggregateCube of .original_df) filtered to category (in .category column) and to
+            months (if they are provided)."""
+
+        return aggregate_cube.filtered(months=months, categories=[category], category_column=self.category)
+
+    def __get_aggregate_cube(self):
+        """Returns AggregateCube of .original_df.
+
+            If .aggregate_cube wasn't created from .original_df or it doesn't include current .category column
+            (e.g. when .original_df was replaced), new AggregateCube is created from .original_df, with
+            Categories of .category column matched by exact values.
+
+            Attribute .aggregate_cube might be updated.
+        """
+
+        cube = self.aggregate_cube
+        if cube is None or cube.dataframe is not self.original_df or self.category not in cube.category_columns:
+            self.aggregate_cube = AggregateCube(self.original_df, self.monthyear, self.date, self.price,
+                                                {self.category: None}, self.price_scale)
+
+        return self.aggregate_cube
@@ -1,7 +1,7 @@
 import pandas as pd
-import numpy as np
 
 from datetime import datetime
+from functools import partial
 from math import pi
 
 from bokeh.models import ColumnDataSource
@@ -12,6 +12,10 @@ from bokeh.layouts import column, row
 from bokeh.plotting import figure
 
 from .pandas_functions import unique_values_from_column
+from .aggregate_cube import AggregateCube
+from .month_partition import MonthPartition
+from .monthly_summary import MonthlySummary
+from .view_executor import ViewExecutor
 
 
 class Overview(object):
@@ -21,7 +25,9 @@ class Overview(object):
                 - appropriate column names for the dataframes (expense/income) that will be provided to other methods;
                 - server_date datetime object, representing time at which server initialized Overview Object
                 - month_format string, which represents in what string format date in monthyear column was saved;
-                - color_map ColorMap object, which exposes attributes for specific colors.
+                - color_map ColorMap object, which exposes attributes for specific colors;
+                - optional price_scale - number of units of price column in the unit of currency (e.g. 100 if prices
+                    are int64 cents) - sums are divided by it only when they are shown.
 
             Main methods are:
                 - gridplot() : workhorse of the Object, creates elements gridplot, creates callbacks and updates
@@ -30,6 +36,8 @@ class Overview(object):
                     appropriately to self.grid_elem_dict and self.grid_source_dict
                 - update_gridplot function, that is called either during initialization or when user changes the
                     selection of the Month; updates gridplot with data corresponding to new Month.
+                - submit_gridplot_update() : function called by callbacks of the gridplot - it updates gridplot
+                    elements with the DataFrame work done outside of the Bokeh Document lock (see ViewExecutor).
 
             Attributes of the instance Object are described as single-line comments in __init__() method;
             piechart_start_angle defines the start offset for the piechart plotting; refer to piechart methods for
@@ -73,7 +81,8 @@ class Overview(object):
     """
 
     def __init__(self, category_colname, monthyear_colname, price_colname, product_colname,
-                 date_colname, currency_colname, shop_colname, month_format, server_date, color_mapping):
+                 date_colname, currency_colname, shop_colname, month_format, server_date, color_mapping,
+                 price_scale=1):
 
         # Column Names
         self.category = category_colname
@@ -93,6 +102,12 @@ class Overview(object):
         # ColorMap
         self.color_map = color_mapping  # ColorMap object exposing attributes with specific colors
 
+        # Price Scale
+        self.price_scale = price_scale  # units of price column in the unit of currency (e.g. 100 for cents)
+
+        # ViewExecutor
+        self.executor = ViewExecutor()  # executes updates from callbacks outside of the Document lock
+
         # DataFrames
         # Next Month Dataframes are provided as they will be needed to create Budget Predictions
 
@@ -103,10 +118,17 @@ class Overview(object):
         self.chosen_month_income_df = None  # original Income DataFrame filtered only to chosen month
         self.next_month_income_df = None  # original Income DataFrame filtered only to next month
 
+        # Aggregates
+        self.aggregate_cube = None  # AggregateCube of original Expense DataFrame
+        self.expense_partition = None  # MonthPartition of original Expense DataFrame
+        self.income_partition = None  # MonthPartition of original Income DataFrame
+        self.monthly_summary = None  # MonthlySummary of original Expense and Income DataFrames
+
         # State Variables
         self.months = None
         self.chosen_month = None
         self.next_month = None
+        self.next_months = {}  # (month, date format): next month pairs of already chosen months
 
         # Identifiers for Grid Elements and DataSources
         self.g_month_dropdown = "Month Dropdown"
@@ -125,12 +147,14 @@ class Overview(object):
         self.grid_elem_dict = None
         self.grid_source_dict = None
 
-    def gridplot(self, expense_dataframe, income_dataframe):
+    def gridplot(self, expense_dataframe, income_dataframe, aggregate_cube=None):
         """Main function of Overview Object. Creates Gridplot with appropriate Visualizations and Elements and
             returns it.
 
             Accepts expense_dataframe argument that should be a Dataframe representing Expenses and
-                income_dataframe argument, that should be a Dataframe representing Incomes.
+                income_dataframe argument, that should be a Dataframe representing Incomes. Optional aggregate_cube
+                argument should be AggregateCube of expense_dataframe - if it isn't provided, it is created from
+                the expense_dataframe.
 
             The function does several things:
                 - initializes the gridplot,
@@ -144,6 +168,7 @@ class Overview(object):
 
         self.original_expense_df = expense_dataframe
         self.original_income_df = income_dataframe
+        self.aggregate_cube = aggregate_cube
         self.months = unique_values_from_column(self.original_expense_df, self.monthyear)
 
         first_month = self.__choose_month_based_on_server_date()
@@ -152,9 +177,11 @@ class Overview(object):
         self.update_gridplot(first_month)
 
         # Setting up the Callbacks
+        # DataFrames are calculated outside of the Document lock (see submit_gridplot_update)
         def dropdown_callback(attr, old, new):
             if new != old:
-                self.update_gridplot(new)
+                self.__update_chosen_and_next_months(new)
+                self.submit_gridplot_update()
 
         self.grid_elem_dict[self.g_month_dropdown].on_change("value", dropdown_callback)
 
@@ -262,14 +289,25 @@ class Overview(object):
 
         self.__update_chosen_and_next_months(month)
         self.__update_dataframes()
+        self.__update_elements()
 
-#         self.__update_chosen_month_title()
-        self.__update_expenses_chosen_month()
-        self.__update_total_products_chosen_month()
-        self.__update_different_shops_chosen_month()
+    def submit_gridplot_update(self):
+        """Submits update of the gridplot to .executor ViewExecutor, reflecting current .chosen_month and
+            .next_month.
 
-        self.__update_piechart()
-        self.__update_category_barplot()
+            Expense and Income DataFrames filtered to .chosen_month and .next_month are calculated outside of
+            the Bokeh Document lock (in a Thread Pool of ViewExecutor) by __calculate_dataframes, which gets both
+            months as arguments. DataFrames are then loaded into attributes and all elements of the gridplot are
+            updated with them by __apply_dataframes - only this part is done while the Document is locked.
+            If the User chooses another Month before the update is applied, the update is dropped and only the newest
+            one is applied.
+
+            When the gridplot isn't a part of any Document, update is made immediately.
+        """
+
+        calculate = partial(self.__calculate_dataframes, self.__get_expense_partition(), self.__get_income_partition(),
+                            self.chosen_month, self.next_month)
+        self.executor.submit(calculate, self.__apply_dataframes, self.grid_elem_dict[self.g_month_dropdown].document)
 
     def change_category_column(self, col):
         """Changes .category attribute to col argument."""
@@ -427,7 +465,8 @@ class Overview(object):
                     is provided, function defaults it to .monthyear_format Instance attribute.
 
             next_month value is calculated as the 1 month offset from provided month (to the future) and encoded
-            into string in date_format.
+            into string in date_format. Calculated next_month is kept in .next_months dictionary, so that months
+            chosen again aren't parsed again.
 
             Attributes .chosen_month and .next_month are updated with respective calculated values.
         """
@@ -436,8 +475,12 @@ class Overview(object):
         if date_format is None:
             date_format = self.monthyear_format
 
-        next_month = (pd.Timestamp(datetime.strptime(month, date_format)) + pd.DateOffset(months=1)).strftime(
-            date_format)
+        next_month = self.next_months.get((month, date_format))
+        if next_month is None:
+            next_month = (pd.Timestamp(datetime.strptime(month, date_format)) + pd.DateOffset(months=1)).strftime(
+                date_format)
+            self.next_months[(month, date_format)] = next_month
+
         self.chosen_month = month
         self.next_month = next_month
 
@@ -451,70 +494,111 @@ class Overview(object):
         """Function updates .chosen_month_expense_df and .next_month_expense_df attribute with data filtered
             by .monthyear column.
 
-            Function takes .original_expense_df DataFrame, applies the filtering to .monthyear column to match values
-            in .chosen_month value and .next_month attributes and assigns them accordingly.
+            Function takes rows of .original_expense_df DataFrame from .chosen_month and .next_month (slices of
+            it's MonthPartition, see __get_expense_partition) and assigns them accordingly.
 
             Attributes .chosen_months_expense_df and next_month_expense_df are updated.
         """
 
-        self.chosen_month_expense_df = self.original_expense_df[
-            self.original_expense_df[self.monthyear] == self.chosen_month]
-        self.next_month_expense_df = self.original_expense_df[
-            self.original_expense_df[self.monthyear] == self.next_month]
+        partition = self.__get_expense_partition()
+        self.chosen_month_expense_df = partition.rows(self.chosen_month)
+        self.next_month_expense_df = partition.rows(self.next_month)
 
     def __update_income_dataframes(self):
         """Function updates .chosen_month_income_df and .next_month_income_df attribute with data filtered
             by .monthyear column.
 
-            Function takes .original_income_df DataFrame, applies the filtering to .monthyear column to match values
-            in .chosen_month value and .next_month attributes and assigns them accordingly.
+            Function takes rows of .original_income_df DataFrame from .chosen_month and .next_month (slices of
+            it's MonthPartition, see __get_income_partition) and assigns them accordingly.
 
             Attributes .chosen_months_income_df and next_month_income_df are updated.
         """
 
-        self.chosen_month_income_df = self.original_income_df[
-            self.original_income_df[self.monthyear] == self.chosen_month]
-        self.next_month_income_df = self.original_income_df[self.original_income_df[self.monthyear] == self.next_month]
+        partition = self.__get_income_partition()
+        self.chosen_month_income_df = partition.rows(self.chosen_month)
+        self.next_month_income_df = partition.rows(self.next_month)
+
+    def __calculate_dataframes(self, expense_partition, income_partition, chosen_month, next_month):
+        """Function calculates Expense and Income DataFrames filtered to chosen_month and next_month arguments.
+
+            Rows are taken from expense_partition and income_partition (MonthPartitions of .original_expense_df and
+            .original_income_df, see __get_expense_partition and __get_income_partition) the same way as in
+            __update_expense_dataframes and __update_income_dataframes functions, but the function doesn't change
+            any attribute, so it can be called outside of the Bokeh Document lock (see submit_gridplot_update).
+
+            Returns tuple of Expense DataFrames (chosen month and next month) and Income DataFrames (chosen month and
+            next month).
+        """
+
+        return (
+            expense_partition.rows(chosen_month),
+            expense_partition.rows(next_month),
+            income_partition.rows(chosen_month),
+            income_partition.rows(next_month)
+        )
+
+    def __apply_dataframes(self, dataframes):
+        """Function loads dataframes (tuple returned by __calculate_dataframes) into attributes and updates all
+            elements of the gridplot.
+
+            Attributes .chosen_month_expense_df, .next_month_expense_df, .chosen_month_income_df and
+            .next_month_income_df are updated.
+        """
+
+        (self.chosen_month_expense_df, self.next_month_expense_df,
+         self.chosen_month_income_df, self.next_month_income_df) = dataframes
+
+        self.__update_elements()
+
+    def __update_elements(self):
+        """Helper function that calls updates of all elements of the gridplot depending on the chosen month."""
+
+        self.__update_expenses_chosen_month()
+        self.__update_total_products_chosen_month()
+        self.__update_different_shops_chosen_month()
+
+        self.__update_piechart()
+        self.__update_category_barplot()
 
     def __update_expenses_chosen_month(self):
         """Function updates text in expenses_chosen_month Div (one of the "Info Elements" Div).
 
-            Div shows total sum of expenses from a single chosen month, calculated from .chosen_month_expense_df
-            DataFrame, sum of .price column. Calculated value is then inserted into the HTML template located in
+            Div shows total sum of expenses from a single chosen month, taken from MonthlySummary of .chosen_month
+            (see __get_monthly_summary). Value is then inserted into the HTML template located in
             .expenses_chosen_month by {expenses_chosen_month} format argument.
 
             Grid Element .g_expenses_chosen_month[.text] is updated.
         """
 
-        expenses_chosen_month = self.chosen_month_expense_df[self.price].sum()
+        expenses_chosen_month = self.__get_monthly_summary().month(self.chosen_month)["expenses"]
         self.grid_elem_dict[self.g_expenses_chosen_month].text = self.expenses_chosen_month.format(
             expenses_chosen_month=expenses_chosen_month)
 
     def __update_total_products_chosen_month(self):
         """Function updates text in total_products_chosen_month Div (one of the "Info Elements" Div).
 
-            Div shows total number of transactions from a single chosen month, calculated from .chosen_month_expense_df
-            DataFrame (shape of a DataFrame). Calculated value is then inserted into the HTML template located in
+            Div shows total number of transactions from a single chosen month, taken from MonthlySummary of
+            .chosen_month (see __get_monthly_summary). Value is then inserted into the HTML template located in
             .total_products_chosen_month by {total_products_chosen_month} format argument.
 
             Grid Element .g_total_products_chosen_month[.text] is updated.
         """
 
-        total_products_chosen_month = self.chosen_month_expense_df.shape[0]
+        total_products_chosen_month = self.__get_monthly_summary().month(self.chosen_month)["products"]
         self.grid_elem_dict[self.g_total_products_chosen_month].text = self.total_products_chosen_month.format(
             total_products_chosen_month=total_products_chosen_month)
 
     def __update_different_shops_chosen_month(self):
         """Function updates text in different_shops_chosen_month Div (one of the "Info Elements" Div).
 
-            Div shows unique number of shops from a single chosen month, calculated from .chosen_month_expense_df
-            DataFrame, length of unique values from .shops column. Calculated value is then inserted into the HTML
-            template located in .different_shops_chosen_month by {different_shops_chosen_month} format argument.
+            Div shows unique number of shops from a single chosen month, taken from MonthlySummary of .chosen_month
+            (see __get_monthly_summary). Value is then inserted into the HTML template located in
+            .different_shops_chosen_month by {different_shops_chosen_month} format argument.
 
             Grid Element .g_different_shops_chosen_month[.text] is updated.
         """
 
-        different_shops_chosen_month = len(unique_values_from_column(self.chosen_month_expense_df, self.shop))
+        different_shops_chosen_month = self.__get_monthly_summary().month(self.chosen_month)["shops"]
         self.grid_elem_dict[self.g_different_shops_chosen_month].text = self.different_shops_chosen_month.format(
             different_shops_chosen_month=different_shops_chosen_month)
 
@@ -608,9 +692,9 @@ class Overview(object):
     def __update_category_barplot(self):
         """Function updates Category Barplot and it's corresponding ColumnDataSource.
 
-            Function first calculates aggregated DataFrame, grouped by .monthyear column and then sorts it by
-            .price column in a descending order. Data from this df is then pulled to update both ColumnDataSource
-            and a Plot:
+            Function first takes aggregated DataFrame of sums of .price in every Category from .chosen_month, sorted
+            by .price column in a descending order (from MonthlySummary, see __get_monthly_summary). Data from this
+            df is then pulled to update both ColumnDataSource and a Plot:
                 - "x" and "top" values in ColumnDataSource are updated with Category/Price values, appropriately,
                 - Plot x_range.factors is updated with new Category values
 
@@ -621,8 +705,7 @@ class Overview(object):
             Grid Element .g_category_expenses and Grid Source Element .g_category_expenses are updated.
         """
 
-        agg_df = self.chosen_month_expense_df.groupby([self.category]).sum().reset_index().sort_values(
-                    by=[self.price], ascending=False)
+        agg_df = self.__get_monthly_summary().category_expenses(self.chosen_month)
 
         fig = self.grid_elem_dict[self.g_category_expenses]
         source = self.grid_source_dict[self.g_category_expenses]
@@ -651,6 +734,80 @@ class Overview(object):
 
     # ========== Miscellaneous========== #
 
+    def __get_expense_partition(self):
+        """Returns MonthPartition of .original_expense_df.
+
+            MonthPartition depends only on the data, so it's memoized in AggregateCube of .original_expense_df (see
+            __get_aggregate_cube) - Overviews created for the same data (e.g. in sessions of different Users) share
+            it and rows of .original_expense_df are sorted only once.
+
+            Attribute .expense_partition might be updated.
+        """
+
+        partition = self.expense_partition
+        if partition is None or partition.dataframe is not self.original_expense_df:
+            self.expense_partition = self.__get_aggregate_cube().memoized(
+                "Overview Month Partition", lambda: MonthPartition(self.original_expense_df, self.monthyear))
+
+        return self.expense_partition
+
+    def __get_income_partition(self):
+        """Returns MonthPartition of .original_income_df.
+
+            If .income_partition wasn't created from .original_income_df, new MonthPartition is created.
+
+            Attribute .income_partition might be updated.
+        """
+
+        partition = self.income_partition
+        if partition is None or partition.dataframe is not self.original_income_df:
+            self.income_partition = MonthPartition(self.original_income_df, self.monthyear)
+
+        return self.income_partition
+
+    def __get_monthly_summary(self):
+        """Returns MonthlySummary of .original_expense_df and .original_income_df with sums of .category column.
+
+            MonthlySummary depends only on the data and .category column, so it's memoized in AggregateCube of
+            .original_expense_df (see __get_aggregate_cube) - Overviews created for the same data share it and
+            the data is grouped only once. If memoized MonthlySummary was created from other Income DataFrame,
+            new MonthlySummary is created.
+
+            Attribute .monthly_summary might be updated.
+        """
+
+        summary = self.monthly_summary
+        if (summary is None or summary.expense_dataframe is not self.original_expense_df or
+                summary.income_dataframe is not self.original_income_df or summary.category != self.category):
+
+            def create_summary():
+                return MonthlySummary(self.original_expense_df, self.original_income_df, self.monthyear, self.price,
+                                      self.shop, self.category, self.price_scale)
+
+            summary = self.__get_aggregate_cube().memoized("Overview Summary " + self.category, create_summary)
+            if summary.income_dataframe is not self.original_income_df:
+                summary = create_summary()
+
+            self.monthly_summary = summary
+
+        return self.monthly_summary
+
+    def __get_aggregate_cube(self):
+        """Returns AggregateCube of .original_expense_df.
+
+            If .aggregate_cube wasn't created from .original_expense_df or it doesn't include current .category
+            column, new AggregateCube is created from .original_expense_df.
+
+            Attribute .aggregate_cube might be updated.
+        """
+
+        cube = self.aggregate_cube
+        if cube is None or cube.dataframe is not self.original_expense_df or self.category not in cube.category_columns:
+            self.aggregate_cube = AggregateCube(self.original_expense_df, self.monthyear, self.date, self.price,
+                                                {self.category: None}, self.price_scale)
+
+        return self.aggregate_cube
+
     def __choose_month_based_on_server_date(self, date_format=None):
         """Returns month string based on a time provided in .server_date attribute.
 
@@ -681,22 +838,11 @@ class Overview(object):
         """Function calculates difference between income and expense sums from a chosen month and presents it
             as a fraction of income sum.
 
-            Function calculates difference of sum of .price column from chosen_month_income_df and
-            chosen_month_expense_df. Then this difference is divided by income sum and is assigned to part variable.
-            If the income is 0, np.nan is chosen instead.
+            Sums of income and expenses and the difference between them (as a fraction of income) are taken from
+            MonthlySummary of .chosen_month (see __get_monthly_summary). If the income is 0, the fraction is np.nan.
 
             Returns part, income and expense numbers.
         """
 
-        # negative as income is expressed as negative transaction
-        income_month = -(self.chosen_month_income_df[self.price].sum())
-        expense_month = self.chosen_month_expense_df[self.price].sum()
-
-        difference = income_month - expense_month
-
-        if income_month == 0:
-            part = np.nan
-        else:
-            part = difference / income_month
-
-        return part, income_month, expense_month
+        month_summary = self.__get_monthly_summary().month(self.chosen_month)
+        return month_summary["savings"], month_summary["income"], month_summary["expenses"]
@@ -5,7 +5,7 @@ from bokeh.models.widgets import RadioGroup, CheckboxGroup, DateRangeSlider
 from bokeh.layouts import column
 
 from ..observer import Observer
-from .pandas_functions import create_combinations_of_sep_values
+from .category_tree import CategoryTree
 
 
 class Settings(object):
@@ -32,7 +32,9 @@ class Settings(object):
                 - chosen_categories
                 - chosen_category_type
                 - chosen_months
-            Upon change on any of those properties, observer instance notifies parent "bkapp" object.
+            Upon change on any of those properties, observer instance notifies parent "bkapp" object. When several
+            of those properties are changed at once (e.g. on Category Type change), changes are made inside of
+            the Observer transaction, so that parent is notified once, with final values of all changed properties.
 
             Attributes of the instance Object are described as single-line comments in __init__() method;
 
@@ -118,9 +120,10 @@ class Settings(object):
             css_classes=["category_types_buttons"], inline=True
         )
 
+        positions = {category: position for position, category in enumerate(self.all_categories)}
         checkbox_group = CheckboxGroup(
             labels=self.all_categories,
-            active=[self.all_categories.index(x) for x in self.chosen_categories],
+            active=[positions[x] for x in self.chosen_categories],
             css_classes=["category_checkbox"]
         )
 
@@ -191,13 +194,49 @@ class Settings(object):
         self.__initialize_categories()
         self.__initialize_months()
 
+    def update_original_data(self, simple_categories_series, extended_categories_series, date_series):
+        """Replaces Original Data with new Series (e.g. when GnuCash file was changed) and initializes
+            Settings variables again, keeping the choices of the User where it's possible.
+
+            Chosen Category Type is kept. Categories that were unchecked by the User stay unchecked - all the other
+            Categories (including new ones) are chosen.
+            If the whole Month Range was chosen, the new whole Month Range is chosen - otherwise the Month Range
+            chosen by the User is kept.
+
+            As all of those are watched properties, parent object is notified of the changes - once, as changes are
+            made in the Observer transaction.
+        """
+
+        category_type = self.chosen_category_type
+        unchosen_categories = set(self.all_categories) - set(self.chosen_categories)
+        is_whole_month_range = self.chosen_months == self.all_months
+        chosen_months = self.chosen_months
+
+        self.original_simple_categories = simple_categories_series
+        self.original_extended_categories = extended_categories_series
+        self.original_dates = date_series
+
+        with self.observer.transaction():
+            self.initialize_settings_variables()
+
+            all_categories = [self.all_categories_simple, self.all_categories_extended,
+                              self.all_categories_combinations][category_type]
+
+            self.chosen_category_type = category_type
+            self.all_categories = all_categories
+            self.chosen_categories = [x for x in all_categories if x not in unchosen_categories]
+
+            if not is_whole_month_range:
+                self.chosen_months = chosen_months
+
     def __initialize_categories(self):
         """Initializes variables for the Category Gridplot.
 
             Initialized instance attributes are:
                 - .all_categories_simple - list of "simple" categories (taken from .category column)
                 - .all_categories_extended - list of "extended" categories (taken from .all column)
-                - .all_categories_combinations - list of "combinations" from .all column (see category_options() docs)
+                - .all_categories_combinations - list of "combinations" from .all column (see category_options() docs),
+                    which are names of all nodes of CategoryTree of "extended" categories
 
             Those attributes will be used as runtime containers for different categories values, from which
             User's choices will be extracted and loaded into .all_categories and .chosen_categories attributes.
@@ -210,15 +249,16 @@ class Settings(object):
         """
         simple = self.original_simple_categories.sort_values().unique().tolist()
         extended = self.original_extended_categories.sort_values().unique().tolist()
-        combinations = create_combinations_of_sep_values(extended, self.category_sep)
+        combinations = CategoryTree(extended, self.category_sep).categories
 
         self.all_categories_simple = simple
         self.all_categories_extended = extended
         self.all_categories_combinations = combinations
 
-        self.chosen_category_type = 0
-        self.all_categories = simple
-        self.chosen_categories = simple
+        with self.observer.transaction():
+            self.chosen_category_type = 0
+            self.all_categories = simple
+            self.chosen_categories = simple
 
         self.are_categories_initialized = True
 
@@ -265,6 +305,9 @@ class Settings(object):
             updated with new categories:
                 - .labels attribute with all possible Categories
                 - .active attribute with list of Integers from 0 to len(New Categories).
+
+            All changes are made inside of the Observer transaction, so that the parent object is notified only once
+            about all changed properties.
         """
 
         if index == 0:
@@ -276,13 +319,15 @@ class Settings(object):
         else:
             raise Exception("How did I get here?")
 
-        self.all_categories = new
-        self.chosen_categories = new
+        # changing .checkbox_group.active triggers it's callback, which updates .chosen_categories again
+        with self.observer.transaction():
+            self.all_categories = new
+            self.chosen_categories = new
 
-        self.chosen_category_type = index
+            self.chosen_category_type = index
 
-        self.checkbox_group.labels = new
-        self.checkbox_group.active = list(range(len(new)))
+            self.checkbox_group.labels = new
+            self.checkbox_group.active = list(range(len(new)))
 
     def __update_chosen_categories_on_new(self, new):
         """Updates .chosen_categories variable based on new attribute - list of indices.
@@ -1,17 +1,22 @@
 import pandas as pd
 import numpy as np
-import random
-import string
+import json
 from datetime import datetime
+from functools import partial
 
 from bokeh.models import ColumnDataSource, Circle, RadioGroup, LinearColorMapper, FuncTickFormatter
 from bokeh.models import NumeralTickFormatter, ColorBar, PrintfTickFormatter, BasicTicker, Label
+from bokeh.models import CustomJSHover, FixedTicker, Range1d
 
 from bokeh.models.widgets import Div
+from bokeh.core.property.validation import without_property_validation
 from bokeh.plotting import figure
 from bokeh.layouts import row, column
 
 from .pandas_functions import unique_values_from_column
+from .aggregate_cube import AggregateCube
+from .view_executor import ViewExecutor
+from .daily_aggregates import daily_aggregates, first_weeks_of_months
 
 
 class Trends(object):
@@ -20,7 +25,9 @@ class Trends(object):
                 Object expects:
                     - appropriate column names for the expense DataFrame that will be provided to other methods;
                     - month_format string, which represents in what string format date in monthyear column was saved;
-                    - color_map ColorMap object, which exposes attributes for specific colors.
+                    - color_map ColorMap object, which exposes attributes for specific colors;
+                    - optional price_scale - number of units of price column in the unit of currency (e.g. 100 if
+                        prices are int64 cents) - sums are divided by it only when they are shown.
 
                 Main methods are:
                     - gridplot() : workhorse of the Object, creates elements gridplot, creates callbacks and updates
@@ -29,7 +36,9 @@ class Trends(object):
                         appropriately to self.grid_elem_dict and self.grid_source_dict
                     - update_gridplot function, called when the whole gridplot needs to be updated;
                     - update_gridplot_on_month_selection_change, called when the selection of months on the line plot
-                        is changed.
+                        is changed;
+                    - submit_gridplot_update, called by callback of the line plot selection - it updates gridplot
+                        elements with the DataFrame work done outside of the Bokeh Document lock (see ViewExecutor).
 
                 Attributes of the instance Object are described as single-line comments in __init__() method;
                 Other attributes of the class are HTML templates or other text used in Div or other Web Elements
@@ -56,7 +65,7 @@ class Trends(object):
         <div class="hover_tooltip" id="hover_line_plot">
             <div>
                 <span>Month: </span>
-                <span>@x</span>
+                <span>@x{custom}</span>
             </div>
             <div>
                 <span>Value: </span>
@@ -69,7 +78,7 @@ class Trends(object):
         <div class="hover_tooltip" id="hover_heatmap">
             <div>
                 <span>Date: </span>
-                <span>@date</span>
+                <span>@date{custom}</span>
             </div>
             <div>
                 <span>Price: </span>
@@ -82,10 +91,18 @@ class Trends(object):
         </div>
     """
 
+    # formats days since epoch into "%d-%b-%Y" format (e.g. 01-Jan-2019) in the browser
+    heatmap_date_formatter = """
+        var date = new Date(value * 86400000);
+        var months = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"];
+        return ("0" + date.getUTCDate()).slice(-2) + "-" + months[date.getUTCMonth()] + "-" + date.getUTCFullYear();
+    """
+
     interaction_message = "Select MonthPoints on the Plot to interact with the Dashboard"
 
     def __init__(self, category_colname, monthyear_colname, price_colname, product_colname,
-                 date_colname, currency_colname, shop_colname, month_format, color_mapping):
+                 date_colname, currency_colname, shop_colname, month_format, color_mapping,
+                 price_scale=1):
 
         # Column Names
         self.category = category_colname
@@ -102,17 +119,26 @@ class Trends(object):
         # ColorMap
         self.color_map = color_mapping  # ColorMap object exposing attributes with specific colors
 
+        # Price Scale
+        self.price_scale = price_scale  # units of price column in the unit of currency (e.g. 100 for cents)
+
+        # ViewExecutor
+        self.executor = ViewExecutor()  # executes updates from callbacks outside of the Document lock
+
         # DataFrames
         self.original_expense_df = None  # original expense dataframe passed to the gridplot function
         self.current_expense_df = None
 
+        # Aggregates
+        self.aggregate_cube = None  # AggregateCube of original expense dataframe
+        self.current_aggregate_cube = None  # AggregateCube filtered only to chosen months
+
         # State Variables
         self.months = None
         self.chosen_months = None
 
         # Heatmap Variables
         self.heatmap_color_mapper = None
-        self.heatmap_df_column_dict = None
 
         # Identifiers for Grid Elements and DataSources
         self.g_monthly_title = "Monthly Title"
@@ -129,11 +155,13 @@ class Trends(object):
         self.grid_elem_dict = None
         self.grid_source_dict = None
 
-    def gridplot(self, expense_dataframe):
+    def gridplot(self, expense_dataframe, aggregate_cube=None):
         """Main function of Trends Object. Creates Gridplot with appropriate Visualizations and Elements and
                     returns it.
 
-                    Accepts expense_dataframe argument that should be a Dataframe representing Expenses.
+                    Accepts expense_dataframe argument that should be a Dataframe representing Expenses and
+                    optional aggregate_cube argument that should be AggregateCube of expense_dataframe (if it isn't
+                    provided, it is created from the expense_dataframe).
 
                     The function does several things:
                         - initializes the gridplot,
@@ -147,7 +175,9 @@ class Trends(object):
 
         self.original_expense_df = expense_dataframe
         self.current_expense_df = expense_dataframe
-        self.months = unique_values_from_column(expense_dataframe, self.monthyear)
+        self.aggregate_cube = aggregate_cube
+        self.months = self.__get_aggregate_cube().memoized(
+            "Trends Months", partial(unique_values_from_column, expense_dataframe, self.monthyear))
         self.chosen_months = self.months  # initially all months are selected
 
         initial_heatmap_button_selected = 0
@@ -161,13 +191,14 @@ class Trends(object):
 
         self.grid_elem_dict[self.g_heatmap_buttons].on_change("active", heatmap_aggregation_callback)
 
+        # DataFrames are calculated outside of the Document lock (see submit_gridplot_update)
         def line_plot_selection_callback(attr, old, new):
             new_indices = set(new)
             old_indices = set(old)
 
             if new_indices != old_indices:
                 self.__update_chosen_months(new_indices)
-                self.update_gridplot_on_month_selection_change()
+                self.submit_gridplot_update()
 
         self.grid_source_dict[self.g_line_plot].selected.on_change("indices", line_plot_selection_callback)
 
@@ -284,6 +315,23 @@ class Trends(object):
         self.__update_info()
         self.__update_histogram()
 
+    def submit_gridplot_update(self):
+        """Submits update of the gridplot to .executor ViewExecutor, reflecting current .chosen_months.
+
+            AggregateCube and DataFrame filtered to .chosen_months and values of the Histogram are calculated outside
+            of the Bokeh Document lock (in a Thread Pool of ViewExecutor) by __calculate_current_expense_df, which
+            gets chosen months as an argument. Results are then loaded into attributes and elements of the gridplot
+            are updated with them by __apply_current_expense_df - only this part is done while the Document is
+            locked. If the User selects other months before the update is applied, the update is dropped and only
+            the newest one is applied.
+
+            When the gridplot isn't a part of any Document, update is made immediately.
+        """
+
+        calculate = partial(self.__calculate_current_expense_df, self.__get_aggregate_cube(), self.chosen_months)
+        document = self.grid_source_dict[self.g_line_plot].document
+        self.executor.submit(calculate, self.__apply_current_expense_df, document)
+
     def change_category_column(self, col):
         """Changes .category attribute to col argument."""
         self.category = col
@@ -294,19 +342,19 @@ class Trends(object):
         """Creation of Line Plot DataSource for Gridplot.
 
             ColumnDataSource consist of two keys:
-                - x : contains months for the X-axis, formatted in "%b-%y" format (e.g. Jan-19)
+                - x : contains indexes of months (in .months) for the X-axis - they are formatted into month names
+                    in the browser (see __create_line_plot)
                 - y : temp values of the same length as x; they will be replaced when the update function for the
                     line plot is called
 
+            Both keys are numeric np.arrays, so that they are sent to the browser as binary arrays.
+
             Returns created ColumnDataSource.
         """
-        new_format = "%b-%Y"
-        formatted_months = [datetime.strptime(month, self.monthyear_format).strftime(new_format)
-                            for month in self.months]
 
         data = {
-            "x": formatted_months,
-            "y": [1]*len(self.months)  # ensuring same length of data values
+            "x": np.arange(len(self.months)),
+            "y": np.ones(len(self.months))  # ensuring same length of data values
         }
 
         source = ColumnDataSource(
@@ -329,7 +377,9 @@ class Trends(object):
             Figure will plot two models: Line and Scatter (Circles). This is done so that user can freely select
             points on the graph and have visual cues (decreased alpha) that the selection works.
 
-            Figure itself will plot "x" values from source on X-axis and "y" values from source on Y-axis.
+            Figure itself will plot "x" values from source on X-axis and "y" values from source on Y-axis. As "x"
+            values are indexes of months, they are formatted into month names (in "%b-%Y" format, e.g. Jan-2019) in
+            the browser - both in ticks of X-axis and in the hover tooltip.
 
             Additionally, message is added at the top of the plot, informing user about possibility of
             selecting points on the graph.
@@ -338,8 +388,14 @@ class Trends(object):
         """
         base_color = self.color_map.contrary_color
 
-        p = figure(width=540, height=340, x_range=source.data["x"], toolbar_location=None, tools=["box_select"],
-                   title=self.line_plot_title, tooltips=self.line_plot_tooltip)
+        month_names = [datetime.strptime(month, self.monthyear_format).strftime("%b-%Y") for month in self.months]
+        # names are embedded in the code, as CustomJSHover accepts only Models as args
+        month_formatter_code = "return " + json.dumps(month_names) + "[{index}] || '';"
+
+        p = figure(width=540, height=340, x_range=Range1d(-0.5, len(month_names) - 0.5), toolbar_location=None,
+                   tools=["box_select"], title=self.line_plot_title, tooltips=self.line_plot_tooltip)
+
+        p.hover.formatters = {"@x": CustomJSHover(code=month_formatter_code.format(index="value"))}
 
         p.line(x="x", y="y", source=source, line_width=5, color=base_color)
         scatter = p.circle(x="x", y="y", source=source, color=base_color)
@@ -368,6 +424,8 @@ class Trends(object):
         p.axis.major_label_text_font_size = "13px"
         p.xaxis.major_label_orientation = 0.785  # 45 degrees in radians
 
+        p.xaxis.ticker = FixedTicker(ticks=list(range(len(month_names))))
+        p.xaxis.formatter = FuncTickFormatter(code=month_formatter_code.format(index="tick"))
         p.yaxis.formatter = NumeralTickFormatter(format="0,0.00")
 
         return p
@@ -438,16 +496,19 @@ class Trends(object):
                 - price: price paid in a day
                 - count: number of products bought in a day
 
+            All keys are numeric np.arrays (dates are sent as days since epoch), so that they are sent to the browser
+            as binary arrays and formatted there (see __create_heatmap).
+
             Returns created ColumnDataSource.
         """
 
         data = {
-            "week": [0],
-            "weekday": [0],
-            "value": [0],
-            "date": [0],
-            "price": [0],
-            "count": [0]
+            "week": np.zeros(1, dtype=int),
+            "weekday": np.zeros(1, dtype=int),
+            "value": np.zeros(1),
+            "date": np.zeros(1, dtype=np.int32),
+            "price": np.zeros(1),
+            "count": np.zeros(1, dtype=int)
         }
 
         source = ColumnDataSource(
@@ -466,9 +527,10 @@ class Trends(object):
             and days of the week (Monday, Tuesday, etc.) on the Y axis. This way, there are maximum 7 rectangles
             in a column and as many rows as weeks in the data.
 
-            X axis is a Categorical Range of Week Numbers. Y axis is a Categorical Range of Strings representing
-            numbers of days of the week (Monday - "0", Sunday - "6"). Y axis has also formatter attached to it,
-            to format ticks into English 3-letter short acronyms for every day (e.g. Mon, Tue, etc.).
+            X axis is a Range of Week Numbers. Y axis is a Range of numbers of days of the week (Monday - 0 at the top,
+            Sunday - 6 at the bottom), with a tick for every day. Y axis has also formatter attached to it, to format
+            ticks into English 3-letter short acronyms for every day (e.g. Mon, Tue, etc.). Dates (sent as days since
+            epoch) are formatted in the hover tooltip with .heatmap_date_formatter.
 
             ColorPalette is defined from ColorMap object which defines tints from a base color. Every second color
             from the palette is used for a bigger contrast. Additionally, ColorBar is attached to the Plot on the
@@ -477,21 +539,20 @@ class Trends(object):
             Returns created Plot p.
         """
 
-        y_weekdays = [str(x) for x in range(6, -1, -1)]  # there is always 7 days in a week
-        x_weeks = list(map(lambda x: str(x), range(1, 53)))
-
         palette = list(reversed([self.color_map.base_color_tints[i] for i in range(0, 10, 2)]))
         cmap = LinearColorMapper(palette=palette, low=0, high=1)
         cmap.low_color = "white"
 
         p = figure(
             height=180, width=1200,
-            x_range=x_weeks, y_range=y_weekdays,
+            x_range=Range1d(0.5, 52.5), y_range=Range1d(6.5, -0.5),  # there is always 7 days in a week
             x_axis_location="above",
             tooltips=self.heatmap_plot_tooltip,
             toolbar_location=None
         )
 
+        p.hover.formatters = {"@date": CustomJSHover(code=self.heatmap_date_formatter)}
+
         p.rect(
             x="week", y="weekday", width=1, height=1,
             source=source,  fill_color={
@@ -506,9 +567,6 @@ class Trends(object):
         p.axis.major_label_text_color = self.color_map.label_text_color
         p.axis.major_label_text_font_size = "13px"
 
-        p.axis.group_text_color = self.color_map.label_text_color
-        p.axis.group_text_font_size = "13px"
-
         p.yaxis.major_label_standoff = 25
 
         weekday_mapper = {
@@ -525,6 +583,7 @@ class Trends(object):
             return weekday_mapper[tick];
         """)
 
+        p.yaxis.ticker = FixedTicker(ticks=list(weekday_mapper))
         p.yaxis.formatter = weekday_formatter
 
         self.heatmap_color_mapper = cmap
@@ -562,14 +621,44 @@ class Trends(object):
     def __update_current_expense_df(self):
         """Updates .current_expense_df attribute with data filtered by chosen months.
 
-            Original DataFrame (from .original_expense_df) is filtered to include only months present in
-            .chosen_months attribute.
+            AggregateCube of .original_expense_df is filtered to include only months present in .chosen_months
+            attribute (see __filter_aggregate_cube) - filtered AggregateCube and it's DataFrame are then used as
+            a "current" data.
 
-            Attribute .current_expense_df is updated.
+            Attributes .current_aggregate_cube and .current_expense_df are updated.
         """
 
-        self.current_expense_df = self.original_expense_df[self.original_expense_df[
-            self.monthyear].isin(self.chosen_months)]
+        self.current_aggregate_cube = self.__filter_aggregate_cube(self.__get_aggregate_cube(), self.chosen_months)
+        self.current_expense_df = self.current_aggregate_cube.dataframe
+
+    def __calculate_current_expense_df(self, aggregate_cube, months):
+        """Calculates AggregateCube and DataFrame filtered to months argument, together with new values of
+            the Histogram.
+
+            aggregate_cube (AggregateCube of .original_expense_df, see __get_aggregate_cube) is filtered the same way
+            as in __update_current_expense_df function, but the function doesn't change any attribute, so it can be
+            called outside of the Bokeh Document lock (see submit_gridplot_update).
+
+            Returns tuple of filtered AggregateCube, it's DataFrame and dictionary of new Histogram values (see
+            __calculate_histogram).
+        """
+
+        cube = self.__filter_aggregate_cube(aggregate_cube, months)
+        df = cube.dataframe
+
+        return cube, df, self.__calculate_histogram(df)
+
+    def __apply_current_expense_df(self, results):
+        """Loads results (tuple returned by __calculate_current_expense_df) into attributes and updates Statistics
+            Divs and Histogram with them.
+
+            Attributes .current_aggregate_cube and .current_expense_df are updated.
+        """
+
+        self.current_aggregate_cube, self.current_expense_df, histogram_values = results
+
+        self.__update_info()
+        self.__update_histogram(histogram_values)
 
     def __update_info(self):
         """Helper function that calls updating both monthly and daily statistics Divs, as both of those
@@ -582,8 +671,9 @@ class Trends(object):
         """Updates text in "Monthly Statistics" Div.
 
             "Monthly Statistics" Div defines several descriptory statistics value (e.g. mean, median, etc.) that are
-            calculated from .current_expense_df dataframe. Df is first grouped by "monthyear" column to aggregate
-            values on a monthly basis and then values are inserted into pre-defined HTML template.
+            calculated from monthly sums of .current_aggregate_cube (the same as if .current_expense_df was grouped
+            by "monthyear" column) and then values are inserted into pre-defined HTML template. Monthly sums are
+            sorted only once - statistics of the chosen months are taken from them (see GroupedStatistics).
 
             Several values for formatting are extracted from "price" column:
                 - mean
@@ -598,8 +688,7 @@ class Trends(object):
             Grid Element .g_monthly_statistics[.text] is updated
         """
 
-        stats = self.current_expense_df.groupby(by=[self.monthyear]).sum()[self.price].describe()
-        stats["median"] = stats["50%"]
+        stats = self.current_aggregate_cube.month_statistics()
 
         new_text = self.stats_template.format(**stats)
 
@@ -609,8 +698,9 @@ class Trends(object):
         """Updates text in "Daily Statistics" Div.
 
             "Daily Statistics" Div defines several descriptory statistics value (e.g. mean, median, etc.) that are
-            calculated from .current_expense_df dataframe. Df is first grouped by "date" column to aggregate
-            values on a daily basis and then values are inserted into pre-defined HTML template.
+            calculated from daily sums of .current_aggregate_cube (the same as if .current_expense_df was grouped
+            by "date" column) and then values are inserted into pre-defined HTML template. Daily sums are sorted
+            only once - statistics of days from the chosen months are taken from them (see GroupedStatistics).
 
             Several values for formatting are extracted from "price" column:
                 - mean
@@ -625,8 +715,7 @@ class Trends(object):
             Grid Element .g_daily_statistics[.text] is updated
         """
 
-        stats = self.current_expense_df.groupby(by=[self.date]).sum()[self.price].describe()
-        stats["median"] = stats["50%"]
+        stats = self.current_aggregate_cube.date_statistics()
 
         new_text = self.stats_template.format(**stats)
 
@@ -635,9 +724,10 @@ class Trends(object):
     def __update_line_plot(self):
         """Updates Line Plot showing expenses aggregated on a monthly level.
 
-            Function calculates monthly expenses from .original_expense_df DataFrame by grouping data by "monthyear"
-            column and then extracting values from "price" column. Those values are then inserted into ColumnDataSource
-            corresponding to Line Plot as new "y" values.
+            Function takes monthly expenses of .original_expense_df DataFrame from it's AggregateCube (sums of
+            "price" column in every "monthyear"). Those values are then inserted into ColumnDataSource
+            corresponding to Line Plot as new "y" values. Values are memoized in the AggregateCube, as they don't
+            depend on the selection of the User.
 
             Additionally, y_range of the Plot is updated: start is 0, whereas end is calculated to 101% of the
             highest value present in the corresponding "price" column of the aggregated DataFrame.
@@ -646,7 +736,8 @@ class Trends(object):
         """
 
         # original_expense_df as line plot shouldn't be changed after month selection update
-        new_values = self.original_expense_df.groupby(by=[self.monthyear]).sum()[self.price].tolist()
+        cube = self.__get_aggregate_cube()
+        new_values = cube.memoized("Trends Line Plot", lambda: cube.month_totals().to_numpy())
 
         source = self.grid_source_dict[self.g_line_plot]
         source.data["y"] = new_values
@@ -655,11 +746,28 @@ class Trends(object):
         fig.y_range.start = 0
         fig.y_range.end = np.nanmax(new_values) + 0.01 * np.nanmax(new_values)
 
-    def __update_histogram(self):
+    def __update_histogram(self, new_values=None):
         """Updates histogram (BarPlot) data with calculated values.
 
-            Function calculates new values by first aggregating .current_expense_df by "date" column (to calculate
-            daily expenses), extracting sum() from "price" column and then applying np.histogram function to it.
+            Function accepts optional new_values argument - dictionary of new values already calculated by
+            __calculate_histogram. If it's not provided, values are calculated from .current_expense_df by
+            __calculate_histogram (see below).
+
+            Grid Element .g_histogram and Grid Source Element .g_histogram are updated.
+        """
+
+        if new_values is None:
+            new_values = self.__calculate_histogram(self.current_expense_df)
+
+        source = self.grid_source_dict[self.g_histogram]
+        source.data.update(new_values)
+
+    def __calculate_histogram(self, dataframe):
+        """Calculates values of histogram (BarPlot) from dataframe.
+
+            Function calculates new values by first aggregating dataframe by "date" column (to calculate
+            daily expenses), extracting sum() from "price" column (divided by .price_scale) and then applying
+            np.histogram function to it.
 
             Hist and edges arrays are obtained:
                 - hist defines probability value of each bin,
@@ -670,91 +778,84 @@ class Trends(object):
             Those arrays are then used as new data for Histogram ColumnDataSource columns, "hist", "top_edges" and
             "bottom_edges".
 
-            Grid Element .g_histogram and Grid Source Element .g_histogram are updated.
+            Returns dictionary of new values for Histogram ColumnDataSource.
         """
 
         hist, edges = np.histogram(
-            self.current_expense_df.groupby(by=[self.date]).sum()[self.price],
+            dataframe.groupby(by=[self.date])[self.price].sum() / self.price_scale,
             density=True,
             bins=50
         )
 
-        source = self.grid_source_dict[self.g_histogram]
-
         new_values = {
             "hist": hist,
             "top_edges": edges[:-1],
             "bottom_edges": edges[1:]
         }
 
-        source.data.update(new_values)
+        return new_values
 
+    @without_property_validation
     def __update_heatmap(self, selected_index):
         """Updates Heatmap Plot with Daily data from expense DataFrame.
 
             Accepts selected_index argument, which represents selection in the Heatmap Radio Group Button. Refer to
             __update_heatmap_values function, as it isn't used in the body of this function per se.
 
-            Function first creates new aggregated DataFrame- .original_expense_df is aggregated by "date" column
-            to create "Daily" aggregation. Specific transformations are described in __aggregated_expense_df function.
+            Function first aggregates .original_expense_df by days (see __calculate_heatmap). Heatmap doesn't depend
+            on the selection of the User, so aggregates are memoized in the AggregateCube of .original_expense_df -
+            every other session with the same data and Settings reuses them.
 
-            From this newly created df several values are extracted and inserted into ColumnDataSource of the Heatmap:
-                - "date": array of Strings of dates in "%d-%b-%Y" format,
-                - "week": array of Strings of numbers of weeks padded to 4 digits (e.g. "0001")
-                - "weekday" array of Strings of numbers of days of the week (e.g. "1", "5")
+            Those arrays are inserted into ColumnDataSource of the Heatmap:
+                - "date": array of Integer numbers of days since epoch (formatted into dates in the browser),
+                - "week": array of Integer numbers of weeks
+                - "weekday" array of Integer numbers of days of the week (e.g. 1, 5)
                 - "price": array of Float numbers representing Daily expenses
                 - "count": array of Numbers representing number of transactions in a single day
                 - "value": values of either "price" or "count" that are displayed in the Heatmap (refer to
                         __update_heatmap_values for description).
+            All of them are numeric np.arrays, so that they are sent to the browser as binary arrays - no String
+            is formatted per day on the server.
 
-            .heatmap_df_column_dict is updated with the dictionary from __create_new_column_names function - it
-            provides mapping between column names aliases and "real" column names in the Dataframe.
-
-            Range of X axis is also updated - new Range of weeks is calculated: start = min week number
-            of the aggregated df; stop = max week number of the aggregated df; interval - 1. This range
-            is also padded to 4 digits, similiar to "weekday" column and then inserted into the Plot as the new
-            X axis range. This is done to properly visualize any breaks or time gaps if they are present in the data.
+            Range of X axis is also updated - it starts at min week number of the aggregates and ends at max week
+            number of the aggregates (both padded by half of the week, so that rectangles aren't cut in half).
+            This is done to properly visualize any breaks or time gaps if they are present in the data.
 
-            There is also a FuncTickFormatter applied to X axis - week number ticks are matched to those in the
-            provided dictionary (described in __create_first_week_to_month_dict function) and replaced with their
-            respective items. If there is no match for the week, null tick ("") is placed.
+            There is also a FixedTicker and FuncTickFormatter applied to X axis - ticks are placed only on weeks
+            from the provided dictionary (described in first_weeks_of_months function) and replaced with
+            their respective items. If there is no match for the week, null tick ("") is placed.
 
             Such action is performed to declutter X axis - if it was left with week numbers, there would be a lot of
             ticks and their labels would overflow one another. By replacing only some of the week numbers with
             their respective items (month names), we not only give more space to the X axis range, but also provide
             user with the more intuitive figures (month names that everyone is familiar with instead of week numbers).
 
+            Arrays are numeric np.arrays created by the Object itself, so Bokeh doesn't validate every element of them
+            when they are assigned to the ColumnDataSource (see without_property_validation).
+
             Grid Element .g_heatmap and Grid Source Element .g_heatmap are updated.
         """
 
         # Heatmap isn't responsive to Month Selection
-        df = self.original_expense_df
-
-        # column names dict and aggregated df
-        self.heatmap_df_column_dict = self.__create_new_column_names(df.reset_index().columns)
-        aggregated = self.__aggregated_expense_df(df)
-        column_names = self.heatmap_df_column_dict
+        cube = self.__get_aggregate_cube()
+        aggregated, func_tick_dict = cube.memoized("Trends Heatmap",
+                                                   partial(self.__calculate_heatmap, self.original_expense_df))
 
         data = self.grid_source_dict[self.g_heatmap].data
         fig = self.grid_elem_dict[self.g_heatmap]
 
         # new Range generated to include any possible time gaps
-        new_min = aggregated["week"].min()
-        new_max = aggregated["week"].max()
-
-        # new_max + 1 as range function is exclusive for the end parameter
-        x_range = pd.Series(range(new_min, new_max+1, 1)).apply(lambda x: "{x:04d}".format(x=x)).tolist()
+        fig.x_range.start = aggregated["week"].min() - 0.5
+        fig.x_range.end = aggregated["week"].max() + 0.5
 
-        fig.x_range.factors = x_range
-
-        temp_values = [0] * len(aggregated[self.price])
+        temp_values = np.zeros(len(aggregated["price"]))
 
         new_values = {
-            "date": aggregated[column_names["date_str"]],
-            "week": aggregated[column_names["week_str"]],
-            "weekday": aggregated[column_names["weekday_str"]],
-            "price": aggregated[self.price],
-            "count": aggregated[column_names["count"]],
+            "date": aggregated["date"],
+            "week": aggregated["week"],
+            "weekday": aggregated["weekday"],
+            "price": aggregated["price"],
+            "count": aggregated["count"],
             "value": temp_values  # performed to not trigger ColumnDataSource warning over unmatched columns
         }
 
@@ -764,8 +865,6 @@ class Trends(object):
         self.__update_heatmap_values(selected_index)
 
         # Formatter of X axis
-        func_tick_dict = self.__create_first_week_to_month_dict(aggregated)
-
         formatter = FuncTickFormatter(args={"d": func_tick_dict}, code="""
                     var return_tick;
                     return_tick = "";
@@ -775,8 +874,10 @@ class Trends(object):
                     return return_tick;
                 """)
 
+        fig.xaxis.ticker = FixedTicker(ticks=list(func_tick_dict))
         fig.xaxis.formatter = formatter
 
+    @without_property_validation
     def __update_heatmap_values(self, selected_index):
         """Updates "value" Column in Heatmap ColumnDataSource based on provided selected_index argument.
 
@@ -809,7 +910,7 @@ class Trends(object):
 
         if selected_index == 0:
             values = data["price"]
-            high = values.mean() + (3 * values.std())  # see docstring
+            high = values.mean() + (3 * values.std(ddof=1))  # see docstring
         elif selected_index == 1:
             values = data["count"]
             high = values.max()
@@ -822,162 +923,48 @@ class Trends(object):
         self.heatmap_color_mapper.high = high
         self.heatmap_color_mapper.low = low
 
-    def __create_new_column_names(self, columns, n=8, seed=None):
-        """Creates new dictionary of column alias: real column name pairs, given columns argument.
+    def __calculate_heatmap(self, dataframe):
+        """Calculates daily aggregates of dataframe for the Heatmap.
 
-            Accepts:
-                - column: collection with column names already in use
-                - n: length of newly created name
-                - seed: seed of random module.
+            Days are aggregated with daily_aggregates function (dates are converted to np.int32 numbers of days
+            since epoch, which is enough for any date) and then dictionary of the first weeks of months is created
+            from them with first_weeks_of_months function (see both functions for details). Daily sums of price are
+            divided by .price_scale only after they are aggregated.
 
-            As the .original_expense_df comes from the user, names of the columns do not always have to follow
-            regular naming patterns. As object has to create new columns and then refer to them later in the runtime,
-            it cannot be assumed that the new names that the functions assign to columns won't be the names already
-            in use in the original DataFrame. Therefore, function to make sure that the names aren't duplicates is
-            needed.
-
-            Function takes embedded default_col_names variable and assigns new column names as items of corresponding
-            keys. Every key defines a default version of the name - if there is no such name in columns parameter, then
-            default names are used.
-
-            However, if any name is already present, then the new random value of length n (from ascii upper and
-            lowercase letters) is created and checked again. New random string is being created as long as it isn't
-            present in the columns or in the already created column names values.
-
-            Returns dictionary of column aliases: new, real column names.
+            Returns tuple of dictionary of daily aggregates and dictionary of week number: month name pairs.
         """
 
-        random.seed(seed)
-
-        default_col_names = {
-            "year": "year",
-            "year_str": "year_str",
-            "month": "month",
-            "month_str": "month_str",
-            "weekday": "weekday",
-            "weekday_str": "weekday_str",
-            "week": "week",
-            "week_str": "week_str",
-            "date_str": "date_str",
-            "count": "count",
-            "monthyear_str": "monthyear_str"
-        }
-
-        new_values = []
-        for key, item in default_col_names.items():
-
-            new_value = item
-            while (new_value in columns) or (new_value in new_values):
-                new_value = "".join(random.choices(string.ascii_uppercase + string.ascii_lowercase, k=n))
-
-            new_values.append(new_value)
-            default_col_names[key] = new_value
-
-        return default_col_names
-
-    def __aggregated_expense_df(self, dataframe):
-        """Creates new dataframe aggregated by "date" column from dataframe passed as the argument.
+        aggregated = daily_aggregates(dataframe[self.date], dataframe[self.price])
+        aggregated["price"] = aggregated["price"] / self.price_scale
+        func_tick_dict = first_weeks_of_months(aggregated["date"], aggregated["week"])
+        aggregated["date"] = aggregated["date"].astype(np.int32)
 
-            dataframe argument should be Pandas Dataframe defining the same columns as .original_expense_df.
+        return aggregated, func_tick_dict
 
-            Column names are taken from the dictionary defined in .heatmap_df_column_dict.
+    def __filter_aggregate_cube(self, aggregate_cube, months):
+        """Returns aggregate_cube (AggregateCube of .original_expense_df) filtered to months.
 
-            Function aggregates the dataframe by "date" column (.date attribute), calculates both sum() and count()
-            aggregating functions and joins dataframes together such as "count" becomes a column in the dataframe
-            that had sum() applied to it.
-
-            Columns (referred via their aliases) are created:
-                - "year" - year of the transaction
-                - "month" - month of the transaction
-                - "weekday" - day of the week of the transaction
-                - "week" - calculated as the difference between the date in .date Series and min() date in the Df,
-                            floor divided by 7 (creating TimeDelta object) and then extracting number of days.
-                - "year_str" - year of the transaction as String
-                - "month_str" - month of the transaction as String in format "%b"
-                - "weekday_str" - day of the week of the transaction as String
-                - "date_str" - date of the transaction as String in format "%d-%b-%Y", extracted from .date column
-                - "monthyear_str" - concatenated String column as "Year-Month" format, where year has 4 digits and
-                                    month has 2 digits
-                - "week_str" - week number of the transaction as String, padded to 4 digits (e.g. 0001).
-
-            Returns created dataframe.
+            When months include all .months (e.g. when the gridplot is created), aggregate_cube is returned as it
+            is - this way it's DataFrame isn't copied and results memoized in it are reused.
         """
 
-        column_dict = self.heatmap_df_column_dict
-
-        agg = dataframe.groupby(by=[self.date])
-        agg_sum = agg.sum()
-        agg_count = agg.count()
-        agg_sum[column_dict["count"]] = agg_count[self.price]
-
-        aggregated = agg_sum.reset_index().sort_values(by=self.date, ascending=True)
-
-        aggregated[column_dict["year"]] = aggregated[self.date].dt.year
-        aggregated[column_dict["month"]] = aggregated[self.date].dt.month
-        aggregated[column_dict["weekday"]] = aggregated[self.date].dt.weekday
-
-        # string columns
-        aggregated[column_dict["year_str"]] = aggregated[column_dict["year"]].astype(str)
-        aggregated[column_dict["month_str"]] = aggregated[self.date].dt.strftime("%b")
-        aggregated[column_dict["weekday_str"]] = aggregated[column_dict["weekday"]].astype(str)
-        aggregated[column_dict["date_str"]] = aggregated[self.date].dt.strftime("%d-%b-%Y")
-        aggregated[column_dict["monthyear_str"]] = aggregated[column_dict["year_str"]] \
-            + "-" \
-            + aggregated[self.date].dt.strftime("%m")
-
-        # first day is counted as the first Monday in the dataframe
-        start_date = aggregated[aggregated[column_dict["weekday"]] == 0][self.date].min()
-
-        # weeks are defined as the difference between first Monday and the date and then floor divided by 7
-        # there may be a week counted as -1, but it is not a problem
-        aggregated[column_dict["week"]] = ((aggregated[self.date] - start_date) // 7).dt.days
-
-        # padded to 4 digits to avoid sorting issues
-        # assuming regular year to have 52 weeks, df would have to have ~192 years of data to break sorting
-        aggregated[column_dict["week_str"]] = aggregated[column_dict["week"]].apply(lambda x: "{x:04d}".format(x=x))
-
-        return aggregated
+        if set(months) >= set(self.months):
+            return aggregate_cube
 
-    def __create_first_week_to_month_dict(self, agg):
-        """Creates mapping between the number of the first week of the month and the month itself.
+        return aggregate_cube.filtered(months=months)
 
-            agg should be an aggregated dataframe (created in __aggregated_expense_df function).
+    def __get_aggregate_cube(self):
+        """Returns AggregateCube of .original_expense_df.
 
-            Additional transformations are applied to the agg Dataframe to extract dictionary mapping key, value pairs
-            of: Week number - Month String.
+            If .aggregate_cube wasn't created from .original_expense_df (e.g. when .original_expense_df was replaced),
+            new AggregateCube is created from it. Trends doesn't aggregate data by Categories, so no Category Columns
+            are needed in the AggregateCube.
 
-            The assumption made here is that only Mondays can start a Month. After filtering agg dataframe only to
-            those days, grouping by "year_str" is performed to extract first month of a given year (as the provided
-            data does not always have to start in January). This is done to concatenate Year String with it's first
-            Month String into one.
-
-            Agg dataframe is then grouped by "monthyear" and only first week numbers are left. Aggregation is done
-            by "monthyear" column to avoid removing data of same months from different years (December '19 and '20).
-
-            After that, month_str values are concatenated with year values if the given month was the first month
-            in this year. In the end, week_str : month_str dictionary is created.
-
-            week_to_month_dict dictionary is returned.
+            Attribute .aggregate_cube might be updated.
         """
 
-        column_dict = self.heatmap_df_column_dict
-
-        monday_agg = agg[agg[column_dict["weekday"]] == 0]
-        year_month_agg = monday_agg.groupby(column_dict["year_str"]).first()[
-            column_dict["monthyear_str"]].reset_index().set_index(column_dict["monthyear_str"])
-
-        # grouped by monthyear_str to include duplicate months from different years in case of a time gap
-        month_agg = monday_agg.groupby(column_dict["monthyear_str"]).first()[
-            [column_dict["week_str"], column_dict["month_str"]]]
-
-        month_agg[column_dict["year_str"]] = year_month_agg
-
-        func = lambda x: x[column_dict["month_str"]] if pd.isna(x[column_dict["year_str"]]) else "({}) {}".format(
-                x[column_dict["year_str"]], x[column_dict["month_str"]])
-
-        month_agg[column_dict["month_str"]] = month_agg.apply(func, axis=1)
-
-        month_to_week_dict = month_agg.set_index(column_dict["month_str"])[column_dict["week_str"]].to_dict()
-        week_to_month_dict = {item: key for key, item in month_to_week_dict.items()}
+        if self.aggregate_cube is None or self.aggregate_cube.dataframe is not self.original_expense_df:
+            self.aggregate_cube = AggregateCube(self.original_expense_df, self.monthyear, self.date, self.price, {},
+                                                self.price_scale)
 
-        return week_to_month_dict
+        return self.aggregate_cube
@@ -20,42 +20,40 @@ class BokehApp(object):
         Additionally, Settings View exposes Bokeh Widgets with which User can interact to change filters
         applied to their data in regard to Categories and Date Range.
 
-        Object requires following arguments for the initialization:
-            - expense dataframe
-            - income dataframe
-            - col_mapping which should be a dict mapping "ideas" of column to their names in the dataframe.
-                Keys that should be included:
-                    - "date"
-                    - "price"
-                    - "currency"
-                    - "product"
-                    - "shop"
-                    - "all"
-                    - "type"
-                    - "category"
-                    - "monthyear"
-            - monthyear_format which should be a string defining String Date Format in monthyear column
-            - server_date - date at which BokehApp was initialized
-            - category_sep - String used in "all" column to separate Category values (in a tree).
-
-            During initialization, BokehApp creates all Views so that they can be accessed later on. Additionally,
-            it updates .current_expense_dataframe to mirror filtering choices of the User.
+        Object requires data argument for the initialization - BokehAppData object, holding DataFrames, column names
+        (col_mapping), monthyear_format, server_date and category_sep. BokehAppData is read-only and it can be
+        shared by any number of BokehApp objects - BokehApp itself holds only the state of a single User: their
+        Settings (chosen Categories and Month Range) and filtered data. Therefore, every User (browser session)
+        gets their own BokehApp and choices of one User never change data shown to the others.
+
+            During initialization, BokehApp updates .current_expense_dataframe to mirror filtering choices of
+            the User. Views are created every time their gridplot is requested (e.g. for every Bokeh Document), so
+            that different Documents (e.g. different browser tabs) never share Grid Elements and their state.
+
+            Aggregates of the Expense DataFrame (sums and counts by months, dates and Categories of both Category
+            Columns) are calculated once in AggregateCube of BokehAppData and filtered AggregateCube (taken from
+            the LRU cache of BokehAppData, shared by all Users) is passed to the Views together with
+            .current_expense_dataframe.
 
             Settings View is connected via Observer - when some of it's properties are updated, they trigger
-            changes to the BokehApp which in turn can update it's own state variables.
+            changes to the BokehApp which in turn can update it's own state variables. Changes made together
+            (e.g. Category Type and Categories) are made by Settings inside of the Observer transaction, so that
+            BokehApp is notified of all of them at once. Every BokehApp has it's own Observer, so changes (and
+            transactions) of one User are never mixed with changes of the others.
     """
-    observer = Observer()
     category_types = ["Simple", "Expanded", "Combinations (Experimental)"]
 
-    def __init__(self, expense_dataframe, income_dataframe, col_mapping, monthyear_format, server_date, category_sep):
+    def __init__(self, data):
+
+        # Data (shared, read-only)
+        self.data = data
 
         # DataFrames
-        self.original_expense_dataframe = expense_dataframe
-        self.current_expense_dataframe = expense_dataframe
-        self.original_income_dataframe = income_dataframe
-        self.current_income_dataframe = income_dataframe
+        self.current_expense_dataframe = data.expense_dataframe
+        self.current_income_dataframe = data.income_dataframe
 
         # Column Names
+        col_mapping = data.col_mapping
         self.date = col_mapping["date"]
         self.price = col_mapping["price"]
         self.currency = col_mapping["currency"]
@@ -66,28 +64,32 @@ class BokehApp(object):
         self.category = col_mapping["category"]
         self.monthyear = col_mapping["monthyear"]
 
+        # Observer of Settings - notifies .update_on_change (as a function of the object to notify) of changes
+        self.observer = Observer()
+        self.observer.register(BokehApp.update_on_change)
+
         # Variables and Objects
-        color_mapping = ColorMap()
-        self.monthyear_format = monthyear_format
-        category_sep = category_sep
+        self.color_mapping = ColorMap()
+        self.monthyear_format = data.monthyear_format
+        self.category_sep = data.category_sep
+        self.price_scale = data.price_scale
 
         # Settings Object
-        self.settings = Settings(self.original_expense_dataframe[self.category],
-                                 self.original_expense_dataframe[self.all],
-                                 self.original_expense_dataframe[self.date],
-                                 category_sep,
+        self.settings = Settings(data.simple_categories,
+                                 data.extended_categories,
+                                 data.expense_dataframe[self.date],
+                                 self.category_sep,
                                  self.category_types,
                                  self.observer,
                                  self)
 
-        # View Objects
-        self.category_view = Category(self.category, self.monthyear, self.price, self.product,
-                                      self.date, self.currency, self.shop, self.monthyear_format, color_mapping)
-        self.overview_view = Overview(self.category, self.monthyear, self.price, self.product,
-                                      self.date, self.currency, self.shop, self.monthyear_format, server_date,
-                                      color_mapping)
-        self.trends_view = Trends(self.category, self.monthyear, self.price, self.product,
-                                  self.date, self.currency, self.shop, self.monthyear_format, color_mapping)
+        # View Objects (the most recently created ones)
+        self.category_view = None
+        self.overview_view = None
+        self.trends_view = None
+
+        # Aggregates of .current_expense_dataframe
+        self.current_aggregate_cube = data.aggregate_cube
 
         # State Variables
         self.chosen_category_column = self.category
@@ -97,20 +99,39 @@ class BokehApp(object):
         # Needs to be called during __init__ for the Observer decorator to correctly build functions
         self.settings.initialize_settings_variables()
 
+    @property
+    def original_expense_dataframe(self):
+        return self.data.expense_dataframe
+
+    @property
+    def original_income_dataframe(self):
+        return self.data.income_dataframe
+
     # TODO: change single gridplot to one gridplot function with mapping which gridplot should it return
 
     # Gridplot Functions
     def category_gridplot(self):
         self.__update_current_expense_dataframe()
-        return self.category_view.gridplot(self.current_expense_dataframe, self.settings.chosen_categories)
+        self.category_view = Category(self.chosen_category_column, self.monthyear, self.price, self.product,
+                                      self.date, self.currency, self.shop, self.monthyear_format, self.color_mapping,
+                                      price_scale=self.price_scale)
+        return self.category_view.gridplot(self.current_expense_dataframe, self.settings.chosen_categories,
+                                           self.current_aggregate_cube)
 
     def overview_gridplot(self):
         self.__update_current_expense_dataframe()
-        return self.overview_view.gridplot(self.current_expense_dataframe, self.current_income_dataframe)
+        self.overview_view = Overview(self.chosen_category_column, self.monthyear, self.price, self.product,
+                                      self.date, self.currency, self.shop, self.monthyear_format,
+                                      self.data.server_date, self.color_mapping, price_scale=self.price_scale)
+        return self.overview_view.gridplot(self.current_expense_dataframe, self.current_income_dataframe,
+                                           self.current_aggregate_cube)
 
     def trends_gridplot(self):
         self.__update_current_expense_dataframe()
-        return self.trends_view.gridplot(self.current_expense_dataframe)
+        self.trends_view = Trends(self.chosen_category_column, self.monthyear, self.price, self.product,
+                                  self.date, self.currency, self.shop, self.monthyear_format, self.color_mapping,
+                                  price_scale=self.price_scale)
+        return self.trends_view.gridplot(self.current_expense_dataframe, self.current_aggregate_cube)
 
     def settings_categories(self):
         return self.settings.category_options()
@@ -118,16 +139,44 @@ class BokehApp(object):
     def settings_month_range(self):
         return self.settings.month_range_options()
 
-    @observer.register
-    def update_on_change(self, key, value):
+    def filter_cache_info(self):
+        """Returns statistics (hits, misses, maxsize and currsize) of the cache of filtered AggregateCubes."""
+        return self.data.filter_cache_info()
+
+    def update_data(self, data):
+        """Replaces BokehAppData with new one (e.g. when GnuCash file was changed).
+
+            Settings are updated with the data from new BokehAppData (choices of the User are kept where it's
+            possible) and .current_expense_dataframe is filtered again. Views receive new data when their gridplot
+            is created again.
+        """
+
+        self.data = data
+        self.current_expense_dataframe = data.expense_dataframe
+        self.current_income_dataframe = data.income_dataframe
+        self.current_aggregate_cube = data.aggregate_cube
+
+        self.settings.update_original_data(data.simple_categories,
+                                           data.extended_categories,
+                                           data.expense_dataframe[self.date])
+
+        self.__update_current_expense_dataframe()
+
+    def update_dataframes(self, expense_dataframe, income_dataframe):
+        """Replaces Expense and Income DataFrames with new ones - new BokehAppData (with the same settings) is
+            created from them and loaded with update_data."""
+
+        self.update_data(self.data.with_dataframes(expense_dataframe, income_dataframe))
+
+    def update_on_change(self, changes):
         """ "Notify" function, that is called upon change to properties watched by the Observer.
 
-            Arguments required:
-                - key - representing name of the property that was changed
-                - value - representing value with which key property was changed.
+            Argument required:
+                - changes - dictionary of {key: value} pairs, where key represents name of the property that was
+                    changed and value represents value with which key property was changed.
 
             Function has it's own dictionary, which based on a provided key returns function that needs
-            to be called.
+            to be called - functions are called for every changed property, in order of changes.
         """
         key_func_dict = {
             "chosen_categories": self.__update_current_chosen_categories,
@@ -135,8 +184,9 @@ class BokehApp(object):
             "chosen_months": self.__update_current_chosen_months
         }
 
-        func = key_func_dict[key]
-        func(value)
+        for key, value in changes.items():
+            func = key_func_dict[key]
+            func(value)
 
     def __update_current_chosen_categories(self, categories):
         """Updates .current_chosen_categories with categories argument."""
@@ -147,15 +197,13 @@ class BokehApp(object):
         self.current_chosen_months = months
 
     def __update_category_choice(self, category_type):
-        """Updates .chosen_category_column attribute based on provided category_type and calls .change_category_column
-            in View Objects.
+        """Updates .chosen_category_column attribute based on provided category_type.
 
             Based on the provided category_type new category column is chosen (either .category or .all) and inserted
             into .chosen_category_column variable.
 
-            Additionally, .change_category_column function of 3 Views Objects is called (Overview, Trends, Categories)
-            as the change in Category column is something that they need to be informed of (and with that update
-            their own variables).
+            Views (Overview, Trends, Categories) are created with .chosen_category_column as their category column,
+            so the change is reflected in every View created from now on.
         """
 
         d = {
@@ -165,38 +213,33 @@ class BokehApp(object):
         }
         self.chosen_category_column = d[category_type]
 
-        for obj in [self.overview_view, self.trends_view, self.category_view]:
-            obj.change_category_column(self.chosen_category_column)
-
     def __update_current_expense_dataframe(self):
         """Updates .current_expense_dataframe with data from .original_expense_dataframe but filtered to choices
             stored in .current_chosen_months and .current_chosen_categories.
 
             Updates to dataframes need to be done in regard to two factors: month range and Categories chosen
-            by the User. In theory, it could be done in one step.
-            Unfortunately, filtering by Category can also be made as Combinations Categories (e.g.
-            "Expenses:Family:Grocery" will be made into "Expenses", "Expenses:Family" and "Expenses:Family:Grocery".
-            When User unchecks "Expenses:Family", then all rows that have "Expenses:Family" in them should be
+            by the User.
+            Filtering by Category can also be made as Combinations Categories (e.g. "Expenses:Family:Grocery" will
+            be made into "Expenses", "Expenses:Family" and "Expenses:Family:Grocery"). When User unchecks
+            "Expenses:Family", then all rows that are in "Expenses:Family" (or any Category under it) should be
             filtered out.
-            Therefore, filtering comes in two steps: first, .original_expense_dataframe is filtered to only
-            include chosen months (based on .current_chosen_months attribute and .monthyear column). Then
-            "unchosen" categories are calculated (those that user unchecked in the Settings CheckboxGroup) and
-            every row that contains that category is filtered out.
+            Therefore, "unchosen" categories are calculated (those that user unchecked in the Settings
+            CheckboxGroup) and AggregateCube of BokehAppData is filtered to months in .current_chosen_months,
+            excluding any of "unchosen" categories of chosen category column.
 
-            Eventually .current_expense_dataframe is updated with the filtered dataframe.
+            Filtered AggregateCube is taken from the cache of BokehAppData (see
+            BokehAppData.filtered_aggregate_cube). Unchosen categories are used instead of
+            .current_chosen_categories, as they also reflect the Category type (e.g. "Expanded" and "Combinations"
+            use the same column, but different Categories).
+
+            Eventually .current_aggregate_cube and .current_expense_dataframe are updated.
         """
 
-        # Month Filtering
         months = pd.to_datetime(self.current_chosen_months).strftime(self.monthyear_format)
-        month_cond = np.isin(self.original_expense_dataframe[self.monthyear], months)
-        df = self.original_expense_dataframe[month_cond]
 
         # TODO: possibly change .settings.all_categories to a variable from BokehApp directly
-        # Categories Filtering
         unchosen_cats = set(self.settings.all_categories) - set(self.current_chosen_categories)
 
-        for cat in unchosen_cats:
-            cond = df[self.chosen_category_column].str.contains(cat)
-            df = df[~cond]
-
-        self.current_expense_dataframe = df
+        self.current_aggregate_cube = self.data.filtered_aggregate_cube(months, unchosen_cats,
+                                                                        self.chosen_category_column)
+        self.current_expense_dataframe = self.current_aggregate_cube.dataframe
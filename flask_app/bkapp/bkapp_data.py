@@ -0,0 +1,96 @@
+import pandas as pd
+from functools import lru_cache
+
+from .aggregate_cube import AggregateCube
+
+
+class BokehAppData(object):
+    """Read-only Data shared by all BokehApp objects (states of different Users) of the Bokeh Server.
+
+        Object holds everything that depends only on the data and not on the choices of the User:
+            - Expense and Income DataFrames,
+            - column names, monthyear_format, server_date, category_sep and price_scale,
+            - AggregateCube of Expense DataFrame (for both Category Columns),
+            - unique Categories of both Category Columns (used to initialize Settings of every User),
+            - LRU cache of filtered AggregateCubes.
+        BokehAppData is never modified after it's created - neither are DataFrames nor AggregateCubes it holds.
+        Therefore, any number of BokehApp objects can use it at the same time without copying the data and
+        filtered AggregateCubes created for one User are reused for every other User with the same choices.
+        When the data changes, new BokehAppData is created (see .with_dataframes) and passed to BokehApp objects.
+
+        Object requires the same arguments as BokehApp did: expense and income DataFrames, col_mapping dict,
+        monthyear_format, server_date and category_sep (see BokehApp). Optional price_scale is the number of units of
+        price column in the unit of currency (e.g. 100 if prices are int64 cents, see GnuCashDBParser price_scale) -
+        sums of prices are divided by it only when they are shown.
+
+        Main methods are:
+            - filtered_aggregate_cube - returns (cached) AggregateCube filtered to months and Categories;
+            - filter_cache_info - returns statistics of the cache of filtered AggregateCubes;
+            - with_dataframes - returns new BokehAppData with the same settings, but with new DataFrames.
+    """
+
+    filter_cache_size = 32
+
+    def __init__(self, expense_dataframe, income_dataframe, col_mapping, monthyear_format, server_date, category_sep,
+                 price_scale=1):
+
+        # DataFrames
+        self.expense_dataframe = expense_dataframe
+        self.income_dataframe = income_dataframe
+
+        # Column Names
+        self.col_mapping = col_mapping
+        self.date = col_mapping["date"]
+        self.price = col_mapping["price"]
+        self.category = col_mapping["category"]
+        self.all = col_mapping["all"]
+        self.monthyear = col_mapping["monthyear"]
+
+        # Variables
+        self.monthyear_format = monthyear_format
+        self.server_date = server_date
+        self.category_sep = category_sep
+        self.price_scale = price_scale
+
+        # Unique Categories of both Category Columns
+        self.simple_categories = pd.Series(pd.unique(expense_dataframe[self.category]))
+        self.extended_categories = pd.Series(pd.unique(expense_dataframe[self.all]))
+
+        # Aggregates
+        category_columns = {
+            self.category: None,
+            self.all: self.category_sep
+        }
+        self.aggregate_cube = AggregateCube(expense_dataframe, self.monthyear, self.date, self.price, category_columns,
+                                            price_scale)
+        self.filter_cache = lru_cache(maxsize=self.filter_cache_size)(self.__create_filtered_aggregate_cube)
+
+    def filtered_aggregate_cube(self, months, unchosen_categories, category_column):
+        """Returns .aggregate_cube filtered to months, excluding any of unchosen_categories of category_column.
+
+            Filtered AggregateCubes are memoized in the LRU cache - months and unchosen_categories are made into
+            canonical (sorted and hashable) key together with category_column, so that the same choices always hit
+            the same entry, regardless of their order.
+        """
+
+        return self.filter_cache(tuple(sorted(set(months))), frozenset(unchosen_categories), category_column)
+
+    def filter_cache_info(self):
+        """Returns statistics (hits, misses, maxsize and currsize) of the cache of filtered AggregateCubes."""
+        return self.filter_cache.cache_info()
+
+    def with_dataframes(self, expense_dataframe, income_dataframe):
+        """Returns new BokehAppData with expense_dataframe and income_dataframe and the same settings."""
+        return BokehAppData(expense_dataframe, income_dataframe, self.col_mapping, self.monthyear_format,
+                            self.server_date, self.category_sep, self.price_scale)
+
+    def __create_filtered_aggregate_cube(self, months, unchosen_categories, category_column):
+        """Returns .aggregate_cube filtered to months, excluding any of unchosen_categories of category_column.
+
+            Only masks of months and Categories are calculated for filtered AggregateCube, so aggregates don't need
+            to be calculated again. Filtered DataFrame is created (once) when .dataframe of the AggregateCube is
+            accessed and then it's kept in the AggregateCube.
+        """
+
+        return self.aggregate_cube.filtered(months=months, excluded_categories=unchosen_categories,
+                                            category_column=category_column)
@@ -1,10 +1,20 @@
 from tornado.ioloop import IOLoop
+from functools import partial
+from collections import OrderedDict
+from multiprocessing import Process
 import os
+import re
+import sys
+import signal
+import tempfile
 
 from bokeh.server.server import Server
 from bokeh.themes import Theme
 
 from .bkapp import BokehApp
+from .bkapp_data import BokehAppData
+from .shared_dataframes import SharedDataFrames
+from ..gnucash.gnucash_file_watcher import GnuCashFileWatcher
 
 
 class BokehServer(object):
@@ -15,14 +25,48 @@ class BokehServer(object):
     Flask Views. All of Bokeh Views follow simple pattern of calling BokehApp with appropriate parameters
     (which later could be dynamically obtained, e.g. column names) and then adding roots to the document.
 
+    Data is loaded once into BokehAppData, which is shared (read-only) by all BokehApp objects. Every User gets
+    their own BokehApp (with their own Settings) - Users are identified by "state" argument of the request of
+    the Document (see flask_app.bokeh_document), which stays the same for every page of the Flask session.
+    Documents requested without the argument share the default state. State ids must be uuid4 hex Strings (as
+    created by flask_app.bokeh_document) - Documents requested with any other id are rejected.
+
+    States don't outlive their Users - BokehApp of a state is removed when the last Bokeh session of it's Documents
+    is destroyed (e.g. after all browser tabs of the User were closed). Additionally, only .max_states of the most
+    recently used states are kept, so the number of states is bounded regardless of the requests.
+
     To add a visualization (view), the function has to be defined and then added into self.views dictionary.
+
+    If gnucash_parser (GnuCashDBParser) is provided, GnuCash file is watched while the server is running. When the
+    file changes, it's refreshed by the parser in the watcher Thread (outside of the IOLoop, so the server stays
+    responsive) and new DataFrames are then loaded into BokehApp. All open sessions are then created again, so that
+    their DataSources show the new data.
+
+    If num_procs is greater than 1, Visualizations are served by num_procs worker Processes, each with it's own
+    Bokeh Server (and IOLoop) on consecutive ports starting from port (see .ports). DataFrames are saved once as
+    SharedDataFrames (memory-mapped files in shared_dir) and every worker attaches to them without copying.
+    Process that called bkworker supervises the workers - it watches GnuCash file and saves refreshed DataFrames
+    as a new generation of SharedDataFrames, which workers then load. As the state of every User is kept in
+    the worker Process, all Documents of a User should be requested from the same worker (see
+    flask_app.bokeh_document).
+
+    price_scale is the number of units of price column in the unit of currency - it should be provided when
+    DataFrames hold integer prices (e.g. 100 for cents, see GnuCashDBParser price_scale).
     """
 
+    state_argument = "state"
+    default_state = "default"
+    state_id_pattern = re.compile("[0-9a-f]{32}")
+    max_states = 256
+
     def __init__(self, port, col_mapping, expense_dataframe, income_dataframe, server_date,
-                 monthyear_format, category_sep):
+                 monthyear_format, category_sep, gnucash_parser=None, watch_interval=1.0, num_procs=1,
+                 shared_dir=None, price_scale=1):
 
-        self.bkapp = BokehApp(expense_dataframe, income_dataframe,
-                              col_mapping, monthyear_format, server_date, category_sep)
+        self.data = BokehAppData(expense_dataframe, income_dataframe,
+                                 col_mapping, monthyear_format, server_date, category_sep, price_scale)
+        self.states = OrderedDict()  # state id: BokehApp, from the least recently used
+        self.state_sessions = {}  # state id: set of ids of Bokeh sessions with Documents of the state
         self.port = port
         self.views = {
             '/trends': self.trends,
@@ -32,43 +76,230 @@ class BokehServer(object):
             '/settings_month_range': self.settings_month_range,
         }
 
+        self.gnucash_parser = gnucash_parser
+        self.watch_interval = watch_interval
+
+        # Multi-Process Serving
+        self.num_procs = num_procs
+        self.shared_dir = shared_dir
+        self.shared_dataframes = None
+
         self.theme = Theme(filename=os.path.join(os.path.dirname(os.path.realpath(__file__)), "theme.yaml"))
 
     def settings_month_range(self, doc):
 
-        fig = self.bkapp.settings_month_range()
+        fig = self.get_state(doc).settings_month_range()
         doc.add_root(fig)
         doc.theme = self.theme
 
     def settings_categories(self, doc):
 
-        fig = self.bkapp.settings_categories()
+        fig = self.get_state(doc).settings_categories()
         doc.add_root(fig)
         doc.theme = self.theme
 
     def trends(self, doc):
 
-        fig = self.bkapp.trends_gridplot()
+        fig = self.get_state(doc).trends_gridplot()
         doc.add_root(fig)
         doc.theme = self.theme
 
     def category(self, doc):
 
-        fig = self.bkapp.category_gridplot()
+        fig = self.get_state(doc).category_gridplot()
         doc.add_root(fig)
         doc.theme = self.theme
 
     def overview(self, doc):
-        fig = self.bkapp.overview_gridplot()
+        fig = self.get_state(doc).overview_gridplot()
         doc.add_root(fig)
         doc.theme = self.theme
 
+    def get_state(self, doc):
+        """Returns BokehApp of the User that requested doc - if there is none yet, new BokehApp is created over
+            shared .data.
+
+            ValueError is raised if the state id of the request isn't a uuid4 hex String. Session of doc is
+            remembered for the state, so that the state is removed when all of it's sessions are destroyed (see
+            __remove_session). If there are more than .max_states states, the least recently used one is removed.
+        """
+
+        state_id = self.default_state
+        session_context = doc.session_context
+        if session_context is not None and session_context.request is not None:
+            values = session_context.request.arguments.get(self.state_argument)
+            if values:
+                state_id = values[0].decode("utf-8")
+                if self.state_id_pattern.fullmatch(state_id) is None:
+                    raise ValueError("Invalid state id: {state_id}".format(state_id=state_id))
+
+        if state_id not in self.states:
+            self.states[state_id] = BokehApp(self.data)
+            self.state_sessions[state_id] = set()
+            while len(self.states) > self.max_states:
+                oldest_id, _ = self.states.popitem(last=False)
+                self.state_sessions.pop(oldest_id, None)
+
+        self.states.move_to_end(state_id)
+
+        if session_context is not None and state_id != self.default_state:
+            sessions = self.state_sessions[state_id]
+            if session_context.id not in sessions:
+                sessions.add(session_context.id)
+                doc.on_session_destroyed(partial(self.__remove_session, state_id))
+
+        return self.states[state_id]
+
+    def __remove_session(self, state_id, session_context):
+        """Called when Bokeh session of Document of state_id is destroyed - state is removed together with it's
+            last session."""
+
+        sessions = self.state_sessions.get(state_id)
+        if sessions is None:
+            return
+
+        sessions.discard(session_context.id)
+        if len(sessions) == 0:
+            del self.state_sessions[state_id]
+            del self.states[state_id]
+
+    def ports(self):
+        """Returns list of ports on which Bokeh Servers are listening (one per worker Process)."""
+        return [self.port + i for i in range(self.num_procs)]
+
     def bkworker(self):
-        """Called in a separate Thread by flask_app to serve Bokeh Visualizations."""
+        """Called in a separate Process by flask_app to serve Bokeh Visualizations.
+
+            If .num_procs is greater than 1, worker Processes are started and supervised instead (see supervise).
+        """
+
+        if self.num_procs > 1:
+            self.supervise()
+            return
+
+        server = self.__create_server(self.port)
+
+        if self.gnucash_parser is not None:
+            watcher = GnuCashFileWatcher(self.gnucash_parser.file_path, partial(self.reload_data, server),
+                                         self.watch_interval)
+            watcher.start()
+
+        server.io_loop.start()
+
+    def supervise(self):
+        """Saves DataFrames as SharedDataFrames, starts .num_procs worker Processes and waits for them.
+
+            If gnucash_parser was provided, GnuCash file is watched and refreshed DataFrames are saved as a new
+            generation of SharedDataFrames (see save_shared_data). Workers are terminated together with
+            the supervising Process.
+        """
+
+        if self.shared_dir is None:
+            self.shared_dir = tempfile.mkdtemp(prefix="bokeh_shared_")
+        self.shared_dataframes = SharedDataFrames(self.shared_dir)
+        self.shared_dataframes.save({"expense": self.data.expense_dataframe, "income": self.data.income_dataframe})
+
+        workers = [Process(target=self.shared_worker, args=(port,), daemon=True) for port in self.ports()]
+        for worker in workers:
+            worker.start()
+
+        # SystemExit lets multiprocessing terminate daemon workers when the supervisor is terminated
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+        if self.gnucash_parser is not None:
+            watcher = GnuCashFileWatcher(self.gnucash_parser.file_path, self.save_shared_data, self.watch_interval)
+            watcher.start()
+
+        try:
+            for worker in workers:
+                worker.join()
+        finally:
+            self.shared_dataframes.remove()
+
+    def shared_worker(self, port):
+        """Called in every worker Process - serves Bokeh Visualizations on port with data from SharedDataFrames.
+
+            DataFrames are memory-mapped from SharedDataFrames (instead of using copies inherited from
+            the supervising Process) and new generations of them are loaded when they are saved.
+        """
+
+        dfs = self.shared_dataframes.load()
+        self.data = self.data.with_dataframes(dfs["expense"], dfs["income"])
+
+        server = self.__create_server(port)
+
+        watcher = GnuCashFileWatcher(self.shared_dataframes.current_path, partial(self.reload_shared_data, server),
+                                     self.watch_interval)
+        watcher.start()
 
-        server = Server(self.views, io_loop=IOLoop(),
-                        allow_websocket_origin=['127.0.0.1:5000', 'localhost:5000',
-                                                '127.0.0.1:9090', 'localhost:9090'],
-                        port=self.port)
-        server.start()
         server.io_loop.start()
+
+    def save_shared_data(self):
+        """Called in the watcher Thread of the supervising Process when GnuCash file changes.
+
+            DataFrames are refreshed by the parser and, if they changed, they are saved as a new generation of
+            SharedDataFrames.
+        """
+
+        if self.gnucash_parser.refresh():
+            self.shared_dataframes.save({"expense": self.gnucash_parser.get_expenses_df(),
+                                         "income": self.gnucash_parser.get_income_df()})
+
+    def reload_shared_data(self, server):
+        """Called in the watcher Thread of the worker Process when new generation of SharedDataFrames is saved.
+
+            New DataFrames are loaded (memory-mapped) and passed to update_data, scheduled on the IOLoop of
+            the server.
+        """
+
+        dfs = self.shared_dataframes.load()
+        server.io_loop.add_callback(self.update_data, server, dfs["expense"], dfs["income"])
+
+    def reload_data(self, server):
+        """Called in the watcher Thread when GnuCash file changes.
+
+            DataFrames are refreshed by the parser (only changed transactions are read) and, if they changed, they
+            are passed to update_data, scheduled on the IOLoop of the server.
+        """
+
+        if self.gnucash_parser.refresh():
+            expense_dataframe = self.gnucash_parser.get_expenses_df()
+            income_dataframe = self.gnucash_parser.get_income_df()
+            server.io_loop.add_callback(self.update_data, server, expense_dataframe, income_dataframe)
+
+    def update_data(self, server, expense_dataframe, income_dataframe):
+        """Loads new DataFrames into BokehAppData (shared by BokehApp objects of all Users) and refreshes
+            Documents of all open sessions.
+
+            Documents can be safely modified only when their lock is held, so every Document is refreshed
+            in it's own next tick callback.
+        """
+
+        self.data = self.data.with_dataframes(expense_dataframe, income_dataframe)
+        for state in self.states.values():
+            state.update_data(self.data)
+
+        for path, view in self.views.items():
+            for session in server.get_sessions(path):
+                doc = session.document
+                doc.add_next_tick_callback(partial(self.refresh_document, doc, view))
+
+    def __create_server(self, port):
+        """Creates and starts Bokeh Server (with new IOLoop) serving .views on port."""
+
+        origins = ['127.0.0.1:5000', 'localhost:5000']
+        for server_port in self.ports():
+            origins.extend(['127.0.0.1:{port}'.format(port=server_port), 'localhost:{port}'.format(port=server_port)])
+
+        # copy of .views is passed, as Server replaces functions in the dict with Applications
+        server = Server(dict(self.views), io_loop=IOLoop(), allow_websocket_origin=origins, port=port)
+        server.start()
+
+        return server
+
+    @staticmethod
+    def refresh_document(doc, view):
+        """Removes all roots from doc and creates them again with view function."""
+
+        doc.clear()
+        view(doc)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from .category_tree import CategoryTree
+
+
+class CategoryIndex(object):
+    """Index of Category membership of rows of a single Category Column, built once when the data is loaded.
+
+        Every row is represented by the integer code of it's category (categories are factorized) and every
+        category covers codes of values in it's subtree of CategoryTree:
+            - without category_sep, category covers only it's own code (e.g. "Bread" matches only "Bread"),
+            - with category_sep, values are treated as paths in the Category tree and every prefix of every value
+                is indexed - category covers it's own code and codes of all of it's descendants (e.g.
+                "Expenses:Family" matches "Expenses:Family" and "Expenses:Family:Grocery:Bread", but neither
+                "Expenses:Family Trip" nor "Other Expenses:Family").
+        This way both "Extended" and "Combinations" Categories (see Settings) can be looked up in the same index.
+        Codes of values in the subtree of a category are one slice of an array sorted once in CategoryTree, so
+        lists of codes aren't built for every prefix of every value.
+
+        Rows of any number of categories are then found with one vectorized lookup: codes of all categories are
+        marked in a boolean table (one element per unique category) and the table is indexed with codes of
+        the rows. Cost of the lookup doesn't depend on the number of categories and, unlike .str.contains,
+        there are no accidental substring or regex matches.
+
+        Main method is rows_mask, returning boolean mask of rows that belong to any of provided categories.
+    """
+
+    def __init__(self, category_series, category_sep=None):
+
+        self.tree = CategoryTree(category_series, category_sep)
+
+        # NaN values get code -1, which points to the additional last element of the lookup table (always False)
+        self.codes = self.tree.codes
+        self.categories = self.tree.uniques  # unique values of category_series, in order of their codes
+        self.categories_count = len(self.categories)
+
+    def rows_mask(self, categories):
+        """Returns boolean np.array (one element per row) with True for rows that belong to any of categories.
+
+            Categories that aren't present in the index don't match any rows.
+        """
+
+        lookup = np.zeros(self.categories_count + 1, dtype=bool)
+        for category in categories:
+            lookup[self.tree.values(category)] = True
+
+        return lookup[self.codes]
+
+    def __len__(self):
+        return len(self.codes)
@@ -0,0 +1,216 @@
+import numpy as np
+import pandas as pd
+
+
+class CategoryTree(object):
+    """Tree of Categories (e.g. GnuCash accounts) built once from values of a Category Column.
+
+        Values are treated as paths in the tree, split on category_sep (e.g. "Expenses:Family:Grocery" is a child
+        of "Expenses:Family", which is a child of "Expenses") - every prefix of every value is a node of the tree.
+        Without category_sep, every value is a separate root node without any children.
+
+        Every node has:
+            - id - position of the node in .names (nodes are numbered in order of their creation),
+            - parent - id of the parent node in .parents (-1 for root nodes) and depth in .depths (0 for root
+                nodes),
+            - descendant range - nodes are numbered again in the order of depth-first traversal of the tree (Euler
+                tour, children sorted by their names) - .enter holds the number of the node and .exit the number
+                after the last of it's descendants. Therefore, descendants of the node are exactly nodes numbered
+                from .enter to .exit (exclusive) and checking if one node is a descendant of the other doesn't
+                require any string comparisons,
+            - row ids - rows (elements of values) are sorted once in the order of the traversal, so that rows of
+                the node and of all of it's descendants are one contiguous slice of .row_order.
+        Unique values are sorted the same way, so that codes of values (see pd.factorize) in the subtree of a node
+        are also one slice of .value_order.
+
+        All lookups by the name of the node are made with a dictionary and return slices of arrays built when
+        the tree is created - their cost doesn't depend on the number of nodes or rows. NaN values don't belong to
+        any node.
+
+        Object expects:
+            - values - array-like of Category values (e.g. Category Column of Expense DataFrame),
+            - category_sep - String that separates names of nodes in values (None if values are not paths).
+
+        Main methods are:
+            - rows - returns ids of rows in the subtree of a node;
+            - values - returns codes of unique values in the subtree of a node;
+            - subtree_sums - returns sums of weights of rows in subtrees of every node;
+            - rollup - returns sums of weights of rows (e.g. in many months) propagated up the tree;
+            - is_descendant - checks if one node is in the subtree of the other one;
+            - position - returns position of the node in sorted names of all nodes (.categories).
+    """
+
+    def __init__(self, values, category_sep=None):
+
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+
+        self.category_sep = category_sep
+        self.codes = codes  # codes of values (-1 for NaN)
+        self.uniques = uniques  # unique values, in order of their codes
+
+        names, parents, children, value_nodes = self.__create_nodes(uniques, category_sep)
+        nodes_count = len(names)
+
+        self.names = names  # node id: full name (path) of the node
+        self.parents = np.array(parents, dtype=np.int64)  # node id: id of the parent node
+        self.value_nodes = value_nodes  # code of unique value: id of it's node
+        self.depths = self.__calculate_depths(self.parents)  # node id: depth of the node
+        self.node_ids = {name: node for node, name in enumerate(names)}
+        self.enter, self.exit = self.__traverse(children, nodes_count)
+
+        # Sorted names of all nodes
+        self.categories = sorted(names)
+        self.category_positions = {category: position for position, category in enumerate(self.categories)}
+
+        # Codes of unique values and ids of rows sorted in the order of the traversal
+        value_positions = self.enter[value_nodes]
+        self.value_order = np.argsort(value_positions, kind="stable")
+        self.value_offsets = np.searchsorted(value_positions[self.value_order], np.arange(nodes_count + 1))
+
+        present_rows = np.flatnonzero(codes >= 0)
+        row_positions = value_positions[codes[present_rows]]
+        order = np.argsort(row_positions, kind="stable")
+        self.row_order = present_rows[order]
+        self.row_offsets = np.searchsorted(row_positions[order], np.arange(nodes_count + 1))
+
+    def rows(self, category):
+        """Returns np.array of ids of rows (positions in values) of category and all of it's descendants - empty
+            array is returned if category isn't a node of the tree."""
+
+        start, stop = self.__descendant_range(category)
+        return self.row_order[self.row_offsets[start]:self.row_offsets[stop]]
+
+    def values(self, category):
+        """Returns np.array of codes of unique values (see .uniques) in the subtree of category - empty array is
+            returned if category isn't a node of the tree."""
+
+        start, stop = self.__descendant_range(category)
+        return self.value_order[self.value_offsets[start]:self.value_offsets[stop]]
+
+    def subtree_sums(self, weights):
+        """Returns np.array (one element per node id) of sums of weights (array-like with one element per row) of
+            rows in the subtree of every node.
+
+            Weights are summed cumulatively once in the order of the traversal - sum of every subtree is then
+            a difference of two cumulative sums.
+        """
+
+        weights = np.asarray(weights, dtype=np.float64)[self.row_order]
+        cumulative = np.concatenate(([0.0], np.cumsum(weights)))
+
+        return cumulative[self.row_offsets[self.exit]] - cumulative[self.row_offsets[self.enter]]
+
+    def rollup(self, weights):
+        """Returns np.array of sums of weights rolled up the tree - first dimension of the array are node ids and
+            other dimensions are the same as in weights.
+
+            weights should be array-like with rows in the first dimension (e.g. rows x months). Weights of rows are
+            first added to nodes of their values and then sums of nodes are propagated to their parents in one
+            bottom-up pass, from the deepest level of the tree to root nodes - every node ends up with the sum of
+            it's whole subtree. Unlike subtree_sums, missing weight (NaN) makes only sums of it's node and it's
+            ancestors missing.
+        """
+
+        weights = np.asarray(weights, dtype=np.float64)
+        present = self.codes >= 0
+
+        sums = np.zeros((len(self.names),) + weights.shape[1:], dtype=np.float64)
+        np.add.at(sums, self.value_nodes[self.codes[present]], weights[present])
+
+        for depth in range(int(self.depths.max(initial=0)), 0, -1):
+            nodes = np.flatnonzero(self.depths == depth)
+            np.add.at(sums, self.parents[nodes], sums[nodes])
+
+        return sums
+
+    def is_descendant(self, category, ancestor):
+        """Returns True if category is ancestor or any of it's descendants (both must be nodes of the tree)."""
+
+        node, ancestor_node = self.node_ids[category], self.node_ids[ancestor]
+        return bool(self.enter[ancestor_node] <= self.enter[node] < self.exit[ancestor_node])
+
+    def position(self, category):
+        """Returns position of category in .categories (sorted names of all nodes)."""
+        return self.category_positions[category]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __descendant_range(self, category):
+        """Returns numbers (in the order of the traversal) of the first node in the subtree of category and
+            the number after the last node in the subtree - (0, 0) is returned for categories that aren't nodes
+            of the tree."""
+
+        node = self.node_ids.get(category)
+        if node is None:
+            return 0, 0
+
+        return self.enter[node], self.exit[node]
+
+    @staticmethod
+    def __create_nodes(uniques, category_sep):
+        """Returns names and parents of nodes, dictionary of node id: dictionary of child name: child id (with -1
+            as the id of the root) and np.array of node ids of every unique value.
+
+            Nodes are created for every prefix of every value (cut on category_sep) or for every value if
+            category_sep is None.
+        """
+
+        names = []
+        parents = []
+        children = {-1: {}}
+        value_nodes = np.zeros(len(uniques), dtype=np.int64)
+
+        for code, value in enumerate(uniques):
+            parts = [value] if category_sep is None else value.split(category_sep)
+
+            node = -1
+            for part in parts:
+                child = children[node].get(part)
+                if child is None:
+                    child = len(names)
+                    names.append(part if node == -1 else category_sep.join([names[node], part]))
+                    parents.append(node)
+                    children[node][part] = child
+                    children[child] = {}
+                node = child
+
+            value_nodes[code] = node
+
+        return names, parents, children, value_nodes
+
+    @staticmethod
+    def __calculate_depths(parents):
+        """Returns np.array of depths of nodes - parents are always created before their children, so depths of
+            parents are known when nodes are visited in order of their ids."""
+
+        depths = np.zeros(len(parents), dtype=np.int64)
+        for node, parent in enumerate(parents.tolist()):
+            if parent >= 0:
+                depths[node] = depths[parent] + 1
+
+        return depths
+
+    @staticmethod
+    def __traverse(children, nodes_count):
+        """Returns np.arrays (one element per node id) of numbers of nodes in the order of depth-first traversal
+            of the tree (children are visited in order of their names) and numbers after the last descendants of
+            nodes."""
+
+        enter = np.zeros(nodes_count, dtype=np.int64)
+        exit = np.zeros(nodes_count, dtype=np.int64)
+
+        number = 0
+        stack = [(child, False) for _, child in sorted(children[-1].items(), reverse=True)]
+        while stack:
+            node, is_exit = stack.pop()
+            if is_exit:
+                exit[node] = number
+                continue
+
+            enter[node] = number
+            number += 1
+            stack.append((node, True))
+            stack.extend((child, False) for _, child in sorted(children[node].items(), reverse=True))
+
+        return enter, exit
@@ -0,0 +1,96 @@
+import numpy as np
+
+
+month_names = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def daily_aggregates(dates, prices):
+    """Returns dictionary of np.arrays with daily aggregates of prices paid on dates (both array-likes of the same
+        length, one element per transaction).
+
+        Dates are converted to integer days since epoch and prices are summed (and counted) with np.bincount over
+        offsets of those days from the first day - no DataFrame is grouped or sorted, so the cost depends only
+        on the number of transactions and on the number of days between the first and the last transaction.
+        Missing prices are neither summed nor counted and rows with missing dates are skipped.
+
+        Only days with any transaction are returned, sorted from the first one:
+            - "date": Integer numbers of days since epoch,
+            - "week": Integer numbers of weeks, counted from the first Monday with a transaction (days before that
+                Monday are in week -1),
+            - "weekday": Integer numbers of days of the week (Monday - 0, Sunday - 6),
+            - "price": Float sums of prices paid in a day,
+            - "count": Integer numbers of transactions in a day.
+    """
+
+    days = np.asarray(dates, dtype="datetime64[D]")
+    prices = np.asarray(prices, dtype=np.float64)
+
+    has_date = ~np.isnat(days)
+    days = days[has_date].astype(np.int64)
+    prices = prices[has_date]
+
+    if len(days) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return {"date": empty, "week": empty, "weekday": empty, "price": np.zeros(0), "count": empty}
+
+    first_day = days.min()
+    offsets = days - first_day
+
+    has_price = ~np.isnan(prices)
+    sums = np.bincount(offsets, weights=np.where(has_price, prices, 0))
+    counts = np.bincount(offsets, weights=has_price).astype(np.int64)
+
+    # days with any transaction (even if all of it's prices are missing)
+    present = np.flatnonzero(np.bincount(offsets))
+    day_numbers = first_day + present
+    weekdays = weekday_of_days(day_numbers)
+
+    mondays = day_numbers[weekdays == 0]
+    if len(mondays) > 0:
+        start = mondays[0]
+    else:
+        start = first_day + (-weekday_of_days(first_day)) % 7  # Monday after the first day
+
+    return {
+        "date": day_numbers,
+        "week": (day_numbers - start) // 7,
+        "weekday": weekdays,
+        "price": sums[present],
+        "count": counts[present]
+    }
+
+
+def weekday_of_days(days):
+    """Returns days of the week (Monday - 0, Sunday - 6) of days (numbers of days since epoch)."""
+    return (days + 3) % 7  # 1970-01-01 was Thursday
+
+
+def first_weeks_of_months(days, weeks):
+    """Returns dictionary of week number: month name pairs for the first week of every month present in days.
+
+        days should be np.array of sorted numbers of days since epoch and weeks np.array of their week numbers
+        (e.g. "date" and "week" arrays returned by daily_aggregates).
+
+        Only Mondays can start a month - first Monday of every month present in days is taken and it's week is
+        mapped to "%b" month name (e.g. "Feb"). The first month of every year is additionally prefixed with
+        the year (e.g. "(2019) Feb"), as the data doesn't always start in January. Months with the same name from
+        different years (e.g. in case of a time gap) are all included.
+    """
+
+    monday = weekday_of_days(days) == 0
+    monday_months = days[monday].astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    monday_weeks = weeks[monday]
+
+    months, first_mondays = np.unique(monday_months, return_index=True)
+    years = months // 12 + 1970
+    first_months_of_years = set(np.unique(years, return_index=True)[1].tolist())
+
+    week_to_month_dict = {}
+    for position, (month, year, first_monday) in enumerate(zip(months.tolist(), years.tolist(),
+                                                                first_mondays.tolist())):
+        name = month_names[month % 12]
+        if position in first_months_of_years:
+            name = "({}) {}".format(year, name)
+        week_to_month_dict[int(monday_weeks[first_monday])] = name
+
+    return week_to_month_dict
@@ -0,0 +1,77 @@
+import numpy as np
+
+
+class GroupedStatistics(object):
+    """Descriptive statistics of values split into groups (e.g. daily sums of price split into months), calculated
+        for any subset of the groups.
+
+        Values are sorted once, when the object is created, and kept together with their groups. Sums, sums of
+        squares and counts of values are aggregated by groups. Therefore, statistics of any subset of groups (e.g.
+        months selected on the Line Plot) are calculated without grouping or sorting anything again:
+            - count, mean and std - from aggregates of the chosen groups,
+            - min, median and max - order statistics taken from the values of the chosen groups, which are already
+                sorted.
+
+        Statistics are the same as those returned by pandas describe() of Series of values from chosen groups
+        (std is a sample standard deviation). Values should not contain NaN.
+
+        Object expects:
+            - values - array-like of values,
+            - groups - array-like of integer groups (from 0 to groups_count - 1) of the values,
+            - groups_count - number of all groups.
+
+        Main method is describe - it returns statistics of chosen groups.
+    """
+
+    def __init__(self, values, groups, groups_count):
+
+        values = np.asarray(values, dtype=np.float64)
+        groups = np.asarray(groups, dtype=np.int64)
+
+        # Sorted Values
+        order = np.argsort(values, kind="stable")
+        self.sorted_values = values[order]
+        self.sorted_groups = groups[order]
+
+        # Aggregates of Groups - squares (and their sums) are calculated from values shifted by their mean, so that
+        # the variance of values that are big in comparison to their spread is still precise
+        self.shift = values.mean() if len(values) > 0 else 0.0
+        shifted = values - self.shift
+
+        self.groups_count = groups_count
+        self.counts = np.bincount(groups, minlength=groups_count)
+        self.sums = np.bincount(groups, weights=values, minlength=groups_count)
+        self.shifted_sums = np.bincount(groups, weights=shifted, minlength=groups_count)
+        self.shifted_squares = np.bincount(groups, weights=shifted ** 2, minlength=groups_count)
+
+    def describe(self, groups_mask=None):
+        """Returns dictionary with count, mean, std, min, median and max of values from groups chosen with
+            groups_mask (boolean np.array with one element per group) - all groups are chosen if it's not provided.
+
+            Statistics that can't be calculated (e.g. std of less than 2 values) are np.nan.
+        """
+
+        if groups_mask is None:
+            groups_mask = np.ones(self.groups_count, dtype=bool)
+
+        count = int(self.counts[groups_mask].sum())
+        stats = {"count": count, "mean": np.nan, "std": np.nan, "min": np.nan, "median": np.nan, "max": np.nan}
+
+        if count == 0:
+            return stats
+
+        stats["mean"] = self.sums[groups_mask].sum() / count
+
+        if count > 1:
+            shifted_mean = self.shifted_sums[groups_mask].sum() / count
+            shifted_squares = self.shifted_squares[groups_mask].sum()
+            variance = (shifted_squares - count * shifted_mean ** 2) / (count - 1)
+            stats["std"] = np.sqrt(max(variance, 0.0))
+
+        values = self.sorted_values[groups_mask[self.sorted_groups]]
+        middle = count // 2
+        stats["min"] = values[0]
+        stats["max"] = values[-1]
+        stats["median"] = values[middle] if count % 2 == 1 else (values[middle - 1] + values[middle]) / 2
+
+        return stats
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+
+class MonthPartition(object):
+    """Rows of DataFrame partitioned by months, so that rows of any month can be taken without filtering.
+
+        Rows of the DataFrame are sorted once, when the object is created, so that rows of every month are
+        contiguous - sort is stable, therefore rows of every month stay in the same order as in the DataFrame.
+        Positions of the first and the last (exclusive) row of every month are kept in .month_offsets and rows of
+        a month are then a slice of the sorted DataFrame - no boolean mask is calculated and no rows are copied, so
+        the cost doesn't depend on the number of rows (or months) in the DataFrame.
+
+        Rows with missing month are not included in any month.
+
+        Object expects:
+            - dataframe - DataFrame that is partitioned,
+            - monthyear - name of the column with months of rows.
+
+        Main method is rows - it returns rows of a month.
+    """
+
+    def __init__(self, dataframe, monthyear):
+
+        self.dataframe = dataframe
+        self.monthyear = monthyear
+
+        codes, months = pd.factorize(dataframe[monthyear], sort=True)
+        present = np.flatnonzero(codes >= 0)
+        order = present[np.argsort(codes[present], kind="stable")]
+
+        # DataFrame with rows of every month next to each other
+        self.sorted_dataframe = dataframe.iloc[order]
+
+        # Month: (start, stop) positions of rows of the month in .sorted_dataframe
+        counts = np.bincount(codes[present], minlength=len(months))
+        stops = np.cumsum(counts)
+        starts = stops - counts
+        self.month_offsets = dict(zip(months, zip(starts.tolist(), stops.tolist())))
+
+    def rows(self, month):
+        """Returns DataFrame with rows of month (slice of .sorted_dataframe) - empty DataFrame is returned if there
+            are no rows of month."""
+
+        start, stop = self.month_offsets.get(month, (0, 0))
+        return self.sorted_dataframe.iloc[start:stop]
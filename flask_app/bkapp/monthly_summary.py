@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+
+class MonthlySummary(object):
+    """Summary of Expenses and Income of every month, calculated once for all months (e.g. for Info Elements of
+        Overview View).
+
+        Expense and Income DataFrames are grouped by months only once, when the object is created - every statistic
+        of a month is then looked up in .summary DataFrame instead of being calculated from rows of the month.
+        Statistics of every month are:
+            - "expenses" - sum of price of Expenses,
+            - "products" - number of Expenses (rows of Expense DataFrame),
+            - "shops" - number of unique shops of Expenses (missing shop is counted as one shop),
+            - "income" - sum of price of Income, as a positive number (Income is expressed as negative price),
+            - "savings" - difference between income and expenses as a fraction of income (np.nan if there was no
+                income in the month).
+        Additionally, sums of price of Expenses in every value of category column are kept for every month, sorted
+        from the biggest sum.
+
+        Object expects:
+            - expense_dataframe and income_dataframe - DataFrames of Expenses and Income,
+            - monthyear, price, shop, category - names of columns of DataFrames,
+            - price_scale - number of units of price column in the unit of currency (e.g. 100 if prices are int64
+                cents) - sums are divided by it once they are aggregated.
+
+        Main methods are:
+            - month - returns dictionary of statistics of a month;
+            - category_expenses - returns sums of Expenses in every Category of a month.
+    """
+
+    def __init__(self, expense_dataframe, income_dataframe, monthyear, price, shop, category, price_scale=1):
+
+        self.expense_dataframe = expense_dataframe
+        self.income_dataframe = income_dataframe
+        self.monthyear = monthyear
+        self.price = price
+        self.shop = shop
+        self.category = category
+        self.price_scale = price_scale
+
+        expenses = expense_dataframe.groupby(monthyear, observed=True)
+        income = income_dataframe.groupby(monthyear, observed=True)[price].sum()
+
+        summary = pd.DataFrame({
+            "expenses": expenses[price].sum() / price_scale,
+            "products": expenses.size(),
+            "shops": expenses[shop].nunique(dropna=False)
+        })
+        summary.index = summary.index.astype(object)
+        income.index = income.index.astype(object)
+
+        summary = summary.reindex(summary.index.union(income.index))
+        summary[["expenses", "products", "shops"]] = summary[["expenses", "products", "shops"]].fillna(0)
+        summary = summary.astype({"products": np.int64, "shops": np.int64})
+        summary["income"] = -income.reindex(summary.index, fill_value=0) / price_scale
+        summary["savings"] = (summary["income"] - summary["expenses"]) / summary["income"].where(
+            summary["income"] != 0)
+
+        # Month: DataFrame of Categories and sums of their price, sorted from the biggest sum
+        self.category_expenses_dict = {}
+        category_sums = expense_dataframe.groupby([monthyear, category], observed=True)[price].sum() / price_scale
+        for month, sums in category_sums.groupby(level=0, observed=True):
+            sums = sums.droplevel(0)
+            sums.index = sums.index.astype(object)
+            sums = sums.sort_index()
+            agg_df = pd.DataFrame({category: sums.index, price: sums.to_numpy()})
+            self.category_expenses_dict[month] = agg_df.sort_values(by=[price], ascending=False)
+
+        self.summary = summary
+        self.summary_columns = {column: summary[column].to_numpy() for column in summary.columns}
+        self.month_positions = {month: position for position, month in enumerate(summary.index)}
+
+    def month(self, month):
+        """Returns dictionary of statistics (see MonthlySummary) of month - month without any Expenses and Income
+            has all sums and numbers equal to 0 and savings equal to np.nan."""
+
+        position = self.month_positions.get(month)
+        if position is not None:
+            return {column: values[position] for column, values in self.summary_columns.items()}
+
+        return {"expenses": 0, "products": 0, "shops": 0, "income": 0, "savings": np.nan}
+
+    def category_expenses(self, month):
+        """Returns DataFrame of Categories (.category column) and sums of price of their Expenses (.price column)
+            in month, sorted from the biggest sum."""
+
+        empty = pd.DataFrame({self.category: pd.Series([], dtype=object), self.price: pd.Series([], dtype=float)})
+        return self.category_expenses_dict.get(month, empty)
@@ -1,5 +1,5 @@
 import numpy as np
-from itertools import accumulate
+import pandas as pd
 
 
 def unique_values_from_column(df, column_name):
@@ -7,21 +7,29 @@ def unique_values_from_column(df, column_name):
 
         If there are any NaN values, they are replaced to string "nan".
      """
-    return sorted(df[column_name].replace({np.nan: "nan"}).unique().tolist())
+    series = df[column_name]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # only values present in the column are converted, not every row
+        series = pd.Series(np.asarray(series.unique(), dtype=object))
+    return sorted(series.replace({np.nan: "nan"}).unique().tolist())
 
 
-def create_combinations_of_sep_values(list_of_values, sep=None):
-    new_set = set()
+def value_counts_from_column(df, column_name):
+    """Returns DataFrame with counts of non-NaN values from a column from a DataFrame df, sorted from the most
+        frequent value. Categories of Categorical column that aren't present in the column are not counted."""
 
-    for val in list_of_values:
-        if sep is None:
-            new_set.add(val)
-        else:
-            elem_list = val.split(sep)
-            elems = accumulate(elem_list, func=lambda x, y: sep.join([x, y]))
-            for item in elems:
-                new_set.add(item)
+    counts = df[column_name].value_counts(dropna=True)
+    if isinstance(counts.index, pd.CategoricalIndex):
+        counts = counts[counts > 0]
+        counts.index = counts.index.astype(object)
+    return pd.DataFrame(counts)
 
-    new_list = list(new_set)
-    new_list.sort()
-    return new_list
+
+def convert_categorical_columns(df):
+    """Returns DataFrame df with Categorical columns converted to object (String) columns - e.g. before DataFrame
+        is used as a data of ColumnDataSource. DataFrames without Categorical columns are returned as they are."""
+
+    columns = [column for column, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+    if len(columns) == 0:
+        return df
+    return df.astype({column: object for column in columns})
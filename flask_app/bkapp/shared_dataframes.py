@@ -0,0 +1,145 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+from ..gnucash import column_codec
+
+
+class SharedDataFrames(object):
+    """DataFrames shared by many processes as memory-mapped .npy files.
+
+        DataFrames are saved column by column into a "generation" directory inside .directory - every column is
+        a separate .npy file, which is then loaded by every process with mmap_mode="r". Memory-mapped files are
+        backed by the same pages of the OS page cache, so processes attach to the data without copying (and without
+        pickling) it - loaded DataFrames are read-only views of the files.
+
+        Columns are encoded into arrays with column_codec and stored as follows:
+            - datetime columns as int64 nanoseconds (loaded as datetime64[ns] view of the file),
+            - numeric columns as they are,
+            - categorical columns as their integer codes (memory-mapped) and array of categories (loaded into memory,
+                as there are only a few of them),
+            - all other columns as unicode arrays with boolean mask of missing values - those have to be converted
+                into Python objects, so they are copied into every process. Categorical columns should be used for
+                Strings (see GnuCashDBParser categorical argument).
+
+        Every .save creates new generation directory and then replaces .current_path file (containing name of
+        the newest generation) atomically, so processes never load partially written DataFrames. .current_path
+        can be therefore watched (e.g. with GnuCashFileWatcher) to find out that new DataFrames were saved.
+        Only the newest and the previous generation are kept - older ones are removed (memory maps that are still
+        open stay valid).
+
+        Main methods are:
+            - save - saves dictionary of DataFrames as a new generation;
+            - load - returns dictionary of memory-mapped DataFrames of the newest generation;
+            - remove - removes all saved generations.
+    """
+
+    current_file = "current"
+    metadata_file = "metadata.json"
+    generations_kept = 2
+
+    def __init__(self, directory):
+
+        self.directory = directory
+        self.current_path = os.path.join(directory, self.current_file)
+
+    def save(self, dfs):
+        """Saves dictionary of name: DataFrame pairs as a new generation and marks it as the newest one.
+
+            Returns name of the new generation.
+        """
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        generation = self.__next_generation()
+        generation_path = os.path.join(self.directory, generation)
+        os.makedirs(generation_path)
+
+        frames = []
+        for frame_index, (name, df) in enumerate(dfs.items()):
+            columns = []
+            for column_index, column in enumerate(df.columns):
+                key = "frame{frame}_column{column}".format(frame=frame_index, column=column_index)
+                kind = self.__save_column(generation_path, key, df[column])
+                columns.append((column, key, kind))
+            frames.append((name, columns))
+
+        with open(os.path.join(generation_path, self.metadata_file), "w") as f:
+            json.dump({"frames": frames}, f)
+
+        temp_path = self.current_path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(generation)
+        os.replace(temp_path, self.current_path)
+
+        self.__remove_old_generations()
+
+        return generation
+
+    def load(self):
+        """Returns dictionary of name: DataFrame pairs of the newest generation or None if nothing was saved.
+
+            Columns of DataFrames are memory-mapped (read-only) wherever it's possible.
+        """
+
+        if not os.path.isfile(self.current_path):
+            return None
+
+        with open(self.current_path, "r") as f:
+            generation_path = os.path.join(self.directory, f.read().strip())
+
+        with open(os.path.join(generation_path, self.metadata_file), "r") as f:
+            metadata = json.load(f)
+
+        dfs = {}
+        for name, columns in metadata["frames"]:
+            data = {column: self.__load_column(generation_path, key, kind) for column, key, kind in columns}
+            dfs[name] = pd.DataFrame(data, columns=[column for column, key, kind in columns], copy=False)
+
+        return dfs
+
+    def remove(self):
+        """Removes .directory with all saved generations."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __generations(self):
+        """Returns names of saved generations, from the oldest to the newest."""
+        names = [name for name in os.listdir(self.directory) if name.isdigit()]
+        return sorted(names, key=int)
+
+    def __next_generation(self):
+        generations = self.__generations()
+        return str(int(generations[-1]) + 1) if generations else "1"
+
+    def __remove_old_generations(self):
+        for generation in self.__generations()[:-self.generations_kept]:
+            shutil.rmtree(os.path.join(self.directory, generation), ignore_errors=True)
+
+    @staticmethod
+    def __save_column(path, key, series):
+        """Saves arrays representing series (see column_codec.encode_column) into .npy files in path and returns
+            kind of the stored column."""
+
+        kind, arrays = column_codec.encode_column(series)
+        for suffix, array in arrays.items():
+            np.save(os.path.join(path, key + suffix), array)
+
+        return kind
+
+    @staticmethod
+    def __load_column(path, key, kind):
+        """Returns column stored under key in path, converted back to it's original kind.
+
+            Main array of the column is memory-mapped, additional arrays (categories and mask of missing values)
+            are small or converted anyway, so they are loaded into memory.
+        """
+
+        arrays = {}
+        for suffix in column_codec.array_suffixes(kind):
+            mmap_mode = "r" if suffix == "" else None
+            file_path = os.path.join(path, key + suffix + ".npy")
+            arrays[suffix] = np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+
+        return column_codec.decode_column(kind, arrays)
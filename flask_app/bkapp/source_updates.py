@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+from bokeh.models import ColumnDataSource
+
+
+# Patches and Streams are used only if they change less than that fraction of cells of the new data - otherwise
+# the whole data is replaced, as it's cheaper to send (and to apply in the browser).
+max_changed_fraction = 0.5
+
+
+def update_source(source, new_data):
+    """Updates ColumnDataSource source with new_data, sending only the difference between old and new data to
+        the browser whenever it's possible.
+
+        new_data can be either a DataFrame (converted the same way as when it's assigned to ColumnDataSource.data)
+        or a dictionary of column name: values.
+
+        Assigning new data to ColumnDataSource.data sends all columns to the browser, even if only a few rows
+        changed. Therefore, new_data is compared with the current data of the source and the cheapest of those
+        updates is chosen:
+            - "none" - data didn't change and nothing is sent;
+            - "patch" - new_data has the same number of rows as old data (or more rows, which are then streamed to
+                the end of the source) and only changed cells are sent with ColumnDataSource.patch;
+            - "rollover" - new_data has less rows than old data - last rows of the old data are patched to new_data
+                and then ColumnDataSource.stream with rollover removes first rows of the old data (e.g. when
+                the first Month was deselected from the sorted table);
+            - "replace" - new data is assigned to ColumnDataSource.data, when columns (or their dtypes) differ or
+                when patching would change more than max_changed_fraction of cells.
+        Patches are made of contiguous slices of changed rows in every column.
+
+        Returns name of the update that was made.
+    """
+
+    if isinstance(new_data, pd.DataFrame):
+        new_data = ColumnDataSource.from_df(new_data)
+    new_data = {column: np.asarray(values) for column, values in new_data.items()}
+
+    old_data = {column: np.asarray(values) for column, values in source.data.items()}
+
+    if not are_columns_compatible(old_data, new_data):
+        source.data = new_data
+        return "replace"
+
+    old_length = len(next(iter(old_data.values())))
+    new_length = len(next(iter(new_data.values())))
+
+    if new_length == 0:
+        source.data = new_data
+        return "replace"
+
+    # rows of the old data that are compared with (and patched to) the new data
+    if new_length >= old_length:
+        offset = 0
+        compared_length = old_length
+    else:
+        offset = old_length - new_length
+        compared_length = new_length
+
+    patches = {}
+    changed_cells = 0
+    for column, new_values in new_data.items():
+        old_values = old_data[column][offset:offset + compared_length]
+        changed = changed_rows(old_values, new_values[:compared_length])
+        if changed.any():
+            patches[column] = [(slice(offset + start, offset + stop), new_values[start:stop])
+                               for start, stop in contiguous_runs(changed)]
+            changed_cells += int(changed.sum())
+
+    streamed_length = max(new_length - old_length, 0)
+    changed_cells += streamed_length * len(new_data)
+    if changed_cells > max_changed_fraction * new_length * len(new_data):
+        source.data = new_data
+        return "replace"
+
+    if patches:
+        source.patch(patches)
+
+    if new_length > old_length:
+        source.stream({column: values[old_length:] for column, values in new_data.items()})
+    elif new_length < old_length:
+        source.stream({column: values[:0] for column, values in new_data.items()}, rollover=new_length)
+        return "rollover"
+
+    return "patch" if (patches or streamed_length) else "none"
+
+
+def are_columns_compatible(old_data, new_data):
+    """Returns True if old_data and new_data have the same columns of the same kind of dtypes and old_data
+        isn't empty."""
+
+    if set(old_data) != set(new_data) or len(old_data) == 0:
+        return False
+
+    for column, new_values in new_data.items():
+        old_values = old_data[column]
+        if old_values.ndim != 1 or new_values.ndim != 1 or len(old_values) == 0:
+            return False
+        if old_values.dtype.kind != new_values.dtype.kind and "O" not in (old_values.dtype.kind,
+                                                                         new_values.dtype.kind):
+            return False
+
+    return True
+
+
+def changed_rows(old_values, new_values):
+    """Returns boolean array marking rows in which old_values differ from new_values (of the same length).
+        Missing values (e.g. NaN) are treated as equal to each other."""
+
+    if old_values.dtype.kind != new_values.dtype.kind:
+        old_values = old_values.astype(object)
+        new_values = new_values.astype(object)
+
+    changed = np.asarray(old_values != new_values, dtype=bool)
+    if changed.ndim == 0:
+        changed = np.full(len(new_values), bool(changed))
+
+    both_missing = pd.isnull(old_values) & pd.isnull(new_values)
+    return changed & ~both_missing
+
+
+def contiguous_runs(mask):
+    """Returns list of (start, stop) tuples of contiguous runs of True values in boolean mask."""
+
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    return list(zip(starts.tolist(), stops.tolist()))
@@ -0,0 +1,77 @@
+import asyncio
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from bokeh.document import without_document_lock
+
+
+class ViewExecutor(object):
+    """Executes updates of View Gridplots, calculating new data outside of the Bokeh Document lock.
+
+        Callbacks of Grid Elements (e.g. Dropdown change) are called by the Bokeh Server on it's IOLoop while holding
+        the lock of the Document. If DataFrames were filtered and aggregated directly in the callback, one slow
+        update would block not only the Document of the User, but every other session served by the same IOLoop.
+
+        Therefore, every update is split into 2 functions:
+            - calculate - does all DataFrame work (filtering, aggregating) and returns the results without changing
+                anything in the View or in the Grid Elements,
+            - apply - accepts results returned from calculate and updates View attributes and Grid Elements
+                (e.g. ColumnDataSources, Div texts) with them.
+        When the Document is provided, calculate is run in a Thread Pool (shared by all ViewExecutors) from
+        a callback marked with without_document_lock and apply is added to the Document as a next tick callback,
+        so that only updates of Grid Elements are done while the lock is held.
+
+        Every ViewExecutor keeps the number of the latest submitted update. Updates that were superseded by a newer one
+        (e.g. when the User clicks rapidly through Dropdown options) are dropped - their calculate isn't run if it
+        didn't start yet and their apply is never called. Calculate functions should therefore get the whole state
+        of the View that they need as arguments (as it was when the update was submitted), so that the latest
+        update always reflects every choice made by the User.
+
+        When there is no Document (e.g. Gridplot wasn't added to any Document yet), both functions are called
+        immediately, one after another.
+    """
+
+    max_workers = 4
+    pool = None  # ThreadPoolExecutor shared by all ViewExecutors, created on the first use
+
+    def __init__(self):
+        self.latest_update = 0
+
+    def submit(self, calculate, apply, document=None):
+        """Submits update consisting of calculate and apply functions (see class docstring).
+
+            calculate should be a callable without any arguments and apply should accept one argument - results
+            returned by calculate. document should be the Bokeh Document to which updated Grid Elements belong.
+        """
+
+        self.latest_update += 1
+        update = self.latest_update
+
+        if document is None:
+            apply(calculate())
+            return
+
+        def apply_with_lock(results):
+            if update == self.latest_update:
+                apply(results)
+
+        @without_document_lock
+        async def calculate_without_lock():
+            if update != self.latest_update:
+                return
+
+            results = await asyncio.wrap_future(self.get_pool().submit(calculate))
+
+            if update == self.latest_update:
+                document.add_next_tick_callback(partial(apply_with_lock, results))
+
+        document.add_next_tick_callback(calculate_without_lock)
+
+    @classmethod
+    def get_pool(cls):
+        """Returns ThreadPoolExecutor shared by all ViewExecutors (it's created if it doesn't exist yet)."""
+
+        if cls.pool is None:
+            cls.pool = ThreadPoolExecutor(max_workers=cls.max_workers, thread_name_prefix="bkapp_view")
+
+        return cls.pool
@@ -0,0 +1,25 @@
+import uuid
+from flask import session
+from bokeh.embed import server_document
+
+from .bkapp.bkapp_server import BokehServer
+
+
+def bokeh_document(server_addresses, view):
+    """Returns script embedding Bokeh Document of view, requested with the state id of the current Flask session.
+
+        State id is created once for every Flask session (and stored in it), so that all Documents requested from
+        pages of the same User share one state (e.g. Settings chosen on Settings page are used in other pages),
+        while different Users (and browsers) get their own state in BokehServer.
+
+        server_addresses is a list of addresses of Bokeh Servers (one per worker Process of BokehServer) - every
+        User is always served by the same Server (chosen by their state id), as their state is kept in it.
+    """
+
+    if "bokeh_state" not in session:
+        session["bokeh_state"] = uuid.uuid4().hex
+
+    state_id = session["bokeh_state"]
+    server_address = server_addresses[int(state_id, 16) % len(server_addresses)]
+
+    return server_document(server_address + view, arguments={BokehServer.state_argument: state_id})
@@ -1,13 +1,13 @@
 from flask import Blueprint, render_template
-from bokeh.embed import server_document
+from .bokeh_document import bokeh_document
 
-def create_bp(bkapp_server_address):
+def create_bp(bkapp_server_addresses):
 
     bp = Blueprint('category', __name__)
 
     @bp.route('/category/')
     def category():
-        script = server_document(bkapp_server_address + 'category')
+        script = bokeh_document(bkapp_server_addresses, 'category')
         return render_template('category.html', script=script)
 
     return bp
\ No newline at end of file
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+
+# dtype kinds stored as they are; every other column is stored as Strings
+datetime_kind = "M"
+numeric_kinds = "biuf"
+categorical_kind = "category"
+object_kind = "O"
+
+
+def encode_column(series):
+    """Returns kind of the series and dictionary of suffix: np.array pairs representing it, which can be stored
+        without pickling (e.g. in .npz or .npy files) and decoded back with decode_column.
+
+        Datetime columns are stored as int64 nanoseconds and numeric columns as they are. Categorical columns
+        are stored as their integer codes together with unicode array of categories. All other columns
+        are stored as unicode arrays with additional boolean mask of missing (NaN) values.
+        Main array of the column is stored under the empty suffix.
+    """
+
+    kind = series.dtype.kind
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        kind = categorical_kind
+        arrays = {
+            "": series.cat.codes.to_numpy(),
+            "_categories": series.cat.categories.to_numpy(dtype=str)
+        }
+    elif kind == datetime_kind:
+        arrays = {"": series.to_numpy(dtype="datetime64[ns]").view("int64")}
+    elif kind in numeric_kinds:
+        arrays = {"": series.to_numpy()}
+    else:
+        kind = object_kind
+        mask = series.isnull().to_numpy()
+        arrays = {
+            "": series.where(~mask, "").astype(str).to_numpy(dtype=str),
+            "_mask": mask
+        }
+
+    return kind, arrays
+
+
+def array_suffixes(kind):
+    """Returns suffixes of arrays that encode_column creates for the column of kind."""
+
+    if kind == categorical_kind:
+        return "", "_categories"
+    elif kind == datetime_kind or kind in numeric_kinds:
+        return "",
+    else:
+        return "", "_mask"
+
+
+def decode_column(kind, arrays):
+    """Returns column of kind decoded from arrays dictionary (suffix: np.array pairs, see encode_column).
+
+        Datetime, numeric and codes of categorical columns aren't copied, so they stay views of provided arrays
+        (e.g. memory-mapped ones). Categories and String columns are converted into Python objects.
+    """
+
+    if kind == categorical_kind:
+        categories = np.asarray(arrays["_categories"]).astype(object)
+        return pd.Categorical.from_codes(arrays[""], categories=categories)
+    elif kind == datetime_kind:
+        return arrays[""].view("datetime64[ns]")
+    elif kind in numeric_kinds:
+        return arrays[""]
+    else:
+        values = np.asarray(arrays[""]).astype(object)
+        values[np.asarray(arrays["_mask"])] = np.nan
+        return values
@@ -0,0 +1,189 @@
+import os
+import sys
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from . import column_codec
+
+
+class GnuCashDBCache(object):
+    """On-disk cache of DataFrames parsed from GnuCash DB Files.
+
+        Parsed DataFrames are stored column by column in a NumPy .npz bundle (one bundle per GnuCash file),
+        so that they can be loaded back without parsing the book again. Columns are encoded into arrays (and
+        decoded back) with column_codec.
+
+        Every bundle is saved together with the fingerprint of the GnuCash file it was created from:
+            - absolute file path,
+            - size of the file,
+            - modification time of the file,
+            - hash of the content of the file.
+        and settings of the parser (see GnuCashDBParser.cache_settings). DataFrames are loaded only if both of them
+        match - otherwise the cache is treated as stale and the file has to be parsed again.
+
+        Main methods are:
+            - load - returns dictionary of DataFrames for provided file, if they are present in the cache;
+            - save - saves dictionary of DataFrames for provided file;
+            - invalidate - removes cached DataFrames of provided file (or of all files).
+
+        Cache can also be invalidated from the command line by running this module as a script.
+    """
+
+    version = 1
+    file_extension = ".npz"
+    metadata_key = "metadata"
+    hash_chunk_size = 1024 * 1024
+
+    def __init__(self, cache_dir):
+
+        self.cache_dir = cache_dir
+
+    def load(self, file_path, settings=None):
+        """Returns dictionary of account type: DataFrame pairs saved for file_path or None if there is no
+            valid cache for it.
+
+            Cache is valid when the fingerprint of the file and provided settings dict are the same as those saved
+            together with DataFrames.
+        """
+
+        cache_path = self.__get_cache_path(file_path)
+        if not os.path.isfile(cache_path):
+            return None
+
+        with np.load(cache_path, allow_pickle=False) as bundle:
+            metadata = json.loads(str(bundle[self.metadata_key]))
+
+            if metadata["version"] != self.version or metadata["settings"] != self.__jsonify(settings):
+                return None
+            if metadata["fingerprint"] != self.fingerprint(file_path):
+                return None
+
+            dfs = {}
+            for frame_index, (transaction_type, columns) in enumerate(metadata["frames"]):
+                data = {}
+                for column_index, (column, kind) in enumerate(columns):
+                    key = self.__get_column_key(frame_index, column_index)
+                    data[column] = self.__load_column(bundle, key, kind)
+                dfs[transaction_type] = pd.DataFrame(data, columns=[column for column, kind in columns])
+
+        return dfs
+
+    def save(self, file_path, dfs, settings=None):
+        """Saves dictionary of account type: DataFrame pairs for file_path, together with the fingerprint of the
+            file and provided settings dict."""
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        arrays = {}
+        frames = []
+        for frame_index, (transaction_type, df) in enumerate(dfs.items()):
+            columns = []
+            for column_index, column in enumerate(df.columns):
+                key = self.__get_column_key(frame_index, column_index)
+                kind = self.__save_column(arrays, key, df[column])
+                columns.append((column, kind))
+            frames.append((transaction_type, columns))
+
+        metadata = {
+            "version": self.version,
+            "fingerprint": self.fingerprint(file_path),
+            "settings": self.__jsonify(settings),
+            "frames": frames
+        }
+        arrays[self.metadata_key] = np.array(json.dumps(metadata))
+
+        # saved to the temporary file first, so that other processes never load partially written bundle
+        cache_path = self.__get_cache_path(file_path)
+        temp_path = cache_path + ".tmp" + self.file_extension
+        np.savez(temp_path, **arrays)
+        os.replace(temp_path, cache_path)
+
+    def invalidate(self, file_path=None):
+        """Removes cached DataFrames of file_path. If no file_path is provided, whole cache is removed.
+
+            Returns number of removed bundles.
+        """
+
+        if file_path is not None:
+            paths = [self.__get_cache_path(file_path)]
+        elif os.path.isdir(self.cache_dir):
+            paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                     if name.endswith(self.file_extension)]
+        else:
+            paths = []
+
+        removed = 0
+        for path in paths:
+            if os.path.isfile(path):
+                os.remove(path)
+                removed += 1
+
+        return removed
+
+    def fingerprint(self, file_path):
+        """Returns dictionary describing the current state of file_path: absolute path, size, modification time
+            and hash of the content."""
+
+        stat = os.stat(file_path)
+
+        content_hash = hashlib.blake2b()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(self.hash_chunk_size), b""):
+                content_hash.update(chunk)
+
+        fingerprint = {
+            "path": os.path.abspath(file_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": content_hash.hexdigest()
+        }
+
+        return fingerprint
+
+    def __get_cache_path(self, file_path):
+        """Returns path of the bundle for file_path - name of the bundle is the hash of absolute file path."""
+
+        name = hashlib.blake2b(os.path.abspath(file_path).encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.cache_dir, name + self.file_extension)
+
+    @staticmethod
+    def __get_column_key(frame_index, column_index):
+        return "frame{frame}_column{column}".format(frame=frame_index, column=column_index)
+
+    @staticmethod
+    def __save_column(arrays, key, series):
+        """Inserts arrays representing series (see column_codec.encode_column) into arrays dict and returns kind
+            of the stored column."""
+
+        kind, column_arrays = column_codec.encode_column(series)
+        for suffix, array in column_arrays.items():
+            arrays[key + suffix] = array
+
+        return kind
+
+    @staticmethod
+    def __load_column(bundle, key, kind):
+        """Returns column array stored under key in bundle, converted back to it's original kind."""
+
+        arrays = {suffix: bundle[key + suffix] for suffix in column_codec.array_suffixes(kind)}
+        return column_codec.decode_column(kind, arrays)
+
+    @staticmethod
+    def __jsonify(settings):
+        """Returns settings as they would be read back from JSON (e.g. tuples become lists)."""
+        return json.loads(json.dumps(settings))
+
+
+# Script for invalidating the cache.
+# Cache directory can be provided as the first argument; otherwise default cache of flask_app is invalidated.
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        cache_dir = sys.argv[1]
+    else:
+        root_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+        cache_dir = os.path.join(root_path, "instance", "gnucash_cache")
+
+    removed_bundles = GnuCashDBCache(cache_dir).invalidate()
+    print("Removed {n} cached file(s) from {cache_dir}".format(n=removed_bundles, cache_dir=cache_dir))
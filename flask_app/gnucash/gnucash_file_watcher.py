@@ -0,0 +1,89 @@
+import os
+import threading
+import traceback
+
+
+class GnuCashFileWatcher(object):
+    """Watcher of GnuCash DB File, calling provided callback when the file changes.
+
+        File is polled in a separate (daemon) Thread every interval seconds - its modification time and size are
+        compared with those seen before. Polling is used instead of OS notifications (e.g. inotify), as it works
+        the same way on every platform and file system (including network drives) and doesn't need any additional
+        dependencies.
+
+        GnuCash saves changes in several writes, so the change is reported only when the file stays the same for
+        one whole interval - this way callback isn't called in the middle of saving and is called only once for
+        a single save.
+
+        Callback is called without any arguments in the watcher Thread, so it can safely do time-consuming work
+        (e.g. parsing the file) - exceptions raised in the callback are printed and the watcher keeps running.
+
+        Main methods are:
+            - start - starts watching the file in a separate Thread;
+            - stop - stops the watcher Thread;
+            - check - checks (once) if the file changed since the last check.
+    """
+
+    def __init__(self, file_path, callback, interval=1.0):
+
+        self.file_path = file_path
+        self.callback = callback
+        self.interval = interval
+
+        # State Variables
+        self.signature = self.__get_signature()  # signature of the file that was last reported
+        self.pending_signature = self.signature  # signature of the file seen in the last check
+
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        """Starts watching the file in a separate daemon Thread."""
+
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.__watch, name="GnuCashFileWatcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops the watcher Thread and waits for it to finish."""
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def check(self):
+        """Returns True if the file changed since it was last reported and didn't change since the previous check,
+            False otherwise."""
+
+        signature = self.__get_signature()
+        changed = signature is not None and signature != self.signature and signature == self.pending_signature
+
+        if changed:
+            self.signature = signature
+        self.pending_signature = signature
+
+        return changed
+
+    def __watch(self):
+        """Loop of the watcher Thread - checks the file every .interval seconds and calls .callback when it
+            changed."""
+
+        while not self.stop_event.wait(self.interval):
+            if self.check():
+                try:
+                    self.callback()
+                except Exception:
+                    print("Reloading {file} failed:".format(file=self.file_path))
+                    traceback.print_exc()
+
+    def __get_signature(self):
+        """Returns tuple of modification time and size of the file or None if the file doesn't exist (e.g. when it
+            is being replaced)."""
+
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
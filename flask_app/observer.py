@@ -1,4 +1,6 @@
 # https://stackoverflow.com/questions/48336820/using-decorators-to-implement-observer-pattern-in-python3
+import threading
+from contextlib import contextmanager
 
 
 class Observer(object):
@@ -6,20 +8,83 @@ class Observer(object):
 
         Object exposes methods:
             - register - used to register given function as a callback
-            - notify - upon calling, calls all callbacks that were registered.
+            - notify - upon calling, calls all callbacks that were registered
+            - notify_change - called by watched properties; calls notify immediately or postpones it until the
+                end of the transaction
+            - transaction - context manager in which changes of watched properties are batched
+            - flush - calls notify for all postponed changes.
 
         Additionally, Object has classmethod: watched_property. This is an implementation of @property decorator,
-        that calls .notify function of the observer upon change of the property (setting new values).
+        that calls .notify_change function of the observer upon change of the property (setting new values).
+
+        Callbacks are called with the object to notify and dictionary of changes {key: value}. Outside of the
+        transaction, every change is notified immediately, as a dictionary with one key. Changes made inside of
+        the transaction context manager are postponed until the outermost transaction ends and are then notified
+        in one batch for every object to notify - if some property is set several times, only it's last value
+        is notified. Keys are ordered by the first change of the property.
     """
 
     def __init__(self):
+
         self.callbacks = []
 
+        # Transaction Variables
+        self.pending_changes = {}  # object to notify: {key: value} of postponed changes
+        self.transaction_depth = 0
+        self.lock = threading.RLock()
+
     def notify(self, *args, **kwargs):
         """Function that is called upon being triggered by the Event."""
         for callback in self.callbacks:
             callback(*args, **kwargs)
 
+    def notify_change(self, obj_notify, key, value):
+        """Function that is called upon change of the watched property key to value.
+
+            If there is no transaction in progress, notify is called immediately with {key: value} changes.
+            Otherwise, the change is added to the postponed changes of obj_notify (replacing previous postponed
+            change of the same key) and it is notified at the end of the transaction.
+        """
+
+        with self.lock:
+            postpone = self.transaction_depth > 0
+            if postpone:
+                self.pending_changes.setdefault(obj_notify, {})[key] = value
+
+        if not postpone:
+            self.notify(obj_notify, {key: value})
+
+    @contextmanager
+    def transaction(self):
+        """Context manager in which changes of watched properties are postponed and batched.
+
+            Transactions can be nested - postponed changes are notified when the outermost transaction ends
+            (even if it ends with an Exception).
+        """
+
+        with self.lock:
+            self.transaction_depth += 1
+
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.transaction_depth -= 1
+                is_outermost = self.transaction_depth == 0
+
+            if is_outermost:
+                self.flush()
+
+    def flush(self):
+        """Calls notify once for every object with postponed changes (with all of it's changes) and clears them."""
+
+        with self.lock:
+            pending_changes = self.pending_changes
+            self.pending_changes = {}
+
+        for obj_notify, changes in pending_changes.items():
+            self.notify(obj_notify, changes)
+
     def register(self, callback):
         """Decorator used to register functions as callbacks."""
         self.callbacks.append(callback)
@@ -37,9 +102,10 @@ class Observer(object):
             Function creates new key: _key and uses it to set actual attributes.
             Getter is a standard getattr.
 
-            Setter sets new value to the actual_key attribute and additionally, triggers notify function
-            of the observer. However, notify function isn't called by the object that has the observable properties,
-            but rather some other object to which exists reference in the Observable object.
+            Setter sets new value to the actual_key attribute and additionally, triggers notify_change function
+            of the observer (which calls notify immediately or postpones it until the end of the transaction - see
+            class docstring). However, notify function isn't called by the object that has the observable
+            properties, but rather some other object to which exists reference in the Observable object.
             As long as Object that will call notify function is referenced anywhere in the Observable object, it
             should work fine.
         """
@@ -52,6 +118,6 @@ class Observer(object):
             obs = getattr(obj, observer)
             setattr(obj, actual_key, value)
             obj_notify = getattr(obj, obj_to_notify)
-            obs.notify(obj_notify, key, value)
+            obs.notify_change(obj_notify, key, value)
 
         return property(fget=getter, fset=setter)
@@ -1,14 +1,14 @@
 from flask import Blueprint, render_template
-from bokeh.embed import server_document
+from .bokeh_document import bokeh_document
 
 
-def create_bp(bkapp_server_address):
+def create_bp(bkapp_server_addresses):
 
     bp = Blueprint('overview', __name__)
 
     @bp.route('/')
     def overview():
-        script = server_document(bkapp_server_address + 'overview')
+        script = bokeh_document(bkapp_server_addresses, 'overview')
         return render_template('overview.html', script=script)
 
     return bp
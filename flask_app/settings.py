@@ -1,10 +1,10 @@
 from flask import Blueprint, render_template, request
 
-from bokeh.embed import server_document
+from .bokeh_document import bokeh_document
 
 
 
-def create_bp(file_path, bkapp_server_address):
+def create_bp(file_path, bkapp_server_addresses):
 
     bp = Blueprint('settings', __name__)
 
@@ -16,8 +16,8 @@ def create_bp(file_path, bkapp_server_address):
             print(address)
 
         # Bokeh Gridplots
-        categories = server_document(bkapp_server_address + 'settings_categories')
-        month_range = server_document(bkapp_server_address + 'settings_month_range')
+        categories = bokeh_document(bkapp_server_addresses, 'settings_categories')
+        month_range = bokeh_document(bkapp_server_addresses, 'settings_month_range')
 
         return render_template('settings.html', categories=categories, month_range=month_range, file_path=file_path)
 
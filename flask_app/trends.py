@@ -1,13 +1,13 @@
 from flask import Blueprint, render_template
-from bokeh.embed import server_document
+from .bokeh_document import bokeh_document
 
-def create_bp(bkapp_server_address):
+def create_bp(bkapp_server_addresses):
 
     bp = Blueprint('trends', __name__)
 
     @bp.route('/trends/')
     def trends():
-        script = server_document(bkapp_server_address + 'trends')
+        script = bokeh_document(bkapp_server_addresses, 'trends')
         return render_template('trends.html', script = script)
 
     return bp
@@ -1,7 +1,10 @@
 import pytest
 import piecash
 import tempfile
+import shutil
 import os
+import numpy as np
+import pandas as pd
 from datetime import date, datetime
 from decimal import Decimal
 from flask_app.bkapp.color_map import ColorMap
@@ -9,11 +12,15 @@ from flask_app.bkapp.color_map import ColorMap
 from flask_app.observer import Observer
 from flask_app.gnucash.gnucash_example_creator import GnucashExampleCreator
 from flask_app.gnucash.gnucash_db_parser import GnuCashDBParser
+from flask_app.gnucash.gnucash_db_cache import GnuCashDBCache
 from flask_app.bkapp.bk_category import Category
 from flask_app.bkapp.bk_overview import Overview
 from flask_app.bkapp.bk_trends import Trends
 from flask_app.bkapp.bkapp import BokehApp
+from flask_app.bkapp.bkapp_data import BokehAppData
+from flask_app.bkapp.bkapp_server import BokehServer
 from flask_app.bkapp.bk_settings import Settings
+from flask_app.bkapp.aggregate_cube import AggregateCube
 
 # ========== gnucash_example_creator ========== #
 
@@ -90,7 +97,12 @@ def gnucash_db_parser_example_book(example_book_path):
     return gdbp
 
 
-def create_simple_book(currency, file_path):
+@pytest.fixture
+def expense_df(gnucash_db_parser_example_book):
+    return gnucash_db_parser_example_book.get_expenses_df()
+
+
+def create_simple_book(currency, file_path, with_income=True, with_expenses=True):
     book = piecash.create_book(currency=currency, sqlite_file=file_path, overwrite=True)
 
     curr = book.default_currency
@@ -134,6 +146,12 @@ def create_simple_book(currency, file_path):
         (date(year=2019, month=1, day=1), inc2, acc2, "Salary", Decimal("1500"))
     ]
 
+    if not with_income:
+        income_transactions = []
+    if not with_expenses:
+        simple_transactions = []
+        shop_transactions = []
+
     # add 2 income transactions
     for income_tr in income_transactions:
         tr = piecash.Transaction(
@@ -192,11 +210,49 @@ def simple_book_path():
     os.unlink(example_path)
 
 
+@pytest.fixture
+def expenses_only_book_path():
+    """Returns path to simple piecash book with Expense transactions, but without any Income transactions."""
+
+    example_fd, example_path = tempfile.mkstemp()
+    create_simple_book("PLN", example_path, with_income=False)
+
+    yield example_path
+
+    os.close(example_fd)
+    os.unlink(example_path)
+
+
+@pytest.fixture
+def income_only_book_path():
+    """Returns path to simple piecash book with Income transactions, but without any Expense transactions."""
+
+    example_fd, example_path = tempfile.mkstemp()
+    create_simple_book("PLN", example_path, with_expenses=False)
+
+    yield example_path
+
+    os.close(example_fd)
+    os.unlink(example_path)
+
+
 @pytest.fixture
 def gnucash_db_parser_simple_book(simple_book_path):
     gdbp = GnuCashDBParser(simple_book_path, category_sep=category_sep_for_test())
     return gdbp
 
+# ========== gnucash_db_cache ========== #
+
+
+@pytest.fixture
+def gnucash_db_cache():
+    """Test GnuCashDBCache Object, with cache saved in temporary directory"""
+    cache_dir = tempfile.mkdtemp()
+
+    yield GnuCashDBCache(cache_dir)
+
+    shutil.rmtree(cache_dir)
+
 # ========== variables ========== #
 
 
@@ -402,14 +458,91 @@ def bk_trends_initialized(bk_trends):
 # ========== bkapp ========== #
 
 
+def bkapp_data(expense_df, income_df, price_scale=1):
+    """Returns BokehAppData created from expense_df and income_df with settings used in tests."""
+    return BokehAppData(expense_df, income_df, bk_column_mapping(), month_format(), datetime(year=2019, month=2, day=1),
+                        category_sep_for_test(), price_scale)
+
+
 @pytest.fixture
 def bkapp(gnucash_db_parser_example_book):
 
-    bkapp = BokehApp(gnucash_db_parser_example_book.get_expenses_df(), gnucash_db_parser_example_book.get_income_df(),
-                     bk_column_mapping(), month_format(), datetime(year=2019, month=2, day=1), category_sep_for_test())
+    bkapp = BokehApp(bkapp_data(gnucash_db_parser_example_book.get_expenses_df(),
+                                gnucash_db_parser_example_book.get_income_df()))
 
     return bkapp
 
+
+@pytest.fixture
+def bkapp_categorical(example_book_path):
+    """Returns BokehApp object created from DataFrames with Categorical String columns."""
+
+    gdbp = GnuCashDBParser(file_path=example_book_path, category_sep=category_sep_for_test(), categorical=True)
+    bkapp = BokehApp(bkapp_data(gdbp.get_expenses_df(), gdbp.get_income_df()))
+
+    return bkapp
+
+
+@pytest.fixture
+def bkapp_without_income(expenses_only_book_path):
+    """Returns BokehApp object created from a book without any Income (empty Income DataFrame)."""
+
+    gdbp = GnuCashDBParser(file_path=expenses_only_book_path, category_sep=category_sep_for_test())
+    bkapp = BokehApp(bkapp_data(gdbp.get_expenses_df(), gdbp.get_income_df()))
+
+    return bkapp
+
+
+@pytest.fixture
+def bkapp_price_scale(example_book_path):
+    """Returns BokehApp object created from DataFrames with prices stored as int64 cents."""
+
+    gdbp = GnuCashDBParser(file_path=example_book_path, category_sep=category_sep_for_test(), price_scale=100)
+    bkapp = BokehApp(bkapp_data(gdbp.get_expenses_df(), gdbp.get_income_df(), price_scale=100))
+
+    return bkapp
+
+@pytest.fixture
+def bkapp_server(gnucash_db_parser_example_book):
+    """Returns BokehServer (not started) serving example DataFrames."""
+    return BokehServer(9090, bk_column_mapping(), gnucash_db_parser_example_book.get_expenses_df(),
+                       gnucash_db_parser_example_book.get_income_df(), datetime(year=2019, month=2, day=1),
+                       month_format(), category_sep_for_test())
+
+# ========== aggregate_cube ========== #
+
+
+@pytest.fixture
+def aggregate_cube(gnucash_db_parser_example_book):
+    """Returns AggregateCube of example expenses DataFrame, with both Category Columns ("category" matched by exact
+    values and "all" as the tree of Categories)."""
+
+    mapping = bk_column_mapping()
+    category_columns = {mapping["category"]: None, mapping["all"]: category_sep_for_test()}
+    cube = AggregateCube(gnucash_db_parser_example_book.get_expenses_df(), mapping["monthyear"], mapping["date"],
+                         mapping["price"], category_columns)
+
+    return cube
+
+
+# ========== category_tree and category_index ========== #
+
+
+@pytest.fixture
+def category_series():
+    """Returns Series of extended Categories (with a missing value) used by CategoryTree and CategoryIndex tests."""
+
+    return pd.Series([
+        "Expenses:Family",
+        "Expenses:Family:Grocery:Bread",
+        "Expenses:Family Trip",
+        "Other Expenses:Family",
+        "Expenses:Car (Petrol)",
+        np.nan,
+        "Expenses:Family:Grocery:Bread",
+        "Expenses:Family:Grocery:Fruits"
+    ])
+
 # ========== bk_settings ========== #
 
 
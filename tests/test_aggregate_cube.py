@@ -0,0 +1,291 @@
+import pytest
+import threading
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+from flask_app.bkapp.aggregate_cube import AggregateCube
+
+
+def assert_series_close(actual, expected):
+    assert actual.index.tolist() == expected.index.tolist()
+    assert np.allclose(actual.to_numpy(), expected.to_numpy())
+
+
+def test_totals_without_filters(aggregate_cube):
+    """Testing if aggregates of not filtered AggregateCube are the same as aggregates of the whole DataFrame."""
+
+    df = aggregate_cube.source_dataframe
+    price = aggregate_cube.price
+    category, all_categories = list(aggregate_cube.category_columns)
+
+    assert aggregate_cube.dataframe is df
+    assert_series_close(aggregate_cube.month_totals(), df.groupby(aggregate_cube.monthyear)[price].sum())
+    assert_series_close(aggregate_cube.date_totals(), df.groupby(aggregate_cube.date)[price].sum())
+    assert_series_close(aggregate_cube.category_totals(category), df.groupby(category)[price].sum())
+    assert_series_close(aggregate_cube.category_totals(all_categories), df.groupby(all_categories)[price].sum())
+
+
+@pytest.mark.parametrize(
+    ("column_index", "categories", "expected_sum"),
+    (
+            (0, ["Bread"], 2789.28),
+            (0, ["Bread", "Rent"], 26789.28),
+            (0, ["Expenses"], 0),
+            (1, ["Expenses:Family:Grocery:Bread"], 2789.28),
+            (1, ["Expenses:Family:Grocery:Bread:"], 0),
+            (1, ["Expenses:Family:Grocery"], None),
+            (1, ["Expenses"], None)
+    )
+)
+def test_filtered_categories(aggregate_cube, column_index, categories, expected_sum):
+    """Testing if AggregateCube filtered to categories includes only rows of those categories (and their
+    descendants in the Category tree)."""
+
+    df = aggregate_cube.source_dataframe
+    price = aggregate_cube.price
+    column = list(aggregate_cube.category_columns)[column_index]
+
+    if expected_sum is None:
+        rows = df[column].apply(lambda x: any(x == c or x.startswith(c + ":") for c in categories))
+        expected_sum = df[rows][price].sum()
+
+    cube = aggregate_cube.filtered(categories=categories, category_column=column)
+
+    assert np.isclose(cube.dataframe[price].sum(), expected_sum)
+    assert np.isclose(cube.month_totals().sum(), expected_sum)
+    assert np.isclose(cube.date_totals().sum(), expected_sum)
+    assert_series_close(cube.month_totals(), cube.dataframe.groupby(cube.monthyear)[price].sum())
+
+
+@pytest.mark.parametrize(
+    ("months", "excluded_categories"),
+    (
+            (["2019-01", "2019-02"], []),
+            (["2019-03"], ["Expenses:Family:Grocery"]),
+            ([], ["Expenses"]),
+            (["2019-05", "2019-12"], ["Expenses:Family:Grocery:Bread", "Expenses:Car"])
+    )
+)
+def test_filtered_months_and_excluded_categories(aggregate_cube, months, excluded_categories):
+    """Testing if AggregateCube filtered to months and without excluded categories has the same aggregates as
+    grouped filtered DataFrame."""
+
+    price = aggregate_cube.price
+    category, all_categories = list(aggregate_cube.category_columns)
+
+    cube = aggregate_cube.filtered(months=months, excluded_categories=excluded_categories,
+                                   category_column=all_categories)
+    df = cube.dataframe
+
+    assert set(df[cube.monthyear]) <= set(months)
+    for excluded in excluded_categories:
+        assert not ((df[all_categories] == excluded) | df[all_categories].str.startswith(excluded + ":")).any()
+
+    assert_series_close(cube.month_totals(), df.groupby(cube.monthyear)[price].sum())
+    assert_series_close(cube.date_totals(), df.groupby(cube.date)[price].sum())
+    assert_series_close(cube.category_totals(category), df.groupby(category)[price].sum())
+
+
+def test_filtered_chained(aggregate_cube):
+    """Testing if filtering already filtered AggregateCube narrows it further and doesn't change the original
+    AggregateCube."""
+
+    category = list(aggregate_cube.category_columns)[0]
+
+    first = aggregate_cube.filtered(months=["2019-01", "2019-02"])
+    second = first.filtered(months=["2019-02", "2019-03"], categories=["Bread"], category_column=category)
+
+    assert set(second.dataframe[second.monthyear]) == {"2019-02"}
+    assert set(second.dataframe[category]) == {"Bread"}
+    assert set(first.dataframe[first.monthyear]) == {"2019-01", "2019-02"}
+    assert aggregate_cube.month_mask.all() and aggregate_cube.leaf_mask.all()
+
+
+@pytest.mark.parametrize(
+    ("column", "ascending"),
+    (
+            ("Price", True),
+            ("Price", False),
+            ("Date", True),
+            ("Shop", True)
+    )
+)
+def test_sorted_rows(aggregate_cube, column, ascending):
+    """Testing if sorted_rows of AggregateCube (and of Cube filtered from it) returns positions of all rows included
+    in the Cube, sorted by column."""
+
+    df = aggregate_cube.source_dataframe
+    category = list(aggregate_cube.category_columns)[0]
+    filtered = aggregate_cube.filtered(months=["2019-01", "2019-03"], categories=["Bread", "Rent"],
+                                       category_column=category)
+
+    for cube in [aggregate_cube, filtered]:
+        rows = cube.sorted_rows(column, ascending)
+        expected = cube.dataframe[column].sort_values(ascending=ascending, na_position="first" if ascending else "last")
+
+        assert sorted(rows.tolist()) == sorted(df.index.get_indexer(cube.dataframe.index).tolist())
+        assert df.iloc[rows][column].fillna("").tolist() == expected.fillna("").tolist()
+
+    assert filtered.sort_orders is aggregate_cube.sort_orders
+
+
+def test_memoized(aggregate_cube):
+    """Testing if results memoized in AggregateCube are calculated only once and aren't shared with filtered
+    Cubes."""
+
+    calls = []
+
+    def calculate():
+        calls.append(1)
+        return aggregate_cube.month_totals()
+
+    first = aggregate_cube.memoized("totals", calculate)
+    second = aggregate_cube.memoized("totals", calculate)
+    filtered = aggregate_cube.filtered(months=["2019-01"])
+
+    assert first is second
+    assert len(calls) == 1
+    assert filtered.memoized("totals", filtered.month_totals).index.tolist() == ["2019-01"]
+    assert aggregate_cube.memoized("totals", calculate) is first
+
+
+def test_memoized_threads(aggregate_cube):
+    """Testing if results memoized in AggregateCube and sorted orders are calculated once when many Threads
+    ask for them at the same time."""
+
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def calculate():
+        calls.append(1)
+        time.sleep(0.01)
+        return aggregate_cube.month_totals()
+
+    def run():
+        barrier.wait()
+        return aggregate_cube.memoized("totals", calculate), aggregate_cube.sorted_rows("Category")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = [future.result() for future in [executor.submit(run) for _ in range(8)]]
+
+    assert len(calls) == 1
+    assert all(totals is results[0][0] for totals, rows in results)
+    assert all(np.array_equal(rows, results[0][1]) for totals, rows in results)
+    assert list(aggregate_cube.sort_orders) == ["Category"]
+
+
+@pytest.mark.parametrize(
+    ("months", "categories"),
+    (
+            (None, None),
+            (["2019-01", "2019-03"], None),
+            (["2019-02"], ["Bread", "Rent"]),
+            ([], None)
+    )
+)
+def test_statistics(aggregate_cube, months, categories):
+    """Testing if month_statistics and date_statistics of filtered AggregateCube are the same as describe() of
+    month_totals and date_totals and if statistics are shared between Cubes filtered by months."""
+
+    category = list(aggregate_cube.category_columns)[0]
+    cube = aggregate_cube
+    if categories is not None:
+        cube = cube.filtered(categories=categories, category_column=category)
+    cube = cube.filtered(months=months)
+
+    for actual, totals in ((cube.month_statistics(), cube.month_totals()),
+                           (cube.date_statistics(), cube.date_totals())):
+        expected = totals.describe()
+        assert actual["count"] == expected["count"]
+        for stat, pandas_stat in (("mean", "mean"), ("std", "std"), ("min", "min"), ("median", "50%"),
+                                  ("max", "max")):
+            assert np.isclose(actual[stat], expected[pandas_stat], equal_nan=True)
+
+    assert cube.grouped_statistics is aggregate_cube.grouped_statistics
+
+
+@pytest.mark.parametrize(
+    ("months", "excluded_categories"),
+    (
+            (None, None),
+            (["2019-01", "2019-03"], ["Bread"])
+    )
+)
+def test_category_rollup(aggregate_cube, months, excluded_categories):
+    """Testing if sums and counts of every node of the Category tree in every month are the same as those of rows
+    of the node and it's descendants."""
+
+    category, all_categories = list(aggregate_cube.category_columns)
+    cube = aggregate_cube.filtered(months=months, excluded_categories=excluded_categories, category_column=category)
+    df = cube.dataframe
+
+    sums, counts = cube.category_rollup(all_categories)
+
+    assert sums.columns.tolist() == sorted(df[cube.monthyear].unique())
+    assert "Expenses:Family" in sums.index
+    for node in sums.index:
+        rows = (df[all_categories] == node) | df[all_categories].str.startswith(node + ":")
+        grouped = df[rows].groupby(cube.monthyear)[cube.price]
+        expected_sums = grouped.sum().reindex(sums.columns, fill_value=0)
+        expected_counts = grouped.size().reindex(sums.columns, fill_value=0)
+
+        assert np.allclose(sums.loc[node].to_numpy(), expected_sums.to_numpy())
+        assert counts.loc[node].tolist() == expected_counts.tolist()
+
+    assert cube.category_rollup(all_categories) is cube.category_rollup(all_categories)
+
+
+def test_categorical_columns(aggregate_cube):
+    """Testing if AggregateCube created from DataFrame with categorical columns has the same aggregates."""
+
+    category, all_categories = list(aggregate_cube.category_columns)
+    columns = [category, all_categories, aggregate_cube.monthyear]
+    df = aggregate_cube.source_dataframe.astype({column: "category" for column in columns})
+
+    cube = AggregateCube(df, aggregate_cube.monthyear, aggregate_cube.date, aggregate_cube.price,
+                         aggregate_cube.category_columns)
+
+    assert_series_close(cube.month_totals(), aggregate_cube.month_totals())
+    assert_series_close(cube.category_totals(category), aggregate_cube.category_totals(category))
+    assert_series_close(cube.filtered(categories=["Expenses:Family"], category_column=all_categories).month_totals(),
+                        aggregate_cube.filtered(categories=["Expenses:Family"],
+                                                category_column=all_categories).month_totals())
+
+
+def test_price_scale(aggregate_cube):
+    """Testing if AggregateCube of integer prices (cents) with price_scale returns the same results as AggregateCube
+    of float prices."""
+
+    category, all_categories = list(aggregate_cube.category_columns)
+    df = aggregate_cube.source_dataframe.copy()
+    df[aggregate_cube.price] = (df[aggregate_cube.price] * 100).round().astype(np.int64)
+
+    cube = AggregateCube(df, aggregate_cube.monthyear, aggregate_cube.date, aggregate_cube.price,
+                         aggregate_cube.category_columns, price_scale=100)
+
+    for scaled, expected in ((cube, aggregate_cube), (cube.filtered(months=["2019-01", "2019-02"]),
+                                                      aggregate_cube.filtered(months=["2019-01", "2019-02"]))):
+        assert_series_close(scaled.month_totals(), expected.month_totals())
+        assert_series_close(scaled.date_totals(), expected.date_totals())
+        assert_series_close(scaled.category_totals(category), expected.category_totals(category))
+        assert np.allclose(scaled.category_rollup(all_categories)[0], expected.category_rollup(all_categories)[0])
+
+        for actual, expected_statistics in ((scaled.month_statistics(), expected.month_statistics()),
+                                            (scaled.date_statistics(), expected.date_statistics())):
+            assert actual["count"] == expected_statistics["count"]
+            assert np.allclose([actual[name] for name in ("mean", "std", "min", "median", "max")],
+                               [expected_statistics[name] for name in ("mean", "std", "min", "median", "max")])
+
+
+def test_empty_dataframe(aggregate_cube):
+    """Testing if AggregateCube of DataFrame without rows returns empty aggregates."""
+
+    category = list(aggregate_cube.category_columns)[0]
+    cube = AggregateCube(aggregate_cube.source_dataframe.iloc[:0], aggregate_cube.monthyear, aggregate_cube.date,
+                         aggregate_cube.price, {category: None})
+
+    assert len(cube.month_totals()) == 0
+    assert len(cube.date_totals()) == 0
+    assert len(cube.category_totals(category)) == 0
+    assert cube.filtered(months=["2019-01"]).dataframe.shape[0] == 0
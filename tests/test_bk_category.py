@@ -3,7 +3,7 @@ import pytest
 import numpy as np
 from bokeh.models.widgets import Div
 from bokeh.models.plots import Plot
-from bokeh.models import ColumnDataSource, DataTable, Select
+from bokeh.models import ColumnDataSource, DataTable, Select, Button
 from math import isclose
 
 
@@ -46,7 +46,11 @@ def test_initialize_grid_elements(bk_category):
         (bk_category.g_line_plot, Plot),
         (bk_category.g_dropdown, Select),
         (bk_category.g_product_histogram, DataTable),
-        (bk_category.g_transactions, DataTable)
+        (bk_category.g_transactions, DataTable),
+        (bk_category.g_transactions_sort, Select),
+        (bk_category.g_transactions_previous, Button),
+        (bk_category.g_transactions_pages, Div),
+        (bk_category.g_transactions_next, Button)
     ]
     source_elems = [
         bk_category.g_line_plot,
@@ -348,9 +352,93 @@ def test_update_transactions_table(bk_category_initialized, category, chosen_mon
     bk_category_initialized._Category__update_chosen_months_and_category_dataframe()
     bk_category_initialized._Category__update_transactions_table()
 
+    rows = bk_category_initialized.transactions_rows
+    actual_sum = bk_category_initialized.original_df.iloc[rows][bk_category_initialized.price].sum()
     source_data_values = bk_category_initialized.grid_source_dict[bk_category_initialized.g_transactions].data
-    actual_count = len(source_data_values[bk_category_initialized.product])
-    actual_sum = sum(source_data_values[bk_category_initialized.price])
+    page_count = len(source_data_values[bk_category_initialized.product])
 
-    assert actual_count == expected_count
+    assert len(rows) == expected_count
     assert isclose(actual_sum, expected_sum, rel_tol=1e-02)
+    assert page_count == min(bk_category_initialized.transactions_page_size, expected_count)
+    assert bk_category_initialized.transactions_page == 0
+
+
+def test_update_transactions_page(bk_category_initialized):
+    """Testing if changing pages of the All Transactions DataTable loads consecutive rows into the ColumnDataSource
+    and that pages outside of the range are clipped."""
+
+    view = bk_category_initialized
+    view.transactions_page_size = 50
+    view.chosen_category = "Bread"
+    view._Category__update_chosen_months_and_category_dataframe()
+    view._Category__update_transactions_table()
+
+    source = view.grid_source_dict[view.g_transactions]
+    count = view.chosen_months_and_category_df.shape[0]
+    last_page = (count - 1) // view.transactions_page_size
+
+    prices = []
+    for page in range(last_page + 1):
+        view._Category__update_transactions_page(page)
+        prices.extend(source.data[view.price])
+
+    assert len(prices) == count
+    assert isclose(sum(prices), view.chosen_months_and_category_df[view.price].sum(), rel_tol=1e-09)
+    assert view.grid_elem_dict[view.g_transactions_next].disabled
+    assert not view.grid_elem_dict[view.g_transactions_previous].disabled
+    assert view.grid_elem_dict[view.g_transactions_pages].text == view.transactions_pages.format(
+        first=last_page * view.transactions_page_size + 1, last=count, count=count)
+
+    view._Category__update_transactions_page(last_page + 5)
+    assert view.transactions_page == last_page
+
+    view._Category__update_transactions_page(-1)
+    assert view.transactions_page == 0
+    assert view.grid_elem_dict[view.g_transactions_previous].disabled
+
+
+@pytest.mark.parametrize(
+    ("sort", "column", "ascending"),
+    (
+            ("Date (oldest first)", "Date", True),
+            ("Date (newest first)", "Date", False),
+            ("Price (highest first)", "Price", False),
+            ("Product (A-Z)", "Product", True)
+    )
+)
+def test_transactions_sort_callback(bk_category, bk_categories_simple, sort, column, ascending):
+    """Testing if changing value of Transactions Sort Select sorts all rows of chosen Category, not only
+    the rows of the page shown."""
+
+    df = bk_category.original_df
+    bk_category.gridplot(df, bk_categories_simple)
+    bk_category.grid_elem_dict[bk_category.g_dropdown].value = "Bread"
+    bk_category.grid_elem_dict[bk_category.g_transactions_sort].value = sort
+
+    sorted_values = df.iloc[bk_category.transactions_rows][column]
+    expected_values = df[df[bk_category.category] == "Bread"][column].sort_values(ascending=ascending)
+    page_values = bk_category.grid_source_dict[bk_category.g_transactions].data[column]
+
+    assert bk_category.transactions_sort == sort
+    assert sorted_values.tolist() == expected_values.tolist()
+    assert np.array_equal(np.asarray(page_values), expected_values.to_numpy()[:bk_category.transactions_page_size])
+
+
+def test_dropdown_callback(bk_category, bk_categories_simple):
+    """Testing if changing value of the Dropdown updates Category gridplot the same way as
+    update_grid_on_chosen_category_change."""
+
+    df = bk_category.original_df
+    bk_category.gridplot(df, bk_categories_simple)
+
+    category = "Bread"
+    bk_category.grid_elem_dict[bk_category.g_dropdown].value = category
+
+    expected_df = df[df[bk_category.category] == category]
+
+    assert bk_category.chosen_category == category
+    assert bk_category.chosen_category_df.equals(expected_df)
+    assert bk_category.grid_elem_dict[bk_category.g_category_title].text == category
+    assert bk_category.chosen_months_and_category_df.equals(expected_df)
+    assert isclose(bk_category.original_df.iloc[bk_category.transactions_rows][bk_category.price].sum(),
+                   expected_df[bk_category.price].sum(), rel_tol=1e-09)
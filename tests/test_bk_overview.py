@@ -155,6 +155,40 @@ def test_update_income_dataframes(bk_overview_initialized):
             assert bk_overview_initialized.next_month_income_df[bk_overview_initialized.price].sum() == 0
 
 
+def test_month_partition_shared(bk_overview_initialized):
+    """Testing if MonthPartition of Expense DataFrame is memoized in AggregateCube and reused by Overview with
+    the same AggregateCube."""
+
+    bk_overview_initialized.chosen_month = "2019-02"
+    bk_overview_initialized.next_month = "2019-03"
+    bk_overview_initialized._Overview__update_expense_dataframes()
+    partition = bk_overview_initialized.expense_partition
+
+    assert bk_overview_initialized.aggregate_cube.memoized("Overview Month Partition", None) is partition
+
+    bk_overview_initialized.expense_partition = None
+    bk_overview_initialized._Overview__update_expense_dataframes()
+
+    assert bk_overview_initialized.expense_partition is partition
+
+
+def test_monthly_summary_shared(bk_overview_initialized):
+    """Testing if MonthlySummary is memoized in AggregateCube for the current Category Column and created again
+    when the Category Column is changed."""
+
+    bk_overview_initialized.chosen_month = "2019-02"
+    bk_overview_initialized._Overview__update_category_barplot()
+    summary = bk_overview_initialized.monthly_summary
+
+    assert bk_overview_initialized.aggregate_cube.memoized("Overview Summary Category", None) is summary
+
+    bk_overview_initialized.change_category_column("ALL_CATEGORIES")
+    bk_overview_initialized._Overview__update_category_barplot()
+
+    assert bk_overview_initialized.monthly_summary is not summary
+    assert bk_overview_initialized.monthly_summary.category == "ALL_CATEGORIES"
+
+
 @pytest.mark.parametrize(
     ("month", "expected_sum"),
     (
@@ -2,17 +2,16 @@ import pytest
 import pandas as pd
 from datetime import datetime
 
-from flask_app.bkapp.pandas_functions import create_combinations_of_sep_values
+from flask_app.observer import Observer
 
 
-def test_initialize_categories(bk_settings, bk_categories_simple):
+def test_initialize_categories(bk_settings, bk_categories_simple, bk_categories_combinations):
     """Testing if Category variables are being initialized correctly."""
 
     expected_simple_categories = sorted(bk_categories_simple)
 
     expected_extended_categories = bk_settings.original_extended_categories.sort_values().unique().tolist()
-    expected_combination_categories = create_combinations_of_sep_values(
-        bk_settings.original_extended_categories, sep=":")
+    expected_combination_categories = bk_categories_combinations
 
     bk_settings._Settings__initialize_categories()
 
@@ -121,3 +120,67 @@ def test_update_chosen_months(bk_settings_initialized, test_tuple, expected_star
     actual_range = bk_settings_initialized.chosen_months
 
     assert actual_range == expected_range
+
+
+def test_update_original_data_keeps_choices(bk_settings_initialized):
+    """Testing if updating Original Data keeps Category Type, unchecked Categories and Month Range chosen by
+    the User."""
+
+    settings = bk_settings_initialized
+    df = settings.parent.original_expense_dataframe
+
+    unchosen_category = settings.all_categories_extended[0]
+    removed_category = settings.all_categories_extended[1]
+    chosen_months = settings.all_months[2:5]
+
+    settings.chosen_category_type = 1
+    settings.all_categories = settings.all_categories_extended
+    settings.chosen_categories = [x for x in settings.all_categories_extended if x != unchosen_category]
+    settings.chosen_months = chosen_months
+
+    new_df = df[df["ALL_CATEGORIES"] != removed_category]
+    settings.update_original_data(new_df["Category"], new_df["ALL_CATEGORIES"], new_df["Date"])
+
+    expected_categories = new_df["ALL_CATEGORIES"].sort_values().unique().tolist()
+
+    assert settings.chosen_category_type == 1
+    assert settings.all_categories == expected_categories
+    assert settings.chosen_categories == [x for x in expected_categories if x != unchosen_category]
+    assert removed_category not in settings.all_categories
+    assert settings.chosen_months == chosen_months
+
+
+def test_update_original_data_whole_month_range(bk_settings_initialized):
+    """Testing if updating Original Data chooses the new whole Month Range if the whole Month Range was chosen
+    before."""
+
+    settings = bk_settings_initialized
+    df = settings.parent.original_expense_dataframe
+
+    new_df = df[df["Date"] < datetime(year=2019, month=7, day=1)]
+    settings.update_original_data(new_df["Category"], new_df["ALL_CATEGORIES"], new_df["Date"])
+
+    expected_months = [datetime(year=2019, month=x, day=1) for x in range(1, 7)]
+
+    assert settings.all_months == expected_months
+    assert settings.chosen_months == expected_months
+
+
+def test_category_type_change_notifications(bk_settings_initialized):
+    """Testing if changing Category Type notifies all changed properties at once, with their final values."""
+
+    observer = Observer()
+    notifications = []
+
+    @observer.register
+    def new_func(obj, changes):
+        notifications.append(changes)
+
+    bk_settings_initialized.category_options()
+    bk_settings_initialized.observer = observer
+    bk_settings_initialized._Settings__update_categories_on_category_type_change(2)
+
+    assert len(notifications) == 1
+    assert list(notifications[0]) == ["chosen_categories", "chosen_category_type"]
+    assert notifications[0]["chosen_category_type"] == 2
+    assert notifications[0]["chosen_categories"] == bk_settings_initialized.all_categories_combinations
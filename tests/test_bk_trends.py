@@ -6,6 +6,8 @@ from math import isclose
 from bokeh.models.widgets import Div, RadioGroup
 from bokeh.models import Plot, ColumnDataSource
 
+from flask_app.bkapp.daily_aggregates import daily_aggregates
+
 
 def test_initialize_grid_elements(bk_trends):
     """Testing if initializing grid elements of bk_trends grid is being done correctly."""
@@ -219,189 +221,12 @@ def test_update_histogram(bk_trends_initialized, chosen_months):
     assert actual_top_edges == expected_edges[:-1].tolist()
 
 
-@pytest.mark.parametrize(
-    ("columns", "expected_results"),
-    (
-            (["Category", "MonthYear", "Price", "Product", "Date", "Currency", "Shop"], []),
-            (["Category", "MonthYear", "Price", "Product", "week", "Currency", "Shop"], [
-                "year", "year_str", "month", "month_str", "weekday", "weekday_str",
-                "myWphgqp", "week_str", "date_str", "count", "monthyear_str"
-            ]),
-            (["Category", "year", "month", "weekday", "weekday_str", "Currency", "Shop"], [
-                "myWphgqp", "year_str", "uQzFYYNG", "month_str", "JUbokwek", "xqDbSzlh",
-                "week", "week_str", "date_str", "count", "monthyear_str"
-            ]),
-            (["Category", "month", "uQzFYYNG", "weekday", "JUbokwek", "Currency", "Shop"], [
-                "year", "year_str", "myWphgqp", "month_str", "xqDbSzlh", "weekday_str",
-                "week", "week_str", "date_str", "count", "monthyear_str"
-            ])
-    )
-)
-def test___create_new_column_names(bk_trends_initialized, columns, expected_results):
-    """Testing if __create_new_column_names correctly creates new column names if some of the values
-        are already taken."""
-
-    seed = 456
-    n = 8
-    key_values = ["year", "year_str", "month", "month_str", "weekday",
-                  "weekday_str", "week", "week_str", "date_str", "count", "monthyear_str"]
-
-    if len(expected_results) == 0:
-        expected_results = key_values
-
-    expected_dict = dict(zip(key_values, expected_results))
-    actual_dict = bk_trends_initialized._Trends__create_new_column_names(columns, n, seed)
-
-    assert len(actual_dict) != 0
-    assert len(actual_dict) == len(expected_dict)
-    assert actual_dict == expected_dict
-
-
-def test_aggregated_expense_df(bk_trends_initialized):
-    """Testing if __aggregated_expense_df function makes correct transformations to the expense DataFrame."""
-
-    columns = [
-        bk_trends_initialized.category,
-        bk_trends_initialized.monthyear,
-        bk_trends_initialized.price,
-        bk_trends_initialized.product,
-        bk_trends_initialized.date,
-        bk_trends_initialized.currency,
-        bk_trends_initialized.shop
-    ]
-
-    chosen_months = ["2019-01", "2019-02"]
-
-    df = bk_trends_initialized.original_expense_df
-    df = df[df[bk_trends_initialized.monthyear].isin(chosen_months)]
-
-    bk_trends_initialized.heatmap_df_column_dict = bk_trends_initialized._Trends__create_new_column_names(columns)
-
-    actual_df = bk_trends_initialized._Trends__aggregated_expense_df(df)
-
-    assert len(actual_df) == 59
-    assert set(actual_df.columns) == {bk_trends_initialized.date, bk_trends_initialized.price, "year", "month",
-                                      "weekday", "year_str", "month_str", "weekday_str", "date_str", "week", "week_str",
-                                      "count", "monthyear_str"}
-
-    assert set(actual_df["year"]) == {2019}
-    assert set(actual_df["year_str"]) == {"2019"}
-
-    assert set(actual_df["month"]) == {1, 2}
-    assert set(actual_df["month_str"]) == {"Jan", "Feb"}
-
-    assert set(actual_df["monthyear_str"]) == {"2019-01", "2019-02"}
-
-    assert set(actual_df["weekday"]) == {0, 1, 2, 3, 4, 5, 6}
-    assert set(actual_df["weekday_str"]) == {"0", "1", "2", "3", "4", "5", "6"}
-
-    expected_date_range = pd.date_range(start="1/1/2019", end="28/2/2019", freq="d")
-
-    assert actual_df[bk_trends_initialized.date].tolist() == expected_date_range.tolist()
-    assert actual_df["date_str"].tolist() == expected_date_range.strftime("%d-%b-%Y").tolist()
-
-    # first Monday is 07-Jan-2019 and last Sunday is 29-Dec-2019
-    expected_week_numbers = ([[-1] * 6]) + [[x] * 7 for x in range(7)] + [[7] * 4]
-    expected_week_numbers = [x for sublist in expected_week_numbers for x in sublist]
-
-    assert actual_df["week"].tolist() == expected_week_numbers
-    assert actual_df["week_str"].tolist() == list(map(lambda x: "{x:04d}".format(x=x), expected_week_numbers))
-
-
-def test_create_first_week_to_month_dict_no_time_gap(bk_trends_initialized):
-    """Testing if __create_first_week_to_month_dict function creates correct mapping between week numbers and
-        corresponding Month strings, when there is no gap between months."""
-
-    expected_dict = {
-        "0000": "(2019) Feb",
-        "0004": "Mar",
-        "0008": "Apr",
-        "0013": "May",
-        "0017": "Jun",
-        "0021": "Jul",
-        "0026": "Aug",
-        "0030": "Sep",
-        "0035": "Oct",
-        "0039": "Nov",
-        "0043": "Dec",
-        "0048": "(2020) Jan"
-    }
-
-    columns = [
-        bk_trends_initialized.category,
-        bk_trends_initialized.monthyear,
-        bk_trends_initialized.price,
-        bk_trends_initialized.product,
-        bk_trends_initialized.date,
-        bk_trends_initialized.currency,
-        bk_trends_initialized.shop
-    ]
-
-    df = bk_trends_initialized.original_expense_df
-
-    # masking done to change January 2019 to January 2020
-    df[bk_trends_initialized.date] = df[bk_trends_initialized.date].mask(
-        df[bk_trends_initialized.date].dt.month == 1,
-        df[bk_trends_initialized.date] + pd.DateOffset(year=2020)
-    )
-
-    bk_trends_initialized.heatmap_df_column_dict = bk_trends_initialized._Trends__create_new_column_names(columns)
-    agg = bk_trends_initialized._Trends__aggregated_expense_df(df)
-
-    actual_dict = bk_trends_initialized._Trends__create_first_week_to_month_dict(agg)
-    assert actual_dict == expected_dict
-
-
-def test_create_first_week_to_month_dict_time_gap(bk_trends_initialized):
-    """Testing if __create_first_week_to_month_dict function creates correct mapping between week numbers and
-    corresponding Month strings, when there is a gap between months."""
-
-    expected_dict = {
-        "0000": "(2019) Feb",
-        "0004": "Mar",
-        "0008": "Apr",
-        "0013": "May",
-        "0017": "Jun",
-        "0021": "Jul",
-        "0026": "Aug",
-        "0030": "Sep",
-        "0035": "Oct",
-        "0039": "Nov",
-        "0043": "Dec",
-        "0096": "(2020) Dec"
-    }
-
-    columns = [
-        bk_trends_initialized.category,
-        bk_trends_initialized.monthyear,
-        bk_trends_initialized.price,
-        bk_trends_initialized.product,
-        bk_trends_initialized.date,
-        bk_trends_initialized.currency,
-        bk_trends_initialized.shop
-    ]
-
-    df = bk_trends_initialized.original_expense_df
-
-    # masking is done to change data for January 2019 into December 2020
-    df[bk_trends_initialized.date] = df[bk_trends_initialized.date].mask(
-        df[bk_trends_initialized.date].dt.month == 1,
-        df[bk_trends_initialized.date] + pd.DateOffset(year=2020, month=12)
-    )
-
-    bk_trends_initialized.heatmap_df_column_dict = bk_trends_initialized._Trends__create_new_column_names(columns)
-    agg = bk_trends_initialized._Trends__aggregated_expense_df(df)
-
-    actual_dict = bk_trends_initialized._Trends__create_first_week_to_month_dict(agg)
-    assert actual_dict == expected_dict
-
-
 def test_update_heatmap(bk_trends_initialized):
     """Testing if __update_heatmap function correclty updates corresponding CDS and figure range for heatmap."""
 
-    expected_date = pd.date_range(start="1/1/2019", end="31/12/2019", freq="d").strftime("%d-%b-%Y").tolist()
-    expected_week = ["{x:04d}".format(x=x) for x in range(-1, 52)]
-    expected_weekday = {"0", "1", "2", "3", "4", "5", "6"}
+    expected_date = pd.date_range(start="1/1/2019", end="31/12/2019", freq="d")
+    expected_week = set(range(-1, 52))
+    expected_weekday = {0, 1, 2, 3, 4, 5, 6}
     selected_index = 0
 
     bk_trends_initialized._Trends__update_heatmap(selected_index)
@@ -409,13 +234,17 @@ def test_update_heatmap(bk_trends_initialized):
     data = bk_trends_initialized.grid_source_dict[bk_trends_initialized.g_heatmap].data
     fig = bk_trends_initialized.grid_elem_dict[bk_trends_initialized.g_heatmap]
 
-    assert data["date"].tolist() == expected_date
-    assert set(data["week"]) == set(expected_week)
+    assert data["date"].tolist() == (expected_date - pd.Timestamp(0)).days.tolist()
+    assert set(data["week"]) == expected_week
     assert set(data["weekday"]) == expected_weekday
 
-    actual_range = fig.x_range.factors
+    # data is sent to the browser as numbers only
+    for values in data.values():
+        assert values.dtype.kind in "iuf"
 
-    assert actual_range == expected_week
+    assert fig.x_range.start == -1.5
+    assert fig.x_range.end == 51.5
+    assert set(fig.xaxis.ticker.ticks) <= expected_week
 
 
 @pytest.mark.parametrize(
@@ -429,24 +258,12 @@ def test_update_heatmap_values(bk_trends_initialized, selected_index, expected_s
     """Testing if __update_heatmap_values correctly assings "value" column in heatmap CDS and calculates min and max
         attributes of bk_trends.heatmap_color_mapper ColorMapper depending on passed selected_index."""
 
-    columns = [
-        bk_trends_initialized.category,
-        bk_trends_initialized.monthyear,
-        bk_trends_initialized.price,
-        bk_trends_initialized.product,
-        bk_trends_initialized.date,
-        bk_trends_initialized.currency,
-        bk_trends_initialized.shop
-    ]
-
     df = bk_trends_initialized.original_expense_df
-
-    bk_trends_initialized.heatmap_df_column_dict = bk_trends_initialized._Trends__create_new_column_names(columns)
-    agg = bk_trends_initialized._Trends__aggregated_expense_df(df)
+    agg = daily_aggregates(df[bk_trends_initialized.date], df[bk_trends_initialized.price])
 
     source = bk_trends_initialized.grid_source_dict[bk_trends_initialized.g_heatmap]
 
-    source.data["price"] = agg[bk_trends_initialized.price]
+    source.data["price"] = agg["price"]
     source.data["count"] = agg["count"]
 
     bk_trends_initialized._Trends__update_heatmap_values(selected_index)
@@ -461,24 +278,12 @@ def test_update_heatmap_values(bk_trends_initialized, selected_index, expected_s
 def test_update_heatmap_values_error(bk_trends_initialized):
     """Testing if __update_heatmap_values raises error when incompatible selected_index is passed."""
 
-    columns = [
-        bk_trends_initialized.category,
-        bk_trends_initialized.monthyear,
-        bk_trends_initialized.price,
-        bk_trends_initialized.product,
-        bk_trends_initialized.date,
-        bk_trends_initialized.currency,
-        bk_trends_initialized.shop
-    ]
-
     df = bk_trends_initialized.original_expense_df
-
-    bk_trends_initialized.heatmap_df_column_dict = bk_trends_initialized._Trends__create_new_column_names(columns)
-    agg = bk_trends_initialized._Trends__aggregated_expense_df(df)
+    agg = daily_aggregates(df[bk_trends_initialized.date], df[bk_trends_initialized.price])
 
     source = bk_trends_initialized.grid_source_dict[bk_trends_initialized.g_heatmap]
 
-    source.data["price"] = agg[bk_trends_initialized.price]
+    source.data["price"] = agg["price"]
     source.data["count"] = agg["count"]
 
     with pytest.raises(Exception):
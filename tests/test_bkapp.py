@@ -1,5 +1,8 @@
 import pytest
 import pandas as pd
+import numpy as np
+
+from flask_app.bkapp.bkapp import BokehApp
 
 
 @pytest.mark.parametrize(
@@ -158,3 +161,256 @@ def test_update_current_expense_dataframe_month_categories(bkapp, chosen_categor
 
     assert actual_categories == chosen_categories
     assert actual_monthyear == expected_date_range
+
+
+def test_update_dataframes(bkapp):
+    """Testing if updating DataFrames replaces the data and updates Settings and current expense dataframe."""
+
+    expense_df = bkapp.original_expense_dataframe
+    new_expense_df = expense_df[expense_df["MonthYear"] <= "2019-06"].reset_index(drop=True)
+    new_income_df = bkapp.original_income_dataframe.iloc[:5]
+
+    bkapp.update_dataframes(new_expense_df, new_income_df)
+
+    assert bkapp.original_expense_dataframe is new_expense_df
+    assert bkapp.original_income_dataframe is new_income_df
+    assert bkapp.current_income_dataframe is new_income_df
+    assert len(bkapp.settings.all_months) == 6
+    assert bkapp.current_expense_dataframe.equals(new_expense_df)
+
+
+def test_gridplots_categorical(bkapp, bkapp_categorical):
+    """Testing if Views created from DataFrames with Categorical columns show the same data as Views created from
+    DataFrames with object columns."""
+
+    categorical_bkapp = bkapp_categorical
+
+    for app in [bkapp, categorical_bkapp]:
+        app.overview_gridplot()
+        app.trends_gridplot()
+        app.category_gridplot()
+
+    for view in ["overview_view", "trends_view", "category_view"]:
+        sources = getattr(bkapp, view).grid_source_dict
+        categorical_sources = getattr(categorical_bkapp, view).grid_source_dict
+        for key, source in sources.items():
+            categorical_data = categorical_sources[key].data
+            assert set(source.data.keys()) == set(categorical_data.keys())
+            for column, values in source.data.items():
+                assert pd.Series(list(values)).equals(pd.Series(list(categorical_data[column])))
+
+
+def test_gridplots_price_scale(bkapp, bkapp_price_scale):
+    """Testing if Views created from DataFrames with prices stored as int64 cents show the same data as Views created
+    from DataFrames with float prices."""
+
+    for app in [bkapp, bkapp_price_scale]:
+        app.overview_gridplot()
+        app.trends_gridplot()
+        app.category_gridplot()
+
+    for view in ["overview_view", "trends_view", "category_view"]:
+        sources = getattr(bkapp, view).grid_source_dict
+        scaled_sources = getattr(bkapp_price_scale, view).grid_source_dict
+        for key, source in sources.items():
+            scaled_data = scaled_sources[key].data
+            assert set(source.data.keys()) == set(scaled_data.keys())
+            for column, values in source.data.items():
+                values, scaled_values = pd.Series(list(values)), pd.Series(list(scaled_data[column]))
+                if pd.api.types.is_float_dtype(values):
+                    assert np.allclose(values, scaled_values, equal_nan=True)
+                else:
+                    assert values.equals(scaled_values)
+
+
+def test_gridplots_without_income(bkapp_without_income):
+    """Testing if Views can be created from a book with Expenses, but without any Income."""
+
+    bkapp = bkapp_without_income
+
+    bkapp.overview_gridplot()
+    bkapp.trends_gridplot()
+    bkapp.category_gridplot()
+
+    assert bkapp.original_income_dataframe.shape[0] == 0
+    assert np.isnan(bkapp.overview_view._Overview__get_monthly_summary().month("2019-01")["savings"])
+
+
+def test_gridplots_aggregate_cube(bkapp):
+    """Testing if Views receive AggregateCube filtered to the same data as .current_expense_dataframe."""
+
+    bkapp.current_chosen_months = pd.date_range("2019-02", "2019-05", freq="MS")
+    bkapp.current_chosen_categories = bkapp.settings.all_categories[1:]
+
+    views = [
+        (bkapp.overview_gridplot, "overview_view"),
+        (bkapp.trends_gridplot, "trends_view"),
+        (bkapp.category_gridplot, "category_view")
+    ]
+
+    for gridplot, view in views:
+        gridplot()
+        assert getattr(bkapp, view).aggregate_cube is bkapp.current_aggregate_cube
+
+    cube = bkapp.current_aggregate_cube
+    assert cube.dataframe is bkapp.current_expense_dataframe
+    assert cube.source_dataframe is bkapp.original_expense_dataframe
+
+    expected = bkapp.current_expense_dataframe.groupby(bkapp.monthyear)[bkapp.price].sum()
+    assert np.allclose(cube.month_totals().to_numpy(), expected.to_numpy())
+
+
+@pytest.mark.parametrize(
+    ("excluded_categories", "chosen_months"),
+    (
+            (["Rent"], None),
+            (["Rent", "Eggs", "Petrol", "Fruits and Vegetables"], None),
+            ([], ["2019-03", "2019-04"]),
+            (["Rent"], ["2019-02", "2019-05", "2019-06"])
+    )
+)
+def test_category_gridplot_filtered_transactions(bkapp, excluded_categories, chosen_months):
+    """Testing if Transactions Table of Category View created through BokehApp with Categories or months deselected
+    in Settings shows only transactions of the chosen Category and months."""
+
+    bkapp.current_chosen_categories = [category for category in bkapp.settings.all_categories
+                                       if category not in excluded_categories]
+    if chosen_months is not None:
+        bkapp.current_chosen_months = pd.to_datetime(chosen_months)
+
+    bkapp.category_gridplot()
+    view = bkapp.category_view
+    view.chosen_category = "Bread"
+    view.update_grid_on_chosen_category_change()
+
+    df = bkapp.current_expense_dataframe
+    expected = df[df[bkapp.category] == "Bread"]
+    data = view.grid_source_dict[view.g_transactions].data
+
+    assert len(view.transactions_rows) == expected.shape[0]
+    assert set(data[bkapp.category]) == {"Bread"}
+    assert set(data[bkapp.monthyear]) <= set(expected[bkapp.monthyear])
+    assert len(data[bkapp.category]) == min(view.transactions_page_size, expected.shape[0])
+
+
+def test_filter_cache(bkapp):
+    """Testing if filtered data is memoized for the same choices and the cache is invalidated when DataFrames
+    are updated."""
+
+    bkapp.current_chosen_months = pd.date_range("2019-02", "2019-05", freq="MS")
+    bkapp.current_chosen_categories = bkapp.settings.all_categories[1:]
+    bkapp.data.filter_cache.cache_clear()
+
+    bkapp.trends_gridplot()
+    first_df = bkapp.current_expense_dataframe
+    bkapp.category_gridplot()
+
+    assert bkapp.current_expense_dataframe is first_df
+    assert bkapp.filter_cache_info().hits == 1
+    assert bkapp.filter_cache_info().misses == 1
+
+    # the same months in different order and different object
+    bkapp.current_chosen_months = pd.date_range("2019-02", "2019-05", freq="MS")[::-1]
+    bkapp.current_chosen_categories = list(reversed(bkapp.current_chosen_categories))
+    bkapp.overview_gridplot()
+
+    assert bkapp.current_expense_dataframe is first_df
+    assert bkapp.filter_cache_info().hits == 2
+
+    # the same Category names but different Category Column
+    bkapp.chosen_category_column = bkapp.all
+    bkapp.overview_gridplot()
+
+    assert bkapp.current_expense_dataframe is not first_df
+    assert bkapp.filter_cache_info().misses == 2
+
+    expense_df = bkapp.original_expense_dataframe
+    bkapp.update_dataframes(expense_df[expense_df[bkapp.monthyear] <= "2019-03"], bkapp.original_income_dataframe)
+
+    assert bkapp.filter_cache_info().currsize == 1
+    assert bkapp.current_expense_dataframe[bkapp.monthyear].max() <= "2019-03"
+
+
+def test_views_created_per_gridplot(bkapp):
+    """Testing if every gridplot call creates new View with chosen category column, so that different Documents
+    don't share Grid Elements."""
+
+    bkapp.category_gridplot()
+    first_view = bkapp.category_view
+
+    bkapp._BokehApp__update_category_choice(1)
+    bkapp.current_chosen_categories = bkapp.settings.all_categories_extended
+    bkapp.settings.all_categories = bkapp.settings.all_categories_extended
+    bkapp.category_gridplot()
+    second_view = bkapp.category_view
+
+    assert first_view is not second_view
+    assert first_view.grid_elem_dict[first_view.g_dropdown] is not second_view.grid_elem_dict[second_view.g_dropdown]
+    assert first_view.category == bkapp.category
+    assert second_view.category == bkapp.all
+
+
+def test_states_share_data(bkapp):
+    """Testing if BokehApp objects created over the same BokehAppData don't share their choices and filtered
+    data."""
+
+    other = BokehApp(bkapp.data)
+
+    bkapp.current_chosen_months = bkapp.settings.all_months[:2]
+    bkapp.current_chosen_categories = bkapp.settings.all_categories[1:]
+    bkapp.trends_gridplot()
+    other.trends_gridplot()
+
+    assert other.original_expense_dataframe is bkapp.original_expense_dataframe
+    assert other.settings is not bkapp.settings
+    assert other.current_expense_dataframe.shape[0] == bkapp.original_expense_dataframe.shape[0]
+    assert bkapp.current_expense_dataframe.shape[0] < other.current_expense_dataframe.shape[0]
+
+    new_data = bkapp.data.with_dataframes(bkapp.original_expense_dataframe.iloc[:10],
+                                          bkapp.original_income_dataframe)
+    other.update_data(new_data)
+
+    assert other.original_expense_dataframe.shape[0] == 10
+    assert bkapp.original_expense_dataframe.shape[0] > 10
+
+
+def test_states_own_observers(bkapp):
+    """Testing if changes of Settings of one BokehApp are not postponed or notified by transactions of the other."""
+
+    other = BokehApp(bkapp.data)
+    months = bkapp.settings.all_months[:2]
+
+    with other.observer.transaction():
+        bkapp.settings.chosen_months = months
+        assert list(bkapp.current_chosen_months) == list(months)
+        assert list(other.current_chosen_months) != list(months)
+
+    assert other.observer is not bkapp.observer
+    assert list(other.current_chosen_months) != list(months)
+
+
+def test_trends_data_reused_between_states(bkapp):
+    """Testing if data of Trends Heatmap and Line Plot is calculated once for the same data and choices and reused
+    by other BokehApp objects, but not when the data changes."""
+
+    other = BokehApp(bkapp.data)
+
+    bkapp.trends_gridplot()
+    other.trends_gridplot()
+
+    heatmap_data = bkapp.trends_view.grid_source_dict[bkapp.trends_view.g_heatmap].data
+    other_heatmap_data = other.trends_view.grid_source_dict[other.trends_view.g_heatmap].data
+    line_data = bkapp.trends_view.grid_source_dict[bkapp.trends_view.g_line_plot].data
+    other_line_data = other.trends_view.grid_source_dict[other.trends_view.g_line_plot].data
+
+    assert other_heatmap_data["price"] is heatmap_data["price"]
+    assert other_heatmap_data["week"] is heatmap_data["week"]
+    assert other_line_data["y"] is line_data["y"]
+
+    other.update_data(bkapp.data.with_dataframes(bkapp.original_expense_dataframe.iloc[:100],
+                                                 bkapp.original_income_dataframe))
+    other.trends_gridplot()
+    other_heatmap_data = other.trends_view.grid_source_dict[other.trends_view.g_heatmap].data
+
+    assert other_heatmap_data["price"] is not heatmap_data["price"]
+    assert other_heatmap_data["price"].sum() < heatmap_data["price"].sum()
@@ -0,0 +1,82 @@
+import pytest
+import uuid
+from types import SimpleNamespace
+
+from flask_app.bkapp.bkapp_server import BokehServer
+
+
+class FakeDocument(object):
+    """Document requested with state_id argument (None - without the argument) in a Bokeh session."""
+
+    def __init__(self, state_id=None):
+        arguments = {} if state_id is None else {BokehServer.state_argument: [state_id.encode("utf-8")]}
+        request = SimpleNamespace(arguments=arguments)
+        self.session_context = SimpleNamespace(id=uuid.uuid4().hex, request=request)
+        self.session_destroyed_callbacks = []
+
+    def on_session_destroyed(self, callback):
+        self.session_destroyed_callbacks.append(callback)
+
+    def destroy_session(self):
+        for callback in self.session_destroyed_callbacks:
+            callback(self.session_context)
+
+
+def test_get_state(bkapp_server):
+    """Testing if Documents of the same state id get the same BokehApp and other state ids get their own."""
+
+    first_id, second_id = uuid.uuid4().hex, uuid.uuid4().hex
+
+    first_state = bkapp_server.get_state(FakeDocument(first_id))
+
+    assert bkapp_server.get_state(FakeDocument(first_id)) is first_state
+    assert bkapp_server.get_state(FakeDocument(second_id)) is not first_state
+    assert bkapp_server.get_state(FakeDocument()) is bkapp_server.states[BokehServer.default_state]
+    assert bkapp_server.get_state(FakeDocument(second_id)).observer is not first_state.observer
+
+
+@pytest.mark.parametrize(
+    "state_id",
+    ("x", "../default", uuid.uuid4().hex.upper(), uuid.uuid4().hex + "0", "default")
+)
+def test_get_state_invalid_id(bkapp_server, state_id):
+    """Testing if Documents requested with state ids that aren't uuid4 hex Strings are rejected."""
+
+    with pytest.raises(ValueError):
+        bkapp_server.get_state(FakeDocument(state_id))
+
+    assert len(bkapp_server.states) == 0
+
+
+def test_state_removed_with_sessions(bkapp_server):
+    """Testing if state is removed when the last session of it's Documents is destroyed."""
+
+    state_id = uuid.uuid4().hex
+    first_doc, second_doc = FakeDocument(state_id), FakeDocument(state_id)
+    bkapp_server.get_state(first_doc)
+    bkapp_server.get_state(second_doc)
+    bkapp_server.get_state(second_doc)  # Document refreshed with new data
+
+    assert len(second_doc.session_destroyed_callbacks) == 1
+
+    first_doc.destroy_session()
+    assert state_id in bkapp_server.states
+
+    second_doc.destroy_session()
+    assert state_id not in bkapp_server.states
+    assert state_id not in bkapp_server.state_sessions
+
+
+def test_max_states(bkapp_server):
+    """Testing if only .max_states of the most recently used states are kept."""
+
+    bkapp_server.max_states = 2
+    first_id, second_id, third_id = [uuid.uuid4().hex for _ in range(3)]
+
+    bkapp_server.get_state(FakeDocument(first_id))
+    bkapp_server.get_state(FakeDocument(second_id))
+    bkapp_server.get_state(FakeDocument(first_id))
+    bkapp_server.get_state(FakeDocument(third_id))
+
+    assert list(bkapp_server.states) == [first_id, third_id]
+    assert list(bkapp_server.state_sessions) == [first_id, third_id]
@@ -0,0 +1,43 @@
+import pytest
+
+from flask_app.bkapp.category_index import CategoryIndex
+
+
+@pytest.mark.parametrize(
+    ("categories", "expected_mask"),
+    (
+            (["Expenses:Family"], [True, False, False, False, False, False, False, False]),
+            (["Expenses"], [False, False, False, False, False, False, False, False]),
+            (["Expenses:Car (Petrol)"], [False, False, False, False, True, False, False, False]),
+            (["Expenses:Family:Grocery:Bread", "Other Expenses:Family"],
+             [False, True, False, True, False, False, True, False]),
+            (["Not Present", "nan"], [False, False, False, False, False, False, False, False]),
+            ([], [False, False, False, False, False, False, False, False])
+    )
+)
+def test_rows_mask_exact(category_series, categories, expected_mask):
+    """Testing if CategoryIndex without category_sep matches only exact values."""
+
+    index = CategoryIndex(category_series)
+
+    assert index.rows_mask(categories).tolist() == expected_mask
+
+
+@pytest.mark.parametrize(
+    ("categories", "expected_mask"),
+    (
+            (["Expenses:Family"], [True, True, False, False, False, False, True, True]),
+            (["Expenses"], [True, True, True, False, True, False, True, True]),
+            (["Expenses:Family:Grocery"], [False, True, False, False, False, False, True, True]),
+            (["Expenses:Car (Petrol)", "Other Expenses"], [False, False, False, True, True, False, False, False]),
+            (["Expenses:Fam", "Family"], [False, False, False, False, False, False, False, False])
+    )
+)
+def test_rows_mask_tree(category_series, categories, expected_mask):
+    """Testing if CategoryIndex with category_sep matches categories and all of their descendants, without
+    substring or regex matches."""
+
+    index = CategoryIndex(category_series, ":")
+
+    assert index.rows_mask(categories).tolist() == expected_mask
+    assert len(index) == len(category_series)
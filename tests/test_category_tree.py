@@ -0,0 +1,135 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from flask_app.bkapp.category_tree import CategoryTree
+
+
+def test_nodes(category_series):
+    """Testing if CategoryTree has a node for every prefix of every value, with correct parents and descendant
+    ranges."""
+
+    tree = CategoryTree(category_series, ":")
+
+    assert tree.categories == [
+        "Expenses",
+        "Expenses:Car (Petrol)",
+        "Expenses:Family",
+        "Expenses:Family Trip",
+        "Expenses:Family:Grocery",
+        "Expenses:Family:Grocery:Bread",
+        "Expenses:Family:Grocery:Fruits",
+        "Other Expenses",
+        "Other Expenses:Family"
+    ]
+    assert [tree.position(category) for category in tree.categories] == list(range(len(tree)))
+
+    for node, name in enumerate(tree.names):
+        parent = tree.parents[node]
+        if ":" in name:
+            assert tree.names[parent] == name.rsplit(":", 1)[0]
+        else:
+            assert parent == -1
+
+        expected = [other for other in tree.names if other == name or other.startswith(name + ":")]
+        actual = [tree.names[other] for other in range(len(tree))
+                  if tree.enter[node] <= tree.enter[other] < tree.exit[node]]
+        assert sorted(actual) == sorted(expected)
+
+
+@pytest.mark.parametrize(
+    ("category", "expected_rows"),
+    (
+            ("Expenses", [0, 1, 2, 4, 6, 7]),
+            ("Expenses:Family", [0, 1, 6, 7]),
+            ("Expenses:Family:Grocery", [1, 6, 7]),
+            ("Expenses:Family Trip", [2]),
+            ("Other Expenses", [3]),
+            ("Expenses:Car", []),
+            ("nan", [])
+    )
+)
+def test_rows(category_series, category, expected_rows):
+    """Testing if rows of the category are rows of the category and all of it's descendants."""
+
+    tree = CategoryTree(category_series, ":")
+
+    assert sorted(tree.rows(category).tolist()) == expected_rows
+    assert sorted(tree.uniques[tree.values(category)]) == sorted(set(category_series[expected_rows]))
+
+
+def test_subtree_sums(category_series):
+    """Testing if sums of subtrees are the same as sums of rows of every node."""
+
+    tree = CategoryTree(category_series, ":")
+    weights = np.arange(1, len(category_series) + 1, dtype=float)
+
+    actual = tree.subtree_sums(weights)
+
+    for node, name in enumerate(tree.names):
+        assert actual[node] == weights[tree.rows(name)].sum()
+
+    assert actual[tree.node_ids["Expenses:Family"]] == 1 + 2 + 7 + 8
+
+
+def test_is_descendant(category_series):
+    """Testing if descendants are recognized only by the tree, not by the prefix of the name."""
+
+    tree = CategoryTree(category_series, ":")
+
+    assert tree.is_descendant("Expenses:Family:Grocery:Bread", "Expenses:Family")
+    assert tree.is_descendant("Expenses:Family", "Expenses:Family")
+    assert not tree.is_descendant("Expenses:Family Trip", "Expenses:Family")
+    assert not tree.is_descendant("Other Expenses:Family", "Expenses")
+    assert not tree.is_descendant("Expenses", "Expenses:Family")
+
+
+@pytest.mark.parametrize(
+    ("list_of_values", "expected_result", "sep"),
+    (
+            (["A:B:C:D", "One:Two"], ["A", "A:B", "A:B:C", "A:B:C:D", "One", "One:Two"], ":"),
+            (["One:Two:Three:Five", "One:Two:Three:Four"],
+             ["One", "One:Two", "One:Two:Three", "One:Two:Three:Five", "One:Two:Three:Four"],
+             ":"),
+            (["A_B:C_D"], ["A", "A_B:C", "A_B:C_D"], "_"),
+            (["A", "B", "C"], ["A", "B", "C"], None)
+    )
+)
+def test_categories(list_of_values, expected_result, sep):
+    """Testing if categories of CategoryTree are all prefixes of values (split by sep), sorted."""
+
+    tree = CategoryTree(pd.Series(list_of_values), sep)
+
+    assert tree.categories == expected_result
+
+
+def test_without_category_sep(category_series):
+    """Testing if every value is a separate root node when category_sep isn't provided."""
+
+    tree = CategoryTree(category_series)
+
+    assert tree.categories == sorted(category_series.dropna().unique())
+    assert (tree.parents == -1).all()
+    assert tree.rows("Expenses").tolist() == []
+    assert sorted(tree.rows("Expenses:Family:Grocery:Bread").tolist()) == [1, 6]
+
+
+def test_rollup(category_series):
+    """Testing if rolled up sums of every month are the same as sums of rows of every node and missing weight
+    makes only sums of it's node and ancestors missing."""
+
+    tree = CategoryTree(category_series, ":")
+    weights = np.arange(1, 2 * len(category_series) + 1, dtype=float).reshape(len(category_series), 2)
+
+    actual = tree.rollup(weights)
+
+    assert actual.shape == (len(tree), 2)
+    for node, name in enumerate(tree.names):
+        assert actual[node].tolist() == weights[tree.rows(name)].sum(axis=0).tolist()
+
+    weights[2, 0] = np.nan  # Expenses:Family Trip
+    actual = tree.rollup(weights)
+
+    missing = {tree.names[node] for node in np.flatnonzero(np.isnan(actual[:, 0]))}
+    assert missing == {"Expenses", "Expenses:Family Trip"}
+    assert not np.isnan(actual[:, 1]).any()
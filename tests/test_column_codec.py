@@ -0,0 +1,29 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from flask_app.gnucash import column_codec
+
+
+@pytest.mark.parametrize(
+    ("series", "expected_kind"),
+    (
+            (pd.Series(pd.to_datetime(["2019-01-01", "2019-02-01"])), "M"),
+            (pd.Series([1.5, np.nan]), "f"),
+            (pd.Series([1999, -1], dtype=np.int64), "i"),
+            (pd.Series(pd.Categorical(["Bread", "Eggs", "Bread"])), "category"),
+            (pd.Series(["Shop #1", np.nan, ""]), "O")
+    )
+)
+def test_encode_and_decode_column(series, expected_kind):
+    """Testing if columns encoded with encode_column are decoded back to the same values and dtypes and only
+    arrays listed by array_suffixes are created."""
+
+    kind, arrays = column_codec.encode_column(series)
+    decoded = pd.Series(column_codec.decode_column(kind, arrays))
+
+    assert kind == expected_kind
+    assert tuple(arrays) == column_codec.array_suffixes(kind)
+    assert all(array.dtype != object for array in arrays.values())
+    assert decoded.equals(series)
+    assert decoded.dtype == series.dtype
@@ -0,0 +1,87 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from flask_app.bkapp.daily_aggregates import daily_aggregates, first_weeks_of_months
+
+
+def epoch_days(dates):
+    return (pd.DatetimeIndex(dates) - pd.Timestamp(0)).days.tolist()
+
+
+def test_daily_aggregates(expense_df):
+    """Testing if daily_aggregates returns the same sums and counts as grouping DataFrame by Date and correct
+    week and weekday numbers."""
+
+    df = expense_df[expense_df["MonthYear"].isin(["2019-01", "2019-02"])]
+    actual = daily_aggregates(df["Date"], df["Price"])
+    grouped = df.groupby("Date")["Price"]
+
+    expected_date_range = pd.date_range(start="1/1/2019", end="28/2/2019", freq="d")
+
+    assert actual["date"].tolist() == epoch_days(expected_date_range)
+    assert np.allclose(actual["price"], grouped.sum().to_numpy())
+    assert actual["count"].tolist() == grouped.count().tolist()
+    assert actual["weekday"].tolist() == expected_date_range.weekday.tolist()
+
+    # first Monday is 07-Jan-2019
+    expected_week_numbers = ([[-1] * 6]) + [[x] * 7 for x in range(7)] + [[7] * 4]
+    expected_week_numbers = [x for sublist in expected_week_numbers for x in sublist]
+
+    assert actual["week"].tolist() == expected_week_numbers
+
+
+def test_daily_aggregates_missing_values():
+    """Testing if days are returned only when they have any transaction and missing prices and dates are
+    skipped."""
+
+    dates = pd.to_datetime(["2020-01-08", "2020-01-01", "2020-01-08", None, "2020-01-13", "2020-01-13"])
+    prices = [1.5, 2.0, np.nan, 100.0, np.nan, np.nan]
+
+    actual = daily_aggregates(dates, prices)
+
+    assert actual["date"].tolist() == epoch_days(["2020-01-01", "2020-01-08", "2020-01-13"])
+    assert actual["price"].tolist() == [2.0, 1.5, 0.0]
+    assert actual["count"].tolist() == [1, 1, 0]
+    assert actual["weekday"].tolist() == [2, 2, 0]
+    assert actual["week"].tolist() == [-2, -1, 0]
+
+    empty = daily_aggregates(dates[:0], prices[:0])
+    assert all(len(values) == 0 for values in empty.values())
+
+
+@pytest.mark.parametrize(
+    ("date_offset", "expected_dict"),
+    (
+            (pd.DateOffset(year=2020), {
+                0: "(2019) Feb", 4: "Mar", 8: "Apr", 13: "May", 17: "Jun", 21: "Jul", 26: "Aug", 30: "Sep",
+                35: "Oct", 39: "Nov", 43: "Dec", 48: "(2020) Jan"
+            }),
+            (pd.DateOffset(year=2020, month=12), {
+                0: "(2019) Feb", 4: "Mar", 8: "Apr", 13: "May", 17: "Jun", 21: "Jul", 26: "Aug", 30: "Sep",
+                35: "Oct", 39: "Nov", 43: "Dec", 96: "(2020) Dec"
+            })
+    )
+)
+def test_first_weeks_of_months(expense_df, date_offset, expected_dict):
+    """Testing if first_weeks_of_months creates correct mapping between week numbers and Month strings, when data
+    for January 2019 is moved to January 2020 (no time gap) or December 2020 (time gap)."""
+
+    dates = expense_df["Date"].mask(expense_df["Date"].dt.month == 1, expense_df["Date"] + date_offset)
+    agg = daily_aggregates(dates, expense_df["Price"])
+
+    assert first_weeks_of_months(agg["date"], agg["week"]) == expected_dict
+
+
+def test_first_weeks_of_months_many_years():
+    """Testing if months with the same name from different years are all included in the mapping."""
+
+    dates = pd.date_range(start="1/1/2000", end="31/12/2019", freq="d")
+    agg = daily_aggregates(dates, np.ones(len(dates)))
+
+    actual = first_weeks_of_months(agg["date"], agg["week"])
+
+    assert len(actual) == 20 * 12
+    assert [name for name in actual.values() if name.startswith("(")] == \
+        ["({}) Jan".format(year) for year in range(2000, 2020)]
+    assert list(actual) == sorted(actual)
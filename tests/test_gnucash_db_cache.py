@@ -0,0 +1,89 @@
+import pytest
+import os
+import pandas as pd
+
+from flask_app.gnucash.gnucash_db_parser import GnuCashDBParser
+
+
+def test_save_and_load(gnucash_db_cache, gnucash_db_parser_simple_book, simple_book_path):
+    """Testing if DataFrames loaded from the cache are the same as those that were saved."""
+
+    dfs = gnucash_db_parser_simple_book.get_dataframes()
+    settings = gnucash_db_parser_simple_book.cache_settings()
+
+    gnucash_db_cache.save(simple_book_path, dfs, settings)
+    loaded_dfs = gnucash_db_cache.load(simple_book_path, settings)
+
+    assert set(loaded_dfs.keys()) == set(dfs.keys())
+    for key in dfs:
+        assert loaded_dfs[key].equals(dfs[key])
+        assert loaded_dfs[key].dtypes.equals(dfs[key].dtypes)
+
+
+def test_save_and_load_categorical(gnucash_db_cache, simple_book_path):
+    """Testing if DataFrames with Categorical columns are loaded from the cache with the same categories."""
+
+    parser = GnuCashDBParser(simple_book_path, categorical=True)
+    dfs = parser.get_dataframes()
+
+    gnucash_db_cache.save(simple_book_path, dfs, parser.cache_settings())
+    loaded_dfs = gnucash_db_cache.load(simple_book_path, parser.cache_settings())
+
+    for key in dfs:
+        pd.testing.assert_frame_equal(loaded_dfs[key], dfs[key])
+
+
+def test_load_no_cache(gnucash_db_cache, simple_book_path):
+    """Testing if loading DataFrames for a file that wasn't cached returns None."""
+
+    assert gnucash_db_cache.load(simple_book_path) is None
+
+
+def test_load_changed_settings(gnucash_db_cache, gnucash_db_parser_simple_book, simple_book_path):
+    """Testing if DataFrames saved with different parser settings aren't loaded."""
+
+    settings = gnucash_db_parser_simple_book.cache_settings()
+    gnucash_db_cache.save(simple_book_path, gnucash_db_parser_simple_book.get_dataframes(), settings)
+
+    new_settings = dict(settings)
+    new_settings["category_sep"] = "/"
+
+    assert gnucash_db_cache.load(simple_book_path, new_settings) is None
+
+
+def test_load_changed_file(gnucash_db_cache, gnucash_db_parser_simple_book, simple_book_path):
+    """Testing if DataFrames aren't loaded when the content of the GnuCash file changes."""
+
+    settings = gnucash_db_parser_simple_book.cache_settings()
+    gnucash_db_cache.save(simple_book_path, gnucash_db_parser_simple_book.get_dataframes(), settings)
+
+    stat = os.stat(simple_book_path)
+    with open(simple_book_path, "ab") as f:
+        f.write(b"\0")
+    os.utime(simple_book_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert gnucash_db_cache.load(simple_book_path, settings) is None
+
+
+def test_invalidate(gnucash_db_cache, gnucash_db_parser_simple_book, simple_book_path):
+    """Testing if invalidating the cache removes saved DataFrames."""
+
+    gnucash_db_cache.save(simple_book_path, gnucash_db_parser_simple_book.get_dataframes())
+
+    assert gnucash_db_cache.invalidate() == 1
+    assert gnucash_db_cache.load(simple_book_path) is None
+    assert gnucash_db_cache.invalidate(simple_book_path) == 0
+
+
+def test_parser_uses_cache(gnucash_db_cache, simple_book_path):
+    """Testing if GnuCashDBParser saves parsed DataFrames to the cache and later loads them without parsing."""
+
+    parser = GnuCashDBParser(simple_book_path, cache=gnucash_db_cache)
+    expected_df = parser.get_expenses_df()
+
+    # unknown loader would raise an Error if the file was parsed again
+    cached_parser = GnuCashDBParser(simple_book_path, loader="unknown", cache=gnucash_db_cache)
+    actual_df = cached_parser.get_expenses_df()
+
+    assert actual_df.equals(expected_df)
+    assert cached_parser.get_income_df().equals(parser.get_income_df())
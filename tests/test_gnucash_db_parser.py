@@ -1,6 +1,11 @@
+import pytest
+import piecash
 import pandas as pd
 import numpy as np
 from datetime import date, datetime
+from decimal import Decimal
+
+from flask_app.gnucash.gnucash_db_parser import GnuCashDBParser, NoTransactionsError
 
 
 def test_get_list_of_expense_transactions_example_book(gnucash_db_parser_example_book):
@@ -26,13 +31,13 @@ def test_get_list_of_expense_transactions_simple_book(gnucash_db_parser_simple_b
 
     curr = "PLN"
     expected_transactions = [
-        ("Apples #1", "2019-01-01", "nan", "Expenses:Main Type #1:Fruits:Apples", "5", curr),
-        ("Eggs #1", "2019-01-02", "nan", "Expenses:Main Type #2:Dairy:Eggs", "10", curr),
-        ("Other Apples", "2019-01-03", "nan", "Expenses:Main Type #1:Fruits:Apples", "4.5", curr),
-        ("Shop #1", "2019-01-10", "Apples #1", "Expenses:Main Type #1:Fruits:Apples", "3", curr),
-        ("Shop #1", "2019-01-10", "Eggs #1", "Expenses:Main Type #2:Dairy:Eggs", "7", curr),
-        ("Shop #2", "2019-01-11", "Other Apples", "Expenses:Main Type #1:Fruits:Apples", "3", curr),
-        ("Shop #2", "2019-01-11", "Apples #1", "Expenses:Main Type #1:Fruits:Apples", "5", curr)
+        ("Apples #1", date(2019, 1, 1), np.nan, "Expenses:Main Type #1:Fruits:Apples", 5.0, curr),
+        ("Eggs #1", date(2019, 1, 2), np.nan, "Expenses:Main Type #2:Dairy:Eggs", 10.0, curr),
+        ("Other Apples", date(2019, 1, 3), np.nan, "Expenses:Main Type #1:Fruits:Apples", 4.5, curr),
+        ("Shop #1", date(2019, 1, 10), "Apples #1", "Expenses:Main Type #1:Fruits:Apples", 3.0, curr),
+        ("Shop #1", date(2019, 1, 10), "Eggs #1", "Expenses:Main Type #2:Dairy:Eggs", 7.0, curr),
+        ("Shop #2", date(2019, 1, 11), "Other Apples", "Expenses:Main Type #1:Fruits:Apples", 3.0, curr),
+        ("Shop #2", date(2019, 1, 11), "Apples #1", "Expenses:Main Type #1:Fruits:Apples", 5.0, curr)
     ]
 
     returned_list = gnucash_db_parser_simple_book._GnuCashDBParser__get_list_of_transactions(
@@ -42,7 +47,7 @@ def test_get_list_of_expense_transactions_simple_book(gnucash_db_parser_simple_b
 
     for expected_tr, returned_tr in zip(expected_transactions, returned_list):
         for exp_elem, ret_elem in zip(expected_tr, returned_tr):
-            assert exp_elem == ret_elem
+            assert exp_elem == ret_elem or (pd.isna(exp_elem) and pd.isna(ret_elem))
 
 
 def test_get_list_of_income_transactions_simple_book(gnucash_db_parser_simple_book):
@@ -50,8 +55,8 @@ def test_get_list_of_income_transactions_simple_book(gnucash_db_parser_simple_bo
 
     curr = "PLN"
     expected_income_list = [
-        ("Salary", "2019-01-01", "nan", "Income:Income #1", "-1000", curr),
-        ("Salary", "2019-01-01", "nan", "Income:Income #2", "-1500", curr)
+        ("Salary", date(2019, 1, 1), np.nan, "Income:Income #1", -1000.0, curr),
+        ("Salary", date(2019, 1, 1), np.nan, "Income:Income #2", -1500.0, curr)
     ]
     actual_income_list = gnucash_db_parser_simple_book._GnuCashDBParser__get_list_of_transactions(
         gnucash_db_parser_simple_book.income_name
@@ -60,7 +65,7 @@ def test_get_list_of_income_transactions_simple_book(gnucash_db_parser_simple_bo
 
     for expected_income, actual_income in zip(expected_income_list, actual_income_list):
         for exp_elem, act_elem in zip(expected_income, actual_income):
-            assert act_elem == exp_elem
+            assert act_elem == exp_elem or (pd.isna(exp_elem) and pd.isna(act_elem))
 
 
 def test_create_expense_df_from_simple_book(gnucash_db_parser_simple_book):
@@ -247,3 +252,288 @@ def test_create_income_df_from_example_book(gnucash_db_parser_example_book):
 
     for col in expected_df.columns:
         assert actual_df[col].equals(expected_df[col])
+
+
+@pytest.mark.parametrize(
+    ("df_function",),
+    (
+            ("get_expenses_df",),
+            ("get_income_df",)
+    )
+)
+def test_sql_loader_matches_orm_loader_example_book(example_book_path, df_function):
+    """Testing if DataFrames created with SQL loader are the same as those created with piecash ORM loader
+        (Example GnuCash file)."""
+
+    sql_parser = GnuCashDBParser(example_book_path, loader=GnuCashDBParser.sql_loader)
+    orm_parser = GnuCashDBParser(example_book_path, loader=GnuCashDBParser.orm_loader)
+
+    sql_df = getattr(sql_parser, df_function)()
+    orm_df = getattr(orm_parser, df_function)()
+
+    assert sql_df.equals(orm_df)
+
+
+@pytest.mark.parametrize(
+    ("df_function",),
+    (
+            ("get_expenses_df",),
+            ("get_income_df",)
+    )
+)
+def test_sql_loader_matches_orm_loader_simple_book(simple_book_path, df_function):
+    """Testing if DataFrames created with SQL loader are the same as those created with piecash ORM loader
+        (simple piecash book created manually)."""
+
+    sql_parser = GnuCashDBParser(simple_book_path, loader=GnuCashDBParser.sql_loader)
+    orm_parser = GnuCashDBParser(simple_book_path, loader=GnuCashDBParser.orm_loader)
+
+    sql_df = getattr(sql_parser, df_function)()
+    orm_df = getattr(orm_parser, df_function)()
+
+    assert sql_df.equals(orm_df)
+
+
+@pytest.mark.parametrize(
+    ("loader",),
+    (
+            (GnuCashDBParser.sql_loader,),
+            (GnuCashDBParser.orm_loader,)
+    )
+)
+def test_expenses_only_book(simple_book_path, expenses_only_book_path, loader):
+    """Testing if Expenses of a book without any Income are loaded and Income DataFrame is empty."""
+
+    expected_df = GnuCashDBParser(simple_book_path, loader=loader).get_expenses_df()
+    parser = GnuCashDBParser(expenses_only_book_path, loader=loader)
+
+    expenses_df = parser.get_expenses_df()
+    income_df = parser.get_income_df()
+
+    assert expenses_df.equals(expected_df)
+    assert income_df.shape[0] == 0
+    assert income_df.columns.tolist() == expenses_df.columns.tolist()
+    assert income_df.dtypes.equals(expenses_df.dtypes)
+
+
+@pytest.mark.parametrize(
+    ("loader",),
+    (
+            (GnuCashDBParser.sql_loader,),
+            (GnuCashDBParser.orm_loader,)
+    )
+)
+def test_income_only_book(income_only_book_path, loader):
+    """Testing if requesting Expenses of a book without any Expenses raises an error, while Income is loaded."""
+
+    parser = GnuCashDBParser(income_only_book_path, loader=loader)
+
+    with pytest.raises(NoTransactionsError):
+        parser.get_expenses_df()
+
+    assert parser.get_income_df().shape[0] == 2
+
+
+def test_unknown_loader(simple_book_path):
+    """Testing if creating DataFrame with unknown loader raises an error."""
+
+    parser = GnuCashDBParser(simple_book_path, loader="xml")
+
+    with pytest.raises(ValueError):
+        parser.get_expenses_df()
+
+
+def test_get_dataframes_fills_cache(gnucash_db_parser_simple_book):
+    """Testing if get_dataframes creates expense and income DataFrames at once and caches both of them."""
+
+    parser = gnucash_db_parser_simple_book
+    dfs = parser.get_dataframes()
+
+    assert set(dfs.keys()) == {parser.expense_name, parser.income_name}
+    assert dfs[parser.expense_name] is parser.expenses_df
+    assert dfs[parser.income_name] is parser.income_df
+
+    assert len(parser.get_expenses_df()) == 7
+    assert len(parser.get_income_df()) == 2
+
+
+@pytest.mark.parametrize(
+    ("loader",),
+    (
+            (GnuCashDBParser.sql_loader,),
+            (GnuCashDBParser.orm_loader,)
+    )
+)
+def test_get_dataframes_other_types(simple_book_path, loader):
+    """Testing if get_dataframes creates DataFrames for account types other than expense and income."""
+
+    parser = GnuCashDBParser(simple_book_path, loader=loader)
+    dfs = parser.get_dataframes(["EXPENSE", "ASSET"])
+
+    assert len(dfs["EXPENSE"]) == 7
+    assert len(dfs["ASSET"]) == 9
+    assert set(dfs["ASSET"]["ALL_CATEGORIES"]) == {"Assets:Asset #1", "Assets:Asset #2"}
+    assert parser.other_dfs["ASSET"] is dfs["ASSET"]
+    assert parser.income_df is None
+
+
+def test_create_df_column_types(gnucash_db_parser_simple_book):
+    """Testing if Date and Price columns of created DataFrame keep native (not String) types."""
+
+    df = gnucash_db_parser_simple_book.get_expenses_df()
+
+    assert pd.api.types.is_datetime64_any_dtype(df["Date"])
+    assert pd.api.types.is_float_dtype(df["Price"])
+    assert df["Shop"].isnull().sum() == 3
+    assert df["Product"].isnull().sum() == 0
+
+
+def test_create_df_categorical(simple_book_path):
+    """Testing if String columns are stored as Categoricals in categorical mode, without changing their values."""
+
+    df = GnuCashDBParser(simple_book_path).get_expenses_df()
+    categorical_df = GnuCashDBParser(simple_book_path, categorical=True).get_expenses_df()
+
+    categorical_columns = ["Currency", "Product", "Shop", "ALL_CATEGORIES", "Type", "Category", "MonthYear"]
+    for column in categorical_columns:
+        assert isinstance(categorical_df[column].dtype, pd.CategoricalDtype)
+        assert categorical_df[column].cat.categories.tolist() == sorted(df[column].dropna().unique())
+
+    assert categorical_df.astype({column: object for column in categorical_columns}).equals(df)
+
+
+@pytest.mark.parametrize(
+    ("loader",),
+    (
+            (GnuCashDBParser.sql_loader,),
+            (GnuCashDBParser.orm_loader,)
+    )
+)
+def test_create_df_price_scale(example_book_path, loader):
+    """Testing if prices are stored as int64 cents with price_scale, without changing other columns."""
+
+    df = GnuCashDBParser(example_book_path, loader=loader).get_expenses_df()
+    scaled_df = GnuCashDBParser(example_book_path, loader=loader, price_scale=100).get_expenses_df()
+
+    assert scaled_df["Price"].dtype == np.int64
+    assert scaled_df["Price"].tolist() == (df["Price"] * 100).round().astype(np.int64).tolist()
+    assert scaled_df.drop(columns=["Price"]).equals(df.drop(columns=["Price"]))
+
+    default_parser = GnuCashDBParser(example_book_path, loader=loader)
+    assert df["Price"].dtype == float
+    assert default_parser.cache_settings() == GnuCashDBParser(example_book_path, loader=loader,
+                                                              price_scale=1).cache_settings()
+
+
+@pytest.mark.parametrize(
+    ("value_num", "value_denom", "expected"),
+    (
+            (1999, 100, 1999),
+            (-1999, 100, -1999),
+            (1, 3, 33),
+            (2, 3, 67),
+            (-1, 200, 0),
+            (1, 200, 1),
+            (123456789, 1000, 12345679)
+    )
+)
+def test_convert_prices_price_scale(simple_book_path, value_num, value_denom, expected):
+    """Testing if value_num / value_denom fractions are converted into cents the same way by both loaders (rounded
+    half up)."""
+
+    parser = GnuCashDBParser(simple_book_path, price_scale=100)
+
+    sql_price = parser._GnuCashDBParser__convert_prices(pd.Series([value_num]), pd.Series([value_denom]))
+    orm_price = parser._GnuCashDBParser__convert_decimal_price(Decimal(value_num) / Decimal(value_denom))
+
+    assert sql_price.tolist() == [expected]
+    assert orm_price == expected
+
+
+def test_refresh_no_changes(gnucash_db_parser_simple_book):
+    """Testing if refresh doesn't change DataFrames when GnuCash file didn't change."""
+
+    parser = gnucash_db_parser_simple_book
+    expenses_df = parser.get_expenses_df()
+    income_df = parser.get_income_df()
+
+    assert parser.refresh() is False
+    assert parser.get_expenses_df() is expenses_df
+    assert parser.get_income_df() is income_df
+
+
+@pytest.mark.parametrize(
+    ("loader", "categorical"),
+    (
+            (GnuCashDBParser.sql_loader, False),
+            (GnuCashDBParser.orm_loader, False),
+            (GnuCashDBParser.sql_loader, True)
+    )
+)
+def test_refresh_matches_full_read(simple_book_path, loader, categorical):
+    """Testing if DataFrames updated with refresh are the same as DataFrames created from scratch, after
+        transactions were added, deleted and modified in GnuCash file."""
+
+    parser = GnuCashDBParser(simple_book_path, loader=loader, categorical=categorical)
+    parser.get_dataframes()
+
+    with piecash.open_book(simple_book_path, readonly=False) as book:
+        curr = book.default_currency
+        asset = book.accounts(fullname="Assets:Asset #1")
+        eggs = book.accounts(fullname="Expenses:Main Type #2:Dairy:Eggs")
+
+        # deleting the first income transaction
+        salary = [tr for tr in book.transactions if tr.description == "Salary"][0]
+        book.delete(salary)
+        book.flush()
+
+        # modifying the last transaction
+        last_tr = [tr for tr in book.transactions if tr.description == "Shop #2"][0]
+        for split in last_tr.splits:
+            split.value = split.value * 2
+            split.quantity = split.value
+        book.flush()
+
+        # adding new transaction
+        piecash.Transaction(
+            currency=curr,
+            description="Eggs #2",
+            post_date=date(year=2019, month=2, day=1),
+            splits=[
+                piecash.Split(account=asset, value=Decimal("-12")),
+                piecash.Split(account=eggs, value=Decimal("12"))
+            ]
+        )
+        book.save()
+
+    assert parser.refresh() is True
+
+    expected_parser = GnuCashDBParser(simple_book_path, categorical=categorical)
+    expected_expenses_df = expected_parser.get_expenses_df()
+    expected_income_df = expected_parser.get_income_df()
+
+    pd.testing.assert_frame_equal(parser.get_expenses_df(), expected_expenses_df)
+    pd.testing.assert_frame_equal(parser.get_income_df(), expected_income_df)
+    assert len(expected_expenses_df) == 8
+    assert len(expected_income_df) == 1
+    assert expected_expenses_df["Price"].sum() == 57.5
+
+    assert parser.refresh() is False
+
+
+def test_refresh_saves_cache(simple_book_path, gnucash_db_cache):
+    """Testing if DataFrames updated with refresh are saved in GnuCashDBCache."""
+
+    parser = GnuCashDBParser(simple_book_path, cache=gnucash_db_cache)
+    parser.get_dataframes()
+
+    with piecash.open_book(simple_book_path, readonly=False) as book:
+        book.delete([tr for tr in book.transactions if tr.description == "Eggs #1"][0])
+        book.save()
+
+    assert gnucash_db_cache.load(simple_book_path, parser.cache_settings()) is None
+    assert parser.refresh() is True
+
+    cached_dfs = gnucash_db_cache.load(simple_book_path, parser.cache_settings())
+    pd.testing.assert_frame_equal(cached_dfs[parser.expense_name], parser.get_expenses_df())
+    assert len(cached_dfs[parser.expense_name]) == 6
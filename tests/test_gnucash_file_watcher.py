@@ -0,0 +1,72 @@
+import pytest
+import os
+import tempfile
+import threading
+
+from flask_app.gnucash.gnucash_file_watcher import GnuCashFileWatcher
+
+
+@pytest.fixture
+def watched_file_path():
+    fd, file_path = tempfile.mkstemp()
+    os.write(fd, b"gnucash")
+
+    yield file_path
+
+    os.close(fd)
+    os.unlink(file_path)
+
+
+def change_file(file_path):
+    """Appends a byte to the file and moves it's modification time forward."""
+    with open(file_path, "ab") as f:
+        f.write(b"0")
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_check_no_change(watched_file_path):
+    """Testing if check doesn't report a change if the file didn't change."""
+
+    watcher = GnuCashFileWatcher(watched_file_path, lambda: None)
+
+    assert watcher.check() is False
+    assert watcher.check() is False
+
+
+def test_check_change(watched_file_path):
+    """Testing if check reports the change only once, after the file stays the same for one check."""
+
+    watcher = GnuCashFileWatcher(watched_file_path, lambda: None)
+
+    change_file(watched_file_path)
+    assert watcher.check() is False
+
+    change_file(watched_file_path)
+    assert watcher.check() is False
+    assert watcher.check() is True
+    assert watcher.check() is False
+
+
+def test_check_missing_file(watched_file_path):
+    """Testing if check doesn't report a change when the file is missing."""
+
+    watcher = GnuCashFileWatcher(watched_file_path, lambda: None)
+    watcher.file_path = watched_file_path + "_missing"
+
+    assert watcher.check() is False
+    assert watcher.check() is False
+
+
+def test_start_calls_callback(watched_file_path):
+    """Testing if started watcher calls the callback when the file changes."""
+
+    called = threading.Event()
+    watcher = GnuCashFileWatcher(watched_file_path, called.set, interval=0.01)
+    watcher.start()
+
+    change_file(watched_file_path)
+
+    assert called.wait(5) is True
+    watcher.stop()
+    assert watcher.thread is None
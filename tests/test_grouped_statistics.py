@@ -0,0 +1,77 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from flask_app.bkapp.grouped_statistics import GroupedStatistics
+
+
+def assert_stats_equal_describe(actual, values):
+    expected = pd.Series(values, dtype=np.float64).describe()
+
+    assert actual["count"] == expected["count"]
+    for stat, pandas_stat in (("mean", "mean"), ("std", "std"), ("min", "min"), ("median", "50%"),
+                              ("max", "max")):
+        assert np.isclose(actual[stat], expected[pandas_stat], equal_nan=True)
+
+
+@pytest.mark.parametrize(
+    "chosen_groups",
+    (
+            [0, 1, 2, 3, 4],
+            [0],
+            [1, 3],
+            [2, 3, 4]
+    )
+)
+def test_describe(chosen_groups):
+    """Testing if describe returns the same statistics as pandas describe() of values from chosen groups."""
+
+    random = np.random.RandomState(42)
+    values = random.exponential(100, size=200)
+    groups = random.randint(0, 5, size=200)
+
+    mask = np.zeros(5, dtype=bool)
+    mask[chosen_groups] = True
+
+    statistics = GroupedStatistics(values, groups, 5)
+
+    assert_stats_equal_describe(statistics.describe(mask), values[mask[groups]])
+
+
+def test_describe_all_groups():
+    """Testing if describe without groups_mask returns statistics of all values."""
+
+    values = [5.0, 1.0, 3.0, 2.0]
+    statistics = GroupedStatistics(values, [0, 1, 1, 2], 3)
+
+    assert_stats_equal_describe(statistics.describe(), values)
+
+
+@pytest.mark.parametrize(
+    ("values", "groups", "mask", "expected"),
+    (
+            ([], [], [True, True], {"count": 0}),
+            ([1.0, 2.0], [0, 0], [False, True], {"count": 0}),
+            ([1.0, 2.0], [0, 1], [False, True], {"count": 1, "mean": 2.0, "min": 2.0, "median": 2.0, "max": 2.0})
+    )
+)
+def test_describe_not_enough_values(values, groups, mask, expected):
+    """Testing if statistics that can't be calculated from chosen values are NaN."""
+
+    actual = GroupedStatistics(values, groups, 2).describe(np.array(mask))
+
+    assert set(actual) == {"count", "mean", "std", "min", "median", "max"}
+    for stat, value in actual.items():
+        if stat in expected:
+            assert value == expected[stat]
+        else:
+            assert np.isnan(value)
+
+
+def test_describe_big_values():
+    """Testing if std of values that are big in comparison to their spread is precise."""
+
+    values = 1e9 + np.array([0.01, 0.02, 0.03, 0.04])
+    actual = GroupedStatistics(values, [0, 0, 1, 1], 2).describe()
+
+    assert np.isclose(actual["std"], np.std([0.01, 0.02, 0.03, 0.04], ddof=1), rtol=1e-4)
@@ -0,0 +1,31 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from flask_app.bkapp.month_partition import MonthPartition
+
+
+@pytest.mark.parametrize(
+    "month",
+    ("2019-01", "2019-06", "2019-12")
+)
+def test_rows(expense_df, month):
+    """Testing if rows of month are the same rows (in the same order) as rows of DataFrame filtered to month."""
+
+    partition = MonthPartition(expense_df.sample(frac=1, random_state=42), "MonthYear")
+    expected = partition.dataframe[partition.dataframe["MonthYear"] == month]
+
+    pd.testing.assert_frame_equal(partition.rows(month), expected)
+
+
+def test_rows_missing_months():
+    """Testing if rows with missing months aren't included in any month and empty DataFrame is returned for month
+    without any rows."""
+
+    df = pd.DataFrame({"MonthYear": ["2019-02", None, "2019-01", "2019-02", np.nan], "Price": [1, 2, 3, 4, 5]})
+    partition = MonthPartition(df, "MonthYear")
+
+    assert partition.rows("2019-01")["Price"].tolist() == [3]
+    assert partition.rows("2019-02")["Price"].tolist() == [1, 4]
+    assert partition.rows("2020-01").shape == (0, 2)
+    assert list(partition.month_offsets) == ["2019-01", "2019-02"]
@@ -0,0 +1,79 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from flask_app.bkapp.monthly_summary import MonthlySummary
+
+
+@pytest.fixture
+def monthly_summary(gnucash_db_parser_example_book):
+    expense_df = gnucash_db_parser_example_book.get_expenses_df()
+    income_df = gnucash_db_parser_example_book.get_income_df()
+    return MonthlySummary(expense_df, income_df, "MonthYear", "Price", "Shop", "Category")
+
+
+@pytest.mark.parametrize(
+    "month",
+    ("2019-01", "2019-06", "2019-12")
+)
+def test_month(monthly_summary, month):
+    """Testing if statistics of month are the same as statistics calculated from rows of month."""
+
+    expense_df = monthly_summary.expense_dataframe
+    expense_df = expense_df[expense_df["MonthYear"] == month]
+    income_df = monthly_summary.income_dataframe
+    income = -income_df[income_df["MonthYear"] == month]["Price"].sum()
+
+    actual = monthly_summary.month(month)
+
+    assert np.isclose(actual["expenses"], expense_df["Price"].sum())
+    assert actual["products"] == expense_df.shape[0]
+    assert actual["shops"] == expense_df["Shop"].nunique(dropna=False)
+    assert np.isclose(actual["income"], income)
+    assert np.isclose(actual["savings"], (income - expense_df["Price"].sum()) / income)
+
+
+def test_month_without_data(monthly_summary):
+    """Testing if month without Expenses and Income has all statistics equal to 0 and savings equal to NaN."""
+
+    actual = monthly_summary.month("2020-01")
+    savings = actual.pop("savings")
+
+    assert actual == {"expenses": 0, "products": 0, "shops": 0, "income": 0}
+    assert np.isnan(savings)
+
+
+@pytest.mark.parametrize(
+    "month",
+    ("2019-02", "2019-11", "2020-01")
+)
+def test_category_expenses(monthly_summary, month):
+    """Testing if sums of Categories of month are the same as sums of rows of month grouped by Category, sorted
+    from the biggest sum."""
+
+    expense_df = monthly_summary.expense_dataframe
+    expected = expense_df[expense_df["MonthYear"] == month].groupby("Category")["Price"].sum()
+    expected = expected.sort_values(ascending=False)
+
+    actual = monthly_summary.category_expenses(month)
+
+    assert actual.columns.tolist() == ["Category", "Price"]
+    assert actual["Category"].tolist() == expected.index.tolist()
+    assert np.allclose(actual["Price"].to_numpy(), expected.to_numpy())
+
+
+def test_price_scale(monthly_summary):
+    """Testing if MonthlySummary of integer prices (cents) with price_scale has the same statistics as MonthlySummary
+    of float prices."""
+
+    expense_df = monthly_summary.expense_dataframe.copy()
+    income_df = monthly_summary.income_dataframe.copy()
+    for df in (expense_df, income_df):
+        df["Price"] = (df["Price"] * 100).round().astype(np.int64)
+
+    scaled = MonthlySummary(expense_df, income_df, "MonthYear", "Price", "Shop", "Category", price_scale=100)
+
+    assert np.allclose(scaled.summary.to_numpy(dtype=float), monthly_summary.summary.to_numpy(dtype=float),
+                       equal_nan=True)
+    assert np.allclose(scaled.category_expenses("2019-06")["Price"].to_numpy(),
+                       monthly_summary.category_expenses("2019-06")["Price"].to_numpy())
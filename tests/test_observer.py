@@ -1,5 +1,7 @@
 import pytest
 
+from flask_app.observer import Observer
+
 def test_register(observer):
     """Testing if registering functions in the observer works correctly."""
 
@@ -36,8 +38,8 @@ def test_watched_property(observer):
             self.result = 0
 
         @obs.register
-        def new_func(self, key, value):
-            self.result = 1
+        def new_func(self, changes):
+            self.result = changes
 
     # class with property being observed
     class Observed(object):
@@ -51,4 +53,44 @@ def test_watched_property(observer):
     observed = Observed(observer, parent)
     observed.x = 10
 
-    assert parent.result == 1
+    assert parent.result == {"x": 10}
+
+
+def observed_class(observer):
+    """Returns class with properties x and y watched by the observer, notifying "parent" attribute."""
+
+    class Observed(object):
+        x = observer.watched_property("observer", "x", "parent")
+        y = observer.watched_property("observer", "y", "parent")
+
+        def __init__(self, obs, par):
+            self.observer = obs
+            self.parent = par
+
+    return Observed
+
+
+def test_transaction(observer):
+    """Testing if changes of watched properties inside of the (nested) transaction are notified in one batch,
+    with the last values, when the outermost transaction ends."""
+
+    notifications = []
+
+    @observer.register
+    def new_func(obj, changes):
+        notifications.append(changes)
+
+    observed = observed_class(observer)(observer, None)
+
+    with observer.transaction():
+        observed.x = 1
+        observed.y = 2
+        with observer.transaction():
+            observed.x = 3
+        assert notifications == []
+
+    assert notifications == [{"x": 3, "y": 2}]
+    assert list(notifications[0]) == ["x", "y"]
+
+    observed.x = 4
+    assert notifications[-1] == {"x": 4}
@@ -1,4 +1,5 @@
-from flask_app.bkapp.pandas_functions import unique_values_from_column, create_combinations_of_sep_values
+from flask_app.bkapp.pandas_functions import unique_values_from_column, value_counts_from_column, \
+    convert_categorical_columns
 
 import pytest
 import pandas as pd
@@ -19,18 +20,27 @@ def test_get_unique_values_from_column(df, col_name, expected_result):
     result = unique_values_from_column(df, col_name)
     assert result == expected_result
 
-@pytest.mark.parametrize(
-    ("list_of_values", "expected_result", "sep"),
-    (
-            (["A:B:C:D", "One:Two"], ["A", "A:B", "A:B:C", "A:B:C:D", "One", "One:Two"], ":"),
-            (["One:Two:Three:Five", "One:Two:Three:Four"],
-             ["One", "One:Two", "One:Two:Three", "One:Two:Three:Five", "One:Two:Three:Four"],
-             ":"),
-            (["A_B:C_D"], ["A", "A_B:C", "A_B:C_D"], "_"),
-            (["A", "B", "C"], ["A", "B", "C"], None)
-    )
-)
-def test_create_combinations_of_sep_values(list_of_values, expected_result, sep):
-    """Testing creating combinations from lists with String with separators."""
-    actual_result = create_combinations_of_sep_values(list_of_values, sep)
-    assert actual_result == expected_result
+@pytest.mark.parametrize(("dtype",), (("object",), ("category",)))
+def test_unique_values_and_value_counts_categorical(dtype):
+    """Testing if unique values and value counts are the same for object and Categorical columns."""
+
+    series = pd.Series(["one", "two", "two", np.nan, "three"], dtype=dtype)
+    df = pd.DataFrame({"a": series})[:4]
+
+    assert unique_values_from_column(df, "a") == ["nan", "one", "two"]
+
+    counts = value_counts_from_column(df, "a")
+    assert counts["a"].to_dict() == {"two": 2, "one": 1}
+    assert counts.index.dtype == object
+
+
+def test_convert_categorical_columns():
+    """Testing if Categorical columns are converted to object columns and other columns are left intact."""
+
+    df = pd.DataFrame({"a": pd.Categorical(["x", "y", "x"]), "b": [1.0, 2.0, 3.0]})
+    converted = convert_categorical_columns(df)
+
+    assert converted["a"].dtype == object
+    assert converted["a"].tolist() == ["x", "y", "x"]
+    assert converted["b"].dtype == float
+    assert convert_categorical_columns(converted) is converted
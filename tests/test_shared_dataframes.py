@@ -0,0 +1,72 @@
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from flask_app.bkapp.shared_dataframes import SharedDataFrames
+
+
+@pytest.fixture
+def shared_dataframes(tmpdir):
+    return SharedDataFrames(str(tmpdir.join("shared")))
+
+
+@pytest.mark.parametrize(
+    ("categorical",),
+    (
+            (False,),
+            (True,)
+    )
+)
+def test_save_and_load(shared_dataframes, gnucash_db_parser_example_book, categorical):
+    """Testing if DataFrames loaded from SharedDataFrames are the same as saved ones."""
+
+    parser = gnucash_db_parser_example_book
+    parser.categorical = categorical
+    expense_df = parser.get_expenses_df()
+    income_df = parser.get_income_df()
+
+    shared_dataframes.save({"expense": expense_df, "income": income_df})
+    dfs = shared_dataframes.load()
+
+    assert list(dfs.keys()) == ["expense", "income"]
+    assert dfs["expense"].equals(expense_df)
+    assert dfs["income"].equals(income_df)
+    assert dfs["expense"].dtypes.equals(expense_df.dtypes)
+
+
+def test_load_memory_mapped(shared_dataframes):
+    """Testing if numeric, datetime and categorical columns are loaded as read-only memory maps, without copying."""
+
+    df = pd.DataFrame({
+        "Date": pd.to_datetime(["2019-01-01", "2019-01-02", "2019-02-01"]),
+        "Price": [1.5, 2.25, np.nan],
+        "Category": pd.Categorical(["Bread", "Eggs", "Bread"]),
+        "Shop": ["Shop #1", np.nan, "Shop #2"]
+    })
+
+    shared_dataframes.save({"df": df})
+    loaded = shared_dataframes.load()["df"]
+
+    assert loaded.equals(df)
+    for array in [loaded["Date"].to_numpy(), loaded["Price"].to_numpy(), loaded["Category"].cat.codes.to_numpy()]:
+        base = array
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        assert isinstance(base, np.memmap)
+        assert not array.flags.writeable
+
+
+def test_generations(shared_dataframes):
+    """Testing if the newest generation is loaded and only the newest and previous generations are kept."""
+
+    assert shared_dataframes.load() is None
+
+    for i in range(4):
+        shared_dataframes.save({"df": pd.DataFrame({"Price": [float(i)]})})
+
+    assert shared_dataframes.load()["df"]["Price"].tolist() == [3.0]
+    assert sorted(name for name in os.listdir(shared_dataframes.directory) if name.isdigit()) == ["3", "4"]
+
+    shared_dataframes.remove()
+    assert shared_dataframes.load() is None
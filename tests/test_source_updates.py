@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+import pandas as pd
+from bokeh.document import Document
+from bokeh.document.events import ColumnsPatchedEvent, ColumnsStreamedEvent, ColumnDataChangedEvent
+from bokeh.models import ColumnDataSource
+
+from flask_app.bkapp.source_updates import update_source, contiguous_runs
+
+
+def source_with_events(data):
+    """Returns ColumnDataSource with data added to a Document and list to which Document events are appended."""
+
+    source = ColumnDataSource(data)
+    document = Document()
+    document.add_root(source)
+
+    events = []
+    document.on_change(events.append)
+
+    return source, events
+
+
+def event_hints(events):
+    """Returns list of types of hints of Document events."""
+    return [type(event.hint) for event in events]
+
+
+@pytest.mark.parametrize(
+    ("new_x", "new_y", "expected_update", "expected_events"),
+    (
+            ([1, 2, 3, 4, 5, 6], list("abcdef"), "none", []),
+            ([1, 2, 30, 4, 5, 6], list("abcdef"), "patch", [ColumnsPatchedEvent]),
+            ([1, 2, 3, 4, 5, 6, 7, 8], list("abcdefgh"), "patch", [ColumnsStreamedEvent]),
+            ([1, 2, 3, 4, 5, 60, 7], list("abcdeFg"), "patch", [ColumnsPatchedEvent, ColumnsStreamedEvent]),
+            ([3, 4, 5, 6], list("cdef"), "rollover", [ColumnsStreamedEvent]),
+            ([1, 2, 3], list("abc"), "replace", [ColumnDataChangedEvent]),
+            ([6, 5, 4, 3, 2, 1], list("fedcba"), "replace", [ColumnDataChangedEvent]),
+            ([], [], "replace", [ColumnDataChangedEvent])
+    )
+)
+def test_update_source(new_x, new_y, expected_update, expected_events):
+    """Testing if update_source chooses the right update and if data of ColumnDataSource is equal to the new data
+    afterwards."""
+
+    source, events = source_with_events({"x": np.array([1, 2, 3, 4, 5, 6]), "y": np.array(list("abcdef"))})
+
+    update = update_source(source, {"x": np.array(new_x, dtype=int), "y": np.array(new_y, dtype=str)})
+
+    assert update == expected_update
+    assert event_hints(events) == expected_events
+    assert list(source.data["x"]) == new_x
+    assert list(source.data["y"]) == new_y
+
+
+def test_update_source_dataframe():
+    """Testing if update_source accepts DataFrames (with index column) and treats missing values as equal."""
+
+    df = pd.DataFrame({"x": [1.0, np.nan, 3.0, 4.0], "y": ["a", None, "c", "d"]}, index=[10, 11, 12, 13])
+    source, events = source_with_events(df)
+
+    assert update_source(source, df.copy()) == "none"
+
+    new_df = df.copy()
+    new_df.loc[13, "x"] = 40.0
+    assert update_source(source, new_df) == "patch"
+    assert list(source.data["index"]) == [10, 11, 12, 13]
+    assert source.data["x"][3] == 40.0
+
+    assert update_source(source, df[["x"]]) == "replace"
+    assert set(source.data) == {"index", "x"}
+
+
+def test_update_source_datetime():
+    """Testing if datetime columns are patched and streamed with datetime values."""
+
+    dates = pd.date_range("2019-01-01", periods=4).to_numpy()
+    source, events = source_with_events({"date": dates})
+
+    new_dates = pd.date_range("2019-01-01", periods=6).to_numpy()
+    assert update_source(source, {"date": new_dates}) == "patch"
+    assert (source.data["date"] == new_dates).all()
+
+
+@pytest.mark.parametrize(
+    ("mask", "expected_runs"),
+    (
+            ([True, True, False, True], [(0, 2), (3, 4)]),
+            ([False, False], []),
+            ([False, True, True, True], [(1, 4)])
+    )
+)
+def test_contiguous_runs(mask, expected_runs):
+    """Testing if contiguous runs of True values are found correctly."""
+    assert contiguous_runs(np.array(mask)) == expected_runs
@@ -0,0 +1,74 @@
+import asyncio
+
+from flask_app.bkapp.view_executor import ViewExecutor
+
+
+class DocumentForTest(object):
+    """Document collecting next tick callbacks, so that they can be run one by one in the test."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def add_next_tick_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def run_next_callback(self):
+        result = self.callbacks.pop(0)()
+        if asyncio.iscoroutine(result):
+            asyncio.run(result)
+
+
+def test_submit_without_document():
+    """Testing if update submitted without Document is calculated and applied immediately."""
+
+    executor = ViewExecutor()
+    applied = []
+
+    executor.submit(lambda: 1, applied.append)
+
+    assert applied == [1]
+
+
+def test_submit_with_document():
+    """Testing if update submitted with Document is calculated outside of the Document lock and then applied
+    in the next tick callback."""
+
+    executor = ViewExecutor()
+    document = DocumentForTest()
+    applied = []
+
+    executor.submit(lambda: 1, applied.append, document)
+    assert applied == []
+    assert getattr(document.callbacks[0], "nolock", False)
+
+    document.run_next_callback()  # calculate
+    assert applied == []
+
+    document.run_next_callback()  # apply
+    assert applied == [1]
+    assert document.callbacks == []
+
+
+def test_submit_drops_superseded_updates():
+    """Testing if updates superseded by newer ones are neither calculated nor applied."""
+
+    executor = ViewExecutor()
+    document = DocumentForTest()
+    calculated = []
+    applied = []
+
+    def calculate(x):
+        calculated.append(x)
+        return x
+
+    executor.submit(lambda: calculate(1), applied.append, document)
+    document.run_next_callback()  # first update is calculated, but not applied yet
+
+    executor.submit(lambda: calculate(2), applied.append, document)
+    executor.submit(lambda: calculate(3), applied.append, document)
+
+    while document.callbacks:
+        document.run_next_callback()
+
+    assert calculated == [1, 3]
+    assert applied == [3]